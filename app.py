@@ -1,71 +1,90 @@
-from flask import Flask, render_template, request, redirect, url_for, jsonify, session, abort, make_response
+from flask import Flask, Blueprint, current_app, render_template, request, redirect, url_for, jsonify, session, abort, make_response, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.exc import IntegrityError
 from flask_migrate import Migrate
 from flask_cors import CORS
-from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
+from werkzeug.datastructures import MultiDict
 import os
 from datetime import datetime, timedelta
 import base64
+import csv
+import json
+import mimetypes
+import time
+import tempfile
+from io import StringIO
 from flask import send_from_directory
 from enum import Enum
 from functools import wraps
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity, create_refresh_token, get_jwt
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required, create_refresh_token, get_jwt, get_current_user
 import re
-import redis
-from dotenv import load_dotenv
+import shutil
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-import pandas as pd
-from io import StringIO
-from redis.exceptions import ConnectionError
+from member_import import import_members_csv
+from member_search import MemberSearchIndex, DEFAULT_SEARCH_LIMIT
+from response_cache import ResponseCache
+from member_stats import MemberStats, DIMENSION_NAMES
+from member_calendar import MemberCalendar, CALENDAR_KINDS, parse_month_day
+from photo_storage import PhotoStore, content_etag
+from token_blocklist import TokenBlocklist, BlocklistUnavailable, create_redis_client
+from job_runner import JobRunner
+from config import config
+from db_engine import configure_engine_options, configure_engine
+from json_provider import init_json
+from member_serializer import MemberSerializer
+from member_batch import MAX_BATCH_SIZE, BIRTH_DATE_COLUMNS, InvalidMemberData, apply_member_batch, check_birth_date, new_member_values
+from instrumentation import Instrumentation
+from credentials import CredentialService, CredentialServiceBusy
+from backup import DatabaseBackup, InvalidBackup, COMPRESSIONS as BACKUP_COMPRESSIONS, compression_available, read_manifest
+import rate_limit_storage  # noqa: F401 - leased+redis:// 속도 제한 저장소 등록
+from member_changes import MemberChangeFeed, ChangeTokenExpired, DEFAULT_CHANGES_LIMIT, MAX_CHANGES_LIMIT, parse_token
+from member_households import MemberHouseholds
 
-load_dotenv()
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
 
 class UserRole(Enum):
     USER = 'USER'
     ADMIN = 'ADMIN'
     SUPER_ADMIN = 'SUPER_ADMIN'
 
-app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}}, supports_credentials=True)
-basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URI')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(minutes=15)
-app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=30)
-
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
-jwt = JWTManager(app)
-
-# 토큰 블랙리스트를 위한 Redis 설정 (또는 다른 저장소 사용)
-try:
-    jwt_redis_blocklist = redis.StrictRedis(host="localhost", port=6379, db=0, decode_responses=True)
-    jwt_redis_blocklist.ping()  # Redis 연결 테스트
-    print("Redis 연결 성공")
-except ConnectionError:
-    print("Redis 연결에 실패했습니다. Redis 서버가 실행 중인지 확인하세요.")
-    # 대체 로직 또는 애플리케이션 종료 처리
+db = SQLAlchemy()
+migrate = Migrate()
+jwt = JWTManager()
+
+# 토큰 블랙리스트 (redis / sqlite / memory)
+token_blocklist = TokenBlocklist()
 
 # Limiter 설정
+# 저장소와 전략은 RATELIMIT_STORAGE_URI / RATELIMIT_STRATEGY 설정 (REDIS_URL 이 있으면 워커들이 Redis 카운터를 공유)
 limiter = Limiter(
     get_remote_address,
-    app=app,
-    default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://"
+    default_limits=["200 per day", "50 per hour"]
 )
 
+# 라우트는 모두 이 블루프린트에 등록하고 create_app() 에서 앱에 붙인다
+bp = Blueprint('main', __name__, cli_group=None)
+
+# 비밀번호 해시/검증 (크기가 정해진 스레드 풀에서 계산)
+credentials = CredentialService()
+
 # Member 모델 정의
 class Member(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     register_date = db.Column(db.Date, nullable=False)
     name = db.Column(db.String(50), nullable=False)
+    name_initials = db.Column(db.String(50), index=True)  # 초성 검색용 ('김철수' -> 'ㄱㅊㅅ')
     birth_year = db.Column(db.Integer, nullable=False)
     birth_month = db.Column(db.Integer, nullable=False)
     birth_day = db.Column(db.Integer, nullable=False)
+    # 윤년 기준 연중 일자(1~366) - 생일/등록 기념일 구간 조회용 (member_calendar 가 채운다)
+    birth_day_of_year = db.Column(db.Integer)
+    register_day_of_year = db.Column(db.Integer)
     phone = db.Column(db.String(20), nullable=False)
     address = db.Column(db.String(100))
     city = db.Column(db.String(50))
@@ -73,13 +92,36 @@ class Member(db.Model):
     zipcode = db.Column(db.String(10))
     district = db.Column(db.String(50))
     photo = db.Column(db.String(255))
-    password_hash = db.Column(db.String(128))
+    password_hash = db.Column(db.String(255))
     gender = db.Column(db.String(10))
     spouse = db.Column(db.String(50))
+    # 배우자 회원과 가정 (member_households 의 resolve-spouses 가 spouse 이름으로 채운다)
+    spouse_id = db.Column(db.Integer, db.ForeignKey('member.id', name='fk_member_spouse_id_member', ondelete='SET NULL'))
+    household_id = db.Column(db.Integer, db.ForeignKey('household.id', name='fk_member_household_id_household',
+                                                       ondelete='SET NULL'))
     position = db.Column(db.String(50))
     email = db.Column(db.String(120), unique=True, nullable=False)
     role = db.Column(db.String(20), default='회원')  # '최고 관리자', '당회 및 교역자', '구역장', '회원', '비회원'
     is_active = db.Column(db.Boolean, default=False)
+    # 델타 동기화용 전역 변경 번호와 마지막 수정 시각 (member_changes 가 채운다)
+    version = db.Column(db.Integer)
+    updated_at = db.Column(db.DateTime)
+
+    # 목록 필터/정렬용 복합 인덱스
+    __table_args__ = (
+        # 이름 검색/정렬과 배우자 이름 맞추기 (이름 + 구역)
+        db.Index('ix_member_name_district', 'name', 'district'),
+        db.Index('ix_member_birth_year_month', 'birth_year', 'birth_month'),
+        db.Index('ix_member_birth_month', 'birth_month'),
+        db.Index('ix_member_city_district', 'city', 'district'),
+        db.Index('ix_member_district_position', 'district', 'position'),
+        db.Index('ix_member_position_name', 'position', 'name'),
+        db.Index('ix_member_birth_day_of_year', 'birth_day_of_year'),
+        db.Index('ix_member_register_day_of_year', 'register_day_of_year'),
+        db.Index('ix_member_version', 'version'),
+        db.Index('ix_member_spouse_id', 'spouse_id'),
+        db.Index('ix_member_household_id', 'household_id'),
+    )
 
     def to_dict(self):
         return {
@@ -96,30 +138,33 @@ class Member(db.Model):
             'zipcode': self.zipcode,
             'district': self.district,
             'spouse': self.spouse,
+            'spouseId': self.spouse_id,
+            'householdId': self.household_id,
             'position': self.position,
             'email': self.email,
             'role': self.role,
-            'is_active': self.is_active
+            'is_active': self.is_active,
+            'photoUrls': photo_urls(self.photo)
         }
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = credentials.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return credentials.verify(self.password_hash, password)
 
 # User 모델 정의
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(db.Enum(UserRole), default=UserRole.USER, nullable=False)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = credentials.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return credentials.verify(self.password_hash, password)
 
     def to_dict(self):
         return {
@@ -128,42 +173,175 @@ class User(db.Model):
             'role': self.role.value  # Enum 값을 문자열로 반환
         }
 
-UPLOAD_FOLDER = 'uploads'
+# 요청/SQL 계측 (/metrics)
+instrumentation = Instrumentation()
+
+# 이름 검색 색인 (SQLite FTS5 / PostgreSQL pg_trgm)
+member_search_index = MemberSearchIndex()
+
+# 회원 조회 응답 캐시 (Redis 를 사용할 수 없으면 프로세스 내 LRU)
+response_cache = ResponseCache()
+response_cache.watch_model(Member, 'members')
+
+# 회원 통계 요약 (항목, 버킷) -> 회원 수
+class MemberStat(db.Model):
+    dimension = db.Column(db.String(30), primary_key=True)
+    bucket = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+member_stats = MemberStats()
+
+# 회원 목록 직렬화 (필요한 컬럼만 튜플로 조회)
+member_serializer = MemberSerializer()
+
+# 삭제된 회원 기록 (델타 동기화에서 삭제를 전달)
+class MemberTombstone(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # 삭제된 회원 id
+    version = db.Column(db.Integer, nullable=False, index=True)
+    deleted_at = db.Column(db.DateTime, nullable=False)
+
+# 가정 - 같은 household_id 의 회원들 (부부는 resolve-spouses 가 묶는다)
+class Household(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, nullable=False)
+
+response_cache.watch_model(Household, 'members')
+member_households = MemberHouseholds()
+
+# 이름 있는 카운터 (회원 변경 번호 발급)
+class SyncCounter(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+member_changes = MemberChangeFeed()
+
+# 생일/등록 기념일 달력 (연중 일자 인덱스 + "오늘부터 N일" 캐시)
+member_calendar = MemberCalendar()
+
+# 백그라운드 작업
+class Job(db.Model):
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed, cancelled
+    params = db.Column(db.Text)
+    result = db.Column(db.Text)
+    error = db.Column(db.Text)
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    created_by = db.Column(db.Integer)
+    worker = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # 실행 중인 워커가 주기적으로 갱신 (job_runner.recover_stale)
+
+    __table_args__ = (
+        db.Index('ix_job_status_created_at', 'status', 'created_at'),
+    )
+
+    def to_dict(self):
+        now = datetime.utcnow()
+        queue_seconds = ((self.started_at or self.finished_at or now) - self.created_at).total_seconds()
+        duration = ((self.finished_at or now) - self.started_at).total_seconds() if self.started_at else None
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'processed': self.processed,
+            'total': self.total,
+            'progress': round(min(self.processed / self.total, 1.0), 4) if self.total else None,
+            'cancelRequested': self.cancel_requested,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'createdAt': self.created_at.isoformat(),
+            'startedAt': self.started_at.isoformat() if self.started_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None,
+            'metrics': {
+                'queueSeconds': round(queue_seconds, 3),
+                'durationSeconds': round(duration, 3) if duration is not None else None,
+                'itemsPerSecond': round(self.processed / duration, 1) if duration else None,
+            }
+        }
+
+job_runner = JobRunner()
+
+# DB/업로드 파일 온라인 백업과 복원 (backup.py)
+database_backup = DatabaseBackup()
+
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 
-app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+# 사진 저장소 (내용 해시 파일 이름 + 백그라운드 썸네일 생성)
+photo_store = PhotoStore()
+
+def photo_urls(filename):
+    # 원본/목록/상세 사진 URL (썸네일이 아직 없으면 /uploads 가 원본을 보낸다)
+    if not filename:
+        return None
+    return {
+        variant: url_for('main.uploaded_file', filename=name, _external=True)
+        for variant, name in photo_store.variants(filename).items()
+    }
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# 토큰 클레임만으로 권한을 판단해도 되는 요청 (데이터를 바꾸지 않는 요청)
+READ_ONLY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+class TokenUser:
+    """액세스 토큰 클레임으로 만든 사용자 - 읽기 전용 요청에서 DB 조회 없이 사용"""
+
+    def __init__(self, id, email, role):
+        self.id = id
+        self.email = email
+        self.role = role
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'email': self.email,
+            'role': self.role.value
+        }
+
+def user_claims(user):
+    return {'email': user.email, 'role': user.role.value}
+
+@jwt.user_lookup_loader
+def load_current_user(jwt_header, jwt_data):
+    """요청마다 한 번만 호출되며 결과는 flask_jwt_extended 가 g 에 보관한다 (get_current_user()).
+
+    읽기 전용 요청은 토큰의 role 클레임을 그대로 쓰고, 변경 요청은 항상 DB 의 최신 권한을 확인한다.
+    (권한 변경은 읽기 요청에는 액세스 토큰 만료 후, 변경 요청에는 즉시 반영된다)
+    """
+    if request.method in READ_ONLY_METHODS and jwt_data.get('type') == 'access' and 'role' in jwt_data:
+        return TokenUser(jwt_data['sub'], jwt_data.get('email'), UserRole(jwt_data['role']))
+    return db.session.get(User, jwt_data['sub'])
+
+def role_required(roles, message, message_key='error'):
+    def decorator(f):
+        @wraps(f)
+        @jwt_required()
+        def decorated(*args, **kwargs):
+            if get_current_user().role not in roles:
+                return jsonify({message_key: message}), 403
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
 def admin_required(f):
-    @wraps(f)
-    @jwt_required()
-    def decorated(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        if not user or user.role not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
-            return jsonify({"error": "관리자 권한이 필요합니다."}), 403
-        return f(*args, **kwargs)
-    return decorated
+    return role_required((UserRole.ADMIN, UserRole.SUPER_ADMIN), "관리자 권한이 필요합니다.")(f)
 
 def super_admin_required(f):
-    @wraps(f)
-    @jwt_required()
-    def decorated(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        if not user or user.role != UserRole.SUPER_ADMIN:
-            return jsonify({"error": "최고 관리자 권한이 필요합니다."}), 403
-        return f(*args, **kwargs)
-    return decorated
-
-@app.route('/')
+    return role_required((UserRole.SUPER_ADMIN,), "최고 관리자 권한이 필요합니다.")(f)
+
+@bp.route('/')
 def index():
     members = Member.query.all()
     return render_template('index.html', members=members)
 
-@app.route('/member/new', methods=['GET', 'POST'])
+@bp.route('/member/new', methods=['GET', 'POST'])
 def new_member():
     if request.method == 'POST':
         new_member = Member(
@@ -177,15 +355,15 @@ def new_member():
         )
         db.session.add(new_member)
         db.session.commit()
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     return render_template('new_member.html')
 
-@app.route('/member/<int:id>')
+@bp.route('/member/<int:id>')
 def view_member(id):
     member = Member.query.get_or_404(id)
     return render_template('view_member.html', member=member)
 
-@app.route('/member/<int:id>/edit', methods=['GET', 'POST'])
+@bp.route('/member/<int:id>/edit', methods=['GET', 'POST'])
 def edit_member(id):
     member = Member.query.get_or_404(id)
     if request.method == 'POST':
@@ -197,10 +375,10 @@ def edit_member(id):
         member.phone = request.form['phone']
         member.gender = request.form['gender']
         db.session.commit()
-        return redirect(url_for('view_member', id=member.id))
+        return redirect(url_for('main.view_member', id=member.id))
     return render_template('edit_member.html', member=member)
 
-@app.route('/api/upload', methods=['POST'])
+@bp.route('/api/upload', methods=['POST'])
 def upload_file():
     if 'file' not in request.files:
         return jsonify({'error': 'No file part'}), 400
@@ -208,101 +386,442 @@ def upload_file():
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+        filename = photo_store.save_stream(file.stream, file.filename.rsplit('.', 1)[1].lower())
         return jsonify({'filename': filename}), 200
     return jsonify({'error': 'File type not allowed'}), 400
 
-@app.route('/api/members', methods=['GET'])
-def get_members():
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
-    query = Member.query
+# 정렬 허용 컬럼 (임의의 속성 접근 방지)
+SORTABLE_FIELDS = {'id', 'name', 'birth_year', 'birth_month', 'birth_day', 'city', 'district', 'position', 'register_date'}
+
+def prefix_range(column, prefix):
+    # LIKE 'prefix%' 대신 범위 조건을 사용해야 SQLite/PostgreSQL 모두 인덱스 범위 스캔을 탄다
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return db.and_(column >= prefix, column < upper)
 
-    for field in ['gender', 'district', 'position']:
-        value = request.args.get(field)
+def apply_member_filters(query, args=None):
+    # 회원 목록/내보내기 공통 필터 (args 를 주지 않으면 요청 쿼리 문자열)
+    args = request.args if args is None else args
+    for field in ['gender', 'city', 'district', 'position']:
+        value = args.get(field)
         if value:
             query = query.filter(getattr(Member, field) == value)
+    for field in ['birth_year', 'birth_month']:
+        value = args.get(field, type=int)
+        if value is not None:
+            query = query.filter(getattr(Member, field) == value)
+
+    # 범위 필터: birth_year_min=1960&birth_year_max=1969
+    for field in ['birth_year', 'birth_month']:
+        low = args.get(f'{field}_min', type=int)
+        high = args.get(f'{field}_max', type=int)
+        if low is not None:
+            query = query.filter(getattr(Member, field) >= low)
+        if high is not None:
+            query = query.filter(getattr(Member, field) <= high)
+
+    # 접두어 필터: district_prefix=1 -> '1구역', '10구역' ...
+    for field in ['city', 'district', 'position']:
+        prefix = args.get(f'{field}_prefix')
+        if prefix:
+            query = query.filter(prefix_range(getattr(Member, field), prefix))
+    return query
+
+# 커서 페이지네이션은 NULL 이 없는 컬럼으로만 정렬할 수 있다
+KEYSET_SORT_FIELDS = {'id', 'name', 'birth_year', 'birth_month', 'birth_day', 'register_date'}
+MEMBER_COUNT_CACHE_TTL = 60  # 초
+_member_count_cache = {}
+
+def encode_cursor(sort_by, sort_order, member):
+    value = getattr(member, sort_by)
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, sort_order, value, member.id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token, sort_by, sort_order):
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        cursor_sort_by, cursor_sort_order, value, last_id = json.loads(payload)
+    except (ValueError, TypeError):
+        raise ValueError("유효하지 않은 커서입니다.")
+    if cursor_sort_by != sort_by or cursor_sort_order != sort_order:
+        raise ValueError("커서와 정렬 조건이 일치하지 않습니다.")
+    if sort_by == 'register_date':
+        value = datetime.strptime(value, '%Y-%m-%d').date()
+    return value, last_id
+
+def cached_member_count(query):
+    # 같은 필터 조합의 전체 건수는 MEMBER_COUNT_CACHE_TTL 동안 재사용 (추정치)
+    key = tuple(sorted((k, v) for k, v in request.args.items(multi=True)
+                       if k not in ('cursor', 'count', 'per_page', 'sort_by', 'sort_order', 'page')))
+    now = time.monotonic()
+    cached = _member_count_cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+    total = query.order_by(None).count()
+    if len(_member_count_cache) > 1000:
+        _member_count_cache.clear()
+    _member_count_cache[key] = (total, now + MEMBER_COUNT_CACHE_TTL)
+    return total
+
+def member_list_item(member):
+    return {
+        **member.to_dict(),
+        'photoUrl': url_for('main.uploaded_file', filename=member.photo, _external=True) if member.photo else None
+    }
+
+@bp.route('/api/members', methods=['GET'])
+@response_cache.cached('members')
+def get_members():
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    query = apply_member_filters(Member.query)
 
     sort_by = request.args.get('sort_by', 'name')
     sort_order = request.args.get('sort_order', 'asc')
+    if sort_by not in SORTABLE_FIELDS:
+        return jsonify({"error": f"정렬할 수 없는 필드입니다: {sort_by}"}), 400
+    # fields=name,phone,district - 응답 키를 골라 필요한 컬럼만 조회 (id 는 항상 포함)
+    try:
+        fields = member_serializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if 'cursor' in request.args:
+        return get_members_by_cursor(query, sort_by, sort_order, per_page, fields)
+
     if sort_order == 'desc':
-        query = query.order_by(db.desc(getattr(Member, sort_by)))
+        query = query.order_by(db.desc(getattr(Member, sort_by)), db.desc(Member.id))
     else:
-        query = query.order_by(getattr(Member, sort_by))
+        query = query.order_by(getattr(Member, sort_by), Member.id)
 
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    members = pagination.items
+    # 필요한 컬럼만 튜플로 읽어 직렬화 (ORM 객체를 만들지 않는다)
+    pagination = member_serializer.select(query, fields).paginate(page=page, per_page=per_page, error_out=False)
 
     return jsonify({
-        'members': [{
-            **member.to_dict(),
-            'photoUrl': url_for('uploaded_file', filename=member.photo, _external=True) if member.photo else None
-        } for member in members],
+        'members': member_serializer.serialize(pagination.items, fields),
         'total': pagination.total,
         'pages': pagination.pages,
         'current_page': page
     })
 
-@app.route('/api/members/public', methods=['GET'])
+def get_members_by_cursor(query, sort_by, sort_order, per_page, fields):
+    """키셋 페이지네이션: (정렬 키, id) 이후의 행만 읽으므로 깊은 페이지도 첫 페이지와 비용이 같다.
+
+    cursor= (빈 값) 으로 첫 페이지를 요청하고 응답의 next_cursor 를 다음 요청에 넘긴다.
+    count=exact 이면 COUNT(*) 를, count=estimate 이면 캐시된 건수를 함께 반환한다.
+    """
+    if sort_by not in KEYSET_SORT_FIELDS:
+        return jsonify({"error": f"커서 페이지네이션에서 정렬할 수 없는 필드입니다: {sort_by}"}), 400
+    per_page = max(1, min(per_page, 100))
+    count_mode = request.args.get('count', 'none')
+    column = getattr(Member, sort_by)
+
+    total = None
+    if count_mode == 'exact':
+        total = query.order_by(None).count()
+    elif count_mode == 'estimate':
+        total = cached_member_count(query)
+
+    token = request.args.get('cursor')
+    if token:
+        try:
+            value, last_id = decode_cursor(token, sort_by, sort_order)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if sort_order == 'desc':
+            query = query.filter(db.tuple_(column, Member.id) < (value, last_id))
+        else:
+            query = query.filter(db.tuple_(column, Member.id) > (value, last_id))
+
+    if sort_order == 'desc':
+        query = query.order_by(db.desc(column), db.desc(Member.id))
+    else:
+        query = query.order_by(column, Member.id)
+
+    # 한 건 더 읽어 다음 페이지 존재 여부를 판단
+    # 정렬 컬럼은 응답에 없어도 다음 커서를 만들기 위해 함께 읽는다
+    members = member_serializer.select(query, fields, extra=(sort_by,)).limit(per_page + 1).all()
+    has_more = len(members) > per_page
+    members = members[:per_page]
+
+    return jsonify({
+        'members': member_serializer.serialize(members, fields),
+        'next_cursor': encode_cursor(sort_by, sort_order, members[-1]) if has_more else None,
+        'has_more': has_more,
+        'total': total
+    })
+
+# 내보내기 컬럼 (모델 속성, 헤더)
+EXPORT_COLUMNS = [
+    ('id', 'ID'),
+    ('name', '이름'),
+    ('gender', '성별'),
+    ('birth_year', '출생년도'),
+    ('birth_month', '출생월'),
+    ('birth_day', '출생일'),
+    ('phone', '전화번호'),
+    ('email', '이메일'),
+    ('address', '주소'),
+    ('city', '도시'),
+    ('state', '주'),
+    ('zipcode', '우편번호'),
+    ('district', '구역'),
+    ('spouse', '배우자'),
+    ('position', '직분'),
+    ('role', '역할'),
+    ('register_date', '등록일'),
+]
+EXPORT_BATCH_SIZE = 1000
+
+def iter_export_rows(args=None):
+    # 서버 사이드 커서 + yield_per 로 EXPORT_BATCH_SIZE 행씩만 메모리에 올린다
+    query = apply_member_filters(Member.query, args).order_by(Member.name, Member.id)
+    query = query.with_entities(*[getattr(Member, column) for column, _ in EXPORT_COLUMNS])
+    return query.execution_options(stream_results=True).yield_per(EXPORT_BATCH_SIZE)
+
+def generate_csv_export(rows):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')  # 엑셀에서 한글이 깨지지 않도록 BOM 추가
+    writer.writerow([header for _, header in EXPORT_COLUMNS])
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def generate_xlsx_export(rows):
+    # write_only 워크북은 행을 바로 임시 파일에 기록하므로 메모리 사용량이 일정하다
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('회원목록')
+    sheet.append([header for _, header in EXPORT_COLUMNS])
+    for row in rows:
+        sheet.append(list(row))
+    with tempfile.TemporaryFile() as fh:
+        workbook.save(fh)
+        fh.seek(0)
+        while True:
+            chunk = fh.read(64 * 1024)
+            if not chunk:
+                break
+            yield chunk
+
+@bp.route('/api/members/export', methods=['GET'])
+@admin_required
+def export_members():
+    export_format = request.args.get('format', 'csv')
+    timestamp = datetime.now().strftime('%Y%m%d')
+    if export_format == 'csv':
+        response = Response(stream_with_context(generate_csv_export(iter_export_rows())), mimetype='text/csv; charset=utf-8')
+        filename = f"members_{timestamp}.csv"
+    elif export_format == 'xlsx':
+        if openpyxl is None:
+            return jsonify({"error": "XLSX 내보내기를 사용하려면 openpyxl 패키지가 필요합니다."}), 501
+        response = Response(
+            stream_with_context(generate_xlsx_export(iter_export_rows())),
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+        filename = f"members_{timestamp}.xlsx"
+    else:
+        return jsonify({"error": "지원하지 않는 형식입니다. (csv, xlsx)"}), 400
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', generate_csv_export),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', generate_xlsx_export),
+}
+
+def rows_with_progress(job, rows):
+    processed = 0
+    for row in rows:
+        yield row
+        processed += 1
+        if processed % EXPORT_BATCH_SIZE == 0:
+            job.progress(processed)
+    job.progress(processed, force=True)
+
+@job_runner.handler('export_members')
+def run_export_job(job, params):
+    export_format = params.get('format', 'csv')
+    args = MultiDict(params.get('filters', {}))
+    total = apply_member_filters(Member.query, args).count()
+    job.progress(0, total, force=True)
+    filename = f"members_{datetime.now().strftime('%Y%m%d')}.{export_format}"
+    generate = EXPORT_FORMATS[export_format][1]
+    with open(job.path(filename), 'wb') as fh:
+        for chunk in generate(rows_with_progress(job, iter_export_rows(args))):
+            fh.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+    return {'filename': filename, 'format': export_format, 'rows': job.processed,
+            'bytes': os.path.getsize(job.path(filename))}
+
+def job_accepted(job):
+    response = jsonify(job.to_dict())
+    response.status_code = 202
+    response.headers['Location'] = url_for('main.get_job', job_id=job.id)
+    return response
+
+@bp.route('/api/members/export', methods=['POST'])
+@admin_required
+def create_export_job():
+    """내보내기를 백그라운드 작업으로 실행한다. 완료 후 /api/jobs/<id>/download 로 받는다."""
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": "지원하지 않는 형식입니다. (csv, xlsx)"}), 400
+    if export_format == 'xlsx' and openpyxl is None:
+        return jsonify({"error": "XLSX 내보내기를 사용하려면 openpyxl 패키지가 필요합니다."}), 501
+    filters = {key: value for key, value in request.args.items() if key != 'format'}
+    job = job_runner.enqueue('export_members', {'format': export_format, 'filters': filters},
+                             created_by=get_current_user().id)
+    return job_accepted(job)
+
+# 공개 목록에 내보내는 필드 (가족 관계 id 는 내보내지 않는다 - /api/members/<id>/household)
+PUBLIC_MEMBER_FIELDS = ('id', 'name', 'spouse', 'photoUrls', 'photoUrl')
+
+@bp.route('/api/members/public', methods=['GET'])
+@response_cache.cached('members')
 def get_public_members():
     try:
-        name = request.args.get('name', '')
-        members = Member.query.filter(Member.name.like(f'%{name}%')).all()
+        name = request.args.get('name', '').strip()
+        if name:
+            members = member_search_index.search(name, request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int))
+        else:
+            # 전체 목록은 공개 필드 컬럼만 조회
+            rows = member_serializer.select(Member.query.order_by(Member.name), PUBLIC_MEMBER_FIELDS).all()
+            return jsonify(member_serializer.serialize(rows, PUBLIC_MEMBER_FIELDS))
         return jsonify([
             {
                 'id': member.id,
                 'name': member.name,
                 'spouse': member.spouse,
-                'photoUrl': url_for('uploaded_file', filename=member.photo, _external=True) if member.photo else None
+                'photoUrl': url_for('main.uploaded_file', filename=member.photo, _external=True) if member.photo else None,
+                'photoUrls': photo_urls(member.photo)
             } for member in members
         ])
     except Exception as e:
-        print(f"Error in get_public_members: {str(e)}")  # 서버 콘솔에 에러 로깅
+        current_app.logger.exception("Error in get_public_members: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
-@app.route('/api/members/<int:id>', methods=['GET'])
+@bp.route('/api/members/birthdays', methods=['GET'])
+def get_member_birthdays():
+    """생일(kind=birthday) 또는 등록 기념일(kind=registration) 이 구간에 드는 회원
+
+    from/to ('MM-DD' 또는 'YYYY-MM-DD') 를 주면 그 구간을, 없으면 오늘부터 days 일(기본 7)을 조회한다.
+    from 이 to 보다 뒤면 연말을 넘는 구간(예: 12-28 ~ 01-03)으로 본다.
+    """
+    kind = request.args.get('kind', 'birthday')
+    if kind not in CALENDAR_KINDS:
+        return jsonify({"error": "지원하지 않는 종류입니다. (birthday, registration)"}), 400
+    start = request.args.get('from')
+    end = request.args.get('to')
+    if start or end:
+        if not (start and end):
+            return jsonify({"error": "from 과 to 를 함께 지정해야 합니다."}), 400
+        start_day, end_day = parse_month_day(start), parse_month_day(end)
+        if start_day is None or end_day is None:
+            return jsonify({"error": "날짜 형식이 올바르지 않습니다. (MM-DD)"}), 400
+        members = [member_list_item(member) for member in member_calendar.range_query(start_day, end_day, kind)]
+    else:
+        days = request.args.get('days', 7, type=int)
+        members = member_calendar.upcoming(days, kind, serializer=member_list_item)
+    return jsonify({'kind': kind, 'count': len(members), 'members': members}), 200
+
+@bp.route('/api/members/changes', methods=['GET'])
+@response_cache.cached('members')
+def get_member_changes():
+    """since=<token> 이후에 추가/수정된 회원(members)과 삭제된 회원 id(deleted)
+
+    since 없이 요청하면 전체 회원을 처음부터 보낸다. 응답의 token 을 다음 요청의 since 로 넘기고,
+    has_more 이면 바로 이어서 요청한다. token 이 만료되었으면 410 - since 없이 전체를 다시 받는다.
+    fields= 는 /api/members 와 같다.
+    """
+    try:
+        since = parse_token(request.args.get('since'))
+    except ValueError:
+        return jsonify({"error": "유효하지 않은 token 입니다."}), 400
+    limit = max(1, min(request.args.get('limit', DEFAULT_CHANGES_LIMIT, type=int), MAX_CHANGES_LIMIT))
+    try:
+        fields = member_serializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        page = member_changes.changes(
+            since, limit, lambda query: member_serializer.select(query, fields, extra=('version',)))
+    except ChangeTokenExpired:
+        return jsonify({"error": "token 이 만료되었습니다. 전체 목록을 다시 받아야 합니다.", "reset": True}), 410
+    return jsonify({
+        'members': member_serializer.serialize(page.members, fields),
+        'deleted': page.deleted,
+        'token': page.token,
+        'has_more': page.has_more
+    })
+
+@bp.route('/api/members/<int:id>', methods=['GET'])
+@response_cache.cached('members')
 def get_member(id):
     member = Member.query.get_or_404(id)
     member_dict = member.to_dict()
     if member.photo:
-        member_dict['photoUrl'] = url_for('uploaded_file', filename=member.photo, _external=True)
+        member_dict['photoUrl'] = url_for('main.uploaded_file', filename=member.photo, _external=True)
     return jsonify(member_dict)
 
-@app.route('/api/members', methods=['POST', 'OPTIONS'])
+def household_dict(household_id, name, rows, fields):
+    return {'id': household_id, 'name': name, 'members': member_serializer.serialize(rows, fields)}
+
+@bp.route('/api/members/<int:id>/household', methods=['GET'])
+@response_cache.cached('members')
+def get_member_household(id):
+    """회원의 가정 (가정이 없으면 본인과 배우자) - 회원 목록과 같은 형식, fields= 로 키 선택"""
+    try:
+        fields = member_serializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    rows = member_households.household_of(id, member_serializer.columns(fields))
+    if not rows:
+        return jsonify({"error": "회원을 찾을 수 없습니다."}), 404
+    return jsonify(household_dict(rows[0][-2], rows[0][-1], rows, fields))
+
+@bp.route('/api/households', methods=['GET'])
+@response_cache.cached('members')
+def get_households():
+    """가정 목록 (가정마다 회원 목록 포함, district= 로 구역 필터) - 가정과 회원을 한 번의 조인으로 읽는다"""
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = max(1, min(request.args.get('per_page', 20, type=int), 100))
+    try:
+        fields = member_serializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    rows, has_more = member_households.households(member_serializer.columns(fields),
+                                                  district=request.args.get('district'), page=page, per_page=per_page)
+    households = {}
+    for row in rows:
+        households.setdefault((row[-2], row[-1]), []).append(row)
+    return jsonify({
+        'households': [household_dict(household_id, name, members, fields)
+                       for (household_id, name), members in households.items()],
+        'current_page': page,
+        'has_more': has_more,
+    })
+
+@bp.route('/api/members', methods=['POST', 'OPTIONS'])
 def create_member():
     data = request.json
     try:
-        email = data.get('email')
-        if not email or not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-            return jsonify({"error": "유효한 이메일 주소를 입력해주세요."}), 400
+        try:
+            values = new_member_values(data)
+        except InvalidMemberData as e:
+            return jsonify({"error": str(e)}), 400
 
-        if Member.query.filter_by(email=email).first():
+        if Member.query.filter_by(email=values['email']).first():
             return jsonify({"error": "이미 사용 중인 이메일 주소입니다."}), 400
 
-        new_member = Member(
-            name=data['name'],
-            email=email,
-            register_date=datetime.now().date(),
-            birth_year=int(data['birthYear']),
-            birth_month=int(data['birthMonth']),
-            birth_day=int(data['birthDay']),
-            phone=data['phone'],
-            gender=data['gender'],
-            address=data.get('address'),
-            city=data.get('city'),
-            state=data.get('state'),
-            zipcode=data.get('zipcode'),
-            district=data.get('district'),
-            spouse=data.get('spouse'),
-            position=data.get('position')
-        )
-        if 'photo' in data:
-            filename = f"member_{datetime.now().timestamp()}.jpg"
-            photo_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            with open(photo_path, "wb") as fh:
-                fh.write(base64.b64decode(data['photo']))
-            new_member.photo = filename
+        new_member = Member(**values)
+        if data.get('photo'):
+            new_member.photo = photo_store.save_base64(data['photo'])
 
         db.session.add(new_member)
         db.session.commit()
@@ -313,7 +832,7 @@ def create_member():
         db.session.rollback()
         return jsonify({"error": f"회원 등록 중 오류가 발생했습니다: {str(e)}"}), 500
 
-@app.route('/api/auth/login', methods=['POST'])
+@bp.route('/api/auth/login', methods=['POST'])
 @limiter.limit("5 per minute")
 def login():
     data = request.json
@@ -322,7 +841,11 @@ def login():
     
     user = User.query.filter_by(email=email).first()
     if user and user.check_password(password):
-        access_token = create_access_token(identity=user.id)
+        if credentials.needs_rehash(user.password_hash):
+            # 해시 알고리즘/비용 설정이 바뀌었으면 로그인한 비밀번호로 새로 해시
+            user.set_password(password)
+            db.session.commit()
+        access_token = create_access_token(identity=user.id, additional_claims=user_claims(user))
         refresh_token = create_refresh_token(identity=user.id)
         return jsonify({
             'user': user.to_dict(),
@@ -352,7 +875,7 @@ def is_password_strong(password, strict=False):
         return False
     return True
 
-@app.route('/api/auth/signup', methods=['POST'])
+@bp.route('/api/auth/signup', methods=['POST'])
 @limiter.limit("3 per hour")
 def signup():
     data = request.json
@@ -373,10 +896,11 @@ def signup():
     
     return jsonify({"message": "회원가입 성공"}), 201
 
-@app.route('/api/members/search', methods=['GET'])
+@bp.route('/api/members/search', methods=['GET'])
+@response_cache.cached('members')
 def search_members():
-    name = request.args.get('name')
-    members = Member.query.filter(Member.name.like(f'%{name}%')).all()
+    name = request.args.get('name', '')
+    members = member_search_index.search(name, request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int))
     return jsonify([
         {
             'id': member.id,
@@ -392,18 +916,18 @@ def error_response(message, status_code):
     response.status_code = status_code
     return response
 
-@app.route('/api/members/<int:id>', methods=['PUT'])
-@jwt_required()
+@bp.route('/api/members/<int:id>', methods=['PUT'])
+@role_required((UserRole.ADMIN, UserRole.SUPER_ADMIN), "권한이 없습니다.", message_key='message')
 def update_member(id):
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        if not user or user.role not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
-            return jsonify({"message": "권한이 없습니다."}), 403
-        
         member = Member.query.get_or_404(id)
         data = request.json  # JSON 데이터 사용
-        
+
+        try:
+            check_birth_date(data, {column: getattr(member, column) for column in BIRTH_DATE_COLUMNS})
+        except InvalidMemberData as e:
+            return jsonify({"error": str(e)}), 400
+
         for key, value in data.items():
             if hasattr(member, key):
                 setattr(member, key, value)
@@ -412,40 +936,147 @@ def update_member(id):
         return jsonify({"message": "회원 정보가 업데이트되었습니다."}), 200
     except Exception as e:
         db.session.rollback()
-        app.logger.error(f"회원 정보 업데이트 중 오류 발생: {str(e)}")
+        current_app.logger.error(f"회원 정보 업데이트 중 오류 발생: {str(e)}")
         return jsonify({"error": "회원 정보 업데이트 중 오류가 발생했습니다."}), 500
 
-@app.route('/uploads/<filename>')
+# 내용 해시 파일은 1년간 immutable, 그 외 파일은 매번 재검증 (ETag/If-None-Match, Range 는 send_file 이 처리)
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+
+@bp.route('/uploads/<filename>')
 def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    if safe_join(current_app.config['UPLOAD_FOLDER'], filename) is None:
+        abort(404)
+    filename, fallback = photo_store.resolve(filename)
+    if filename is None:
+        abort(404)
+    # 썸네일 대신 보내는 원본은 썸네일이 생기면 바뀌므로 immutable 로 캐시하지 않는다
+    etag = None if fallback else content_etag(filename)
+    offload = current_app.config['UPLOADS_OFFLOAD']
+    if offload:
+        # 프록시(nginx/apache)가 파일을 직접 전송 - 파이썬 프로세스는 헤더만 만든다
+        path = safe_join(current_app.config['UPLOAD_FOLDER'], filename)
+        response = make_response('')
+        response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if offload == 'x-accel-redirect':
+            response.headers['X-Accel-Redirect'] = current_app.config['UPLOADS_ACCEL_PREFIX'].rstrip('/') + '/' + filename
+        else:
+            response.headers['X-Sendfile'] = path
+    else:
+        response = send_from_directory(current_app.config['UPLOAD_FOLDER'], filename, etag=etag or True, conditional=True)
+    if etag:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response.headers['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+    return response
 
-@app.route('/api/members/<int:id>', methods=['DELETE'])
-@jwt_required()
+@bp.route('/api/members/batch', methods=['POST'])
+@role_required((UserRole.ADMIN, UserRole.SUPER_ADMIN), "권한이 없습니다.", message_key='message')
+def batch_members():
+    """회원 일괄 등록/수정/삭제
+
+    {"create": [등록 본문, ...], "update": [{"id": 1, "district": "3구역"}, ...], "delete": [2, 3], "atomic": false}
+    유효한 항목을 한 트랜잭션으로 반영하고 항목별 결과를 반환한다.
+    atomic=true 이면 하나라도 실패할 때 아무것도 반영하지 않고 400 을 반환한다.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "요청 본문은 JSON 객체여야 합니다."}), 400
+    creates, updates, deletes = (data.get(key) or [] for key in ('create', 'update', 'delete'))
+    if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+        return jsonify({"error": "create, update, delete 는 배열이어야 합니다."}), 400
+    if len(creates) + len(updates) + len(deletes) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"한 번에 최대 {MAX_BATCH_SIZE}건까지 처리할 수 있습니다."}), 400
+    atomic = bool(data.get('atomic'))
+
+    # 사진은 임시 파일로만 써 두고 커밋된 뒤에 제 이름으로 옮긴다 (롤백되면 지운다)
+    staged_photos = []
+
+    def stage_photo(photo):
+        staged = photo_store.stage_base64(photo)
+        staged_photos.append(staged)
+        return staged[0]
+
+    try:
+        result = apply_member_batch(db.session, Member, creates, updates, deletes, stats=member_stats,
+                                    save_photo=stage_photo, atomic=atomic)
+        # 일괄 쓰기는 매퍼 이벤트를 거치지 않으므로 검색 색인을 직접 갱신
+        member_search_index.index_members(db.session, result.created + result.renamed + result.deleted)
+        member_changes.touch(db.session, result.created + result.updated)
+        member_changes.record_deletes(db.session, result.deleted)
+        member_households.unlink(db.session, result.deleted)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        for staged in staged_photos:
+            photo_store.discard(staged)
+        return jsonify({"error": f"일괄 처리 중 제약 조건 위반으로 모두 취소되었습니다: {e.orig}"}), 409
+    except Exception as e:
+        db.session.rollback()
+        for staged in staged_photos:
+            photo_store.discard(staged)
+        current_app.logger.exception("회원 일괄 처리 중 오류 발생: %s", e)
+        return jsonify({"error": "회원 일괄 처리 중 오류가 발생했습니다."}), 500
+    for staged in staged_photos:
+        photo_store.publish(staged)
+
+    if result.created or result.updated or result.deleted:
+        response_cache.invalidate('members')
+        member_calendar.clear_cache()
+    if atomic and result.failed:
+        return jsonify({"error": "실패한 항목이 있어 아무것도 반영하지 않았습니다.", **result.to_dict()}), 400
+    return jsonify(result.to_dict()), 200
+
+@bp.route('/api/members/<int:id>', methods=['DELETE'])
+@role_required((UserRole.ADMIN, UserRole.SUPER_ADMIN), "권한이 없습니다.", message_key='message')
 def delete_member(id):
-    current_user = get_jwt_identity()
-    user = User.query.filter_by(email=current_user).first()
-    if not user or user.role not in ['ADMIN', 'SUPER_ADMIN']:
-        return jsonify({"message": "권한이 없습니다."}), 403
-    
     member = Member.query.get_or_404(id)
     db.session.delete(member)
     db.session.commit()
     return jsonify({"message": "회원이 삭제되었습니다."}), 200
 
-@app.route('/api/admin/users', methods=['GET'])
-@jwt_required()
+@bp.route('/api/stats', methods=['GET'])
+@bp.route('/api/stats/<dimension>', methods=['GET'])
+@admin_required
+def get_stats(dimension=None):
+    """항목별 회원 수 (gender, district, position, role, birth_decade, birth_month, register_year, register_month)
+
+    기본은 요약 테이블을 읽고, source=live 이면 Member 를 GROUP BY 로 직접 집계한다.
+    """
+    if dimension is not None and dimension not in DIMENSION_NAMES:
+        return jsonify({"error": f"지원하지 않는 통계 항목입니다: {dimension}"}), 404
+    dimensions = [dimension] if dimension else DIMENSION_NAMES
+    live = request.args.get('source') == 'live'
+    stats = member_stats.get(dimensions, live=live)
+    if live:
+        total = db.session.query(db.func.count(Member.id)).scalar()
+    else:
+        # 모든 회원은 gender 항목의 버킷 하나에 속하므로 그 합이 전체 회원 수
+        total = db.session.query(db.func.coalesce(db.func.sum(MemberStat.count), 0)) \
+            .filter(MemberStat.dimension == 'gender').scalar()
+    return jsonify({
+        'total': total,
+        'stats': stats if dimension is None else stats[dimension]
+    }), 200
+
+@bp.route('/api/admin/cache/stats', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    return jsonify(response_cache.get_stats()), 200
+
+@bp.route('/api/admin/users', methods=['GET'])
 @admin_required
 def get_all_users():
     try:
         users = User.query.all()
-        app.logger.info(f"Retrieved {len(users)} users")
+        current_app.logger.info(f"Retrieved {len(users)} users")
         return jsonify([user.to_dict() for user in users]), 200
     except Exception as e:
-        app.logger.error(f"Error in get_all_users: {str(e)}")
+        current_app.logger.error(f"Error in get_all_users: {str(e)}")
         return jsonify({"error": "사용자 목록을 불러오는 중 오류가 발생했습니다."}), 500
 
-@app.route('/api/admin/users', methods=['POST'])
-@jwt_required()
+@bp.route('/api/admin/users', methods=['POST'])
 @super_admin_required
 def create_user():
     data = request.json
@@ -469,8 +1100,7 @@ def create_user():
 
     return jsonify(new_user.to_dict()), 201
 
-@app.route('/api/admin/users/<int:user_id>', methods=['PUT'])
-@jwt_required()
+@bp.route('/api/admin/users/<int:user_id>', methods=['PUT'])
 @super_admin_required
 def update_user(user_id):
     user = User.query.get_or_404(user_id)
@@ -488,7 +1118,7 @@ def update_user(user_id):
     db.session.commit()
     return jsonify(user.to_dict()), 200
 
-@app.route('/api/admin/users/<int:user_id>/role', methods=['PUT'])
+@bp.route('/api/admin/users/<int:user_id>/role', methods=['PUT'])
 @super_admin_required
 def update_user_role(user_id):
     user = User.query.get_or_404(user_id)
@@ -499,34 +1129,29 @@ def update_user_role(user_id):
         return jsonify(user.to_dict()), 200
     return jsonify({"error": "Invalid role"}), 400
 
-@app.route('/api/auth/logout', methods=['POST'])
+@bp.route('/api/auth/logout', methods=['POST'])
 @jwt_required()
 def logout():
-    jti = get_jwt()['jti']
-    jwt_redis_blocklist.set(jti, '', ex=3600)
+    token = get_jwt()
+    # 토큰이 만료될 때까지만 블록리스트에 보관
+    token_blocklist.revoke(token['jti'], max(1, token['exp'] - int(time.time())))
     response = make_response(jsonify({"message": "그아웃 성공"}))
     response.delete_cookie('access_token')
     response.delete_cookie('refresh_token')
     return response, 200
 
-@app.route('/api/auth/check', methods=['GET'])
+@bp.route('/api/auth/check', methods=['GET'])
 @jwt_required(optional=True)
 def check_auth():
-    current_user_id = get_jwt_identity()
-    if current_user_id:
-        user = User.query.get(current_user_id)
-        if user:
-            return jsonify({
-                "isLoggedIn": True,
-                "user": {
-                    "id": user.id,
-                    "email": user.email,
-                    "role": user.role.value
-                }
-            }), 200
+    user = get_current_user()
+    if user:
+        return jsonify({
+            "isLoggedIn": True,
+            "user": user.to_dict()
+        }), 200
     return jsonify({"isLoggedIn": False}), 200
 
-@app.route('/api/admin/users/<int:user_id>', methods=['DELETE'])
+@bp.route('/api/admin/users/<int:user_id>', methods=['DELETE'])
 @super_admin_required
 def delete_user(user_id):
     user = User.query.get_or_404(user_id)
@@ -534,21 +1159,22 @@ def delete_user(user_id):
     db.session.commit()
     return jsonify({"message": "User deleted successfully"}), 200
 
+@bp.cli.command("create-super-admin")
 def create_super_admin():
-    with app.app_context():
-        super_admin_email = os.getenv('SUPER_ADMIN_EMAIL')
-        super_admin_password = os.getenv('SUPER_ADMIN_PASSWORD')
-        super_admin = User.query.filter_by(email=super_admin_email).first()
-        if not super_admin:
-            super_admin = User(email=super_admin_email, role=UserRole.SUPER_ADMIN)
-            super_admin.set_password(super_admin_password)
-            db.session.add(super_admin)
-        else:
-            super_admin.role = UserRole.SUPER_ADMIN
-        db.session.commit()
-        print(f"Super admin {super_admin_email} has been created or updated.")
+    # SUPER_ADMIN_EMAIL / SUPER_ADMIN_PASSWORD 로 최고 관리자 계정을 만들거나 권한을 복구한다
+    super_admin_email = os.getenv('SUPER_ADMIN_EMAIL')
+    super_admin_password = os.getenv('SUPER_ADMIN_PASSWORD')
+    super_admin = User.query.filter_by(email=super_admin_email).first()
+    if not super_admin:
+        super_admin = User(email=super_admin_email, role=UserRole.SUPER_ADMIN)
+        super_admin.set_password(super_admin_password)
+        db.session.add(super_admin)
+    else:
+        super_admin.role = UserRole.SUPER_ADMIN
+    db.session.commit()
+    print(f"Super admin {super_admin_email} has been created or updated.")
 
-@app.cli.command("update_null_emails")
+@bp.cli.command("update_null_emails")
 def update_null_emails():
     members = Member.query.filter(Member.email == None).all()
     for member in members:
@@ -556,38 +1182,100 @@ def update_null_emails():
     db.session.commit()
     print(f"Updated {len(members)} members with null emails.")
 
-@app.route('/api/auth/refresh', methods=['POST'])
+@bp.route('/api/auth/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
-    current_user = get_jwt_identity()
-    new_access_token = create_access_token(identity=current_user)
+    # 갱신 시에는 DB 의 최신 권한으로 클레임을 다시 만든다
+    user = get_current_user()
+    new_access_token = create_access_token(identity=user.id, additional_claims=user_claims(user))
     return jsonify(access_token=new_access_token), 200
 
 # JWT 설정에 토큰 확인 콜백 추가
 @jwt.token_in_blocklist_loader
 def check_if_token_is_revoked(jwt_header, jwt_payload):
-    jti = jwt_payload["jti"]
-    token_in_redis = jwt_redis_blocklist.get(jti)
-    return token_in_redis is not None
+    return token_blocklist.is_revoked(jwt_payload["jti"])
+
+@bp.route('/metrics')
+@limiter.exempt
+def metrics():
+    # Prometheus 수집용 - 주기적으로 긁어 가므로 요청 수 제한에서 제외
+    return instrumentation.metrics_response()
 
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def not_found_error(error):
     return error_response("요청한 리소스를 찾을 수 없습니다.", 404)
 
-@app.errorhandler(500)
+@bp.app_errorhandler(CredentialServiceBusy)
+def credential_service_busy(error):
+    # 로그인이 몰려 비밀번호 해시 작업이 밀려 있음 - 잠시 후 다시 시도
+    response = error_response("요청이 많아 잠시 후 다시 시도해주세요.", 503)
+    response.headers['Retry-After'] = '1'
+    return response
+
+@bp.app_errorhandler(BlocklistUnavailable)
+def blocklist_unavailable(error):
+    # 토큰 블록리스트 저장소(Redis, 예비 SQLite)에 기록할 수 없어 로그아웃을 처리하지 못함
+    response = error_response("로그아웃을 처리할 수 없습니다. 잠시 후 다시 시도해주세요.", 503)
+    response.headers['Retry-After'] = '5'
+    return response
+
+@bp.app_errorhandler(500)
 def internal_error(error):
     db.session.rollback()
     return error_response("서버 내부 오류가 발생했습니다.", 500)
 
-@app.after_request
+@bp.after_app_request
 def add_security_headers(response):
     response.headers['X-Content-Type-Options'] = 'nosniff'
     response.headers['X-Frame-Options'] = 'SAMEORIGIN'
     response.headers['X-XSS-Protection'] = '1; mode=block'
     return response
 
-@app.route('/api/import-db', methods=['POST'])
-@jwt_required()
+def invalidate_member_caches():
+    # 매퍼 이벤트를 거치지 않은 회원 쓰기 뒤에 호출 (응답 캐시와 생일 목록 캐시)
+    response_cache.invalidate('members')
+    member_calendar.clear_cache()
+
+def after_members_imported(session, emails):
+    # 일괄 INSERT/UPDATE 는 매퍼 이벤트를 거치지 않으므로 검색 색인, 변경 번호, 응답 캐시를 직접 갱신
+    ids = [member_id for (member_id,) in session.query(Member.id).filter(Member.email.in_(emails))]
+    member_search_index.index_members(session, ids)
+    member_changes.touch(session, ids)
+    session.commit()
+    invalidate_member_caches()
+
+IMPORT_JOB_FILENAME = 'members.csv'
+
+@job_runner.handler('import_members')
+def run_import_job(job, params):
+    path = job.path(IMPORT_JOB_FILENAME)
+    with open(path, 'rb') as fh:
+        # 진행률 표시용 대략적인 행 수 (헤더 제외)
+        total = sum(chunk.count(b'\n') for chunk in iter(lambda: fh.read(1024 * 1024), b''))
+        fh.seek(0)
+        job.progress(0, max(total - 1, 0), force=True)
+        try:
+            chunks = import_members_csv(fh, db.session, Member, after_chunk=after_members_imported,
+                                        progress=job.progress)
+        finally:
+            # 취소/실패 전에 커밋된 청크도 통계에 반영
+            member_stats.rebuild()
+    os.remove(path)
+    return {
+        'inserted': sum(chunk['inserted'] for chunk in chunks),
+        'updated': sum(chunk['updated'] for chunk in chunks),
+        'rejected': sum(chunk['rejected'] for chunk in chunks),
+        'chunks': chunks
+    }
+
+@job_runner.on_complete('import_members')
+@job_runner.on_complete('generate_thumbnails')
+@job_runner.on_complete('restore')
+def after_member_job(job):
+    response_cache.invalidate('members')
+    member_calendar.clear_cache()
+
+@bp.route('/api/import-db', methods=['POST'])
 @super_admin_required
 def import_db():
     if 'file' not in request.files:
@@ -596,31 +1284,136 @@ def import_db():
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
     if file and file.filename.endswith('.csv'):
-        try:
-            # CSV 파일 읽기
-            stream = StringIO(file.stream.read().decode("UTF8"), newline=None)
-            df = pd.read_csv(stream)
-            
-            # 데이터베이스에 데이터 삽입 또는 업데이트
-            for _, row in df.iterrows():
-                member = Member.query.filter_by(email=row['email']).first()
-                if member:
-                    # 기존 회원 정보 업데이트
-                    for column in df.columns:
-                        setattr(member, column, row[column])
-                else:
-                    # 새 회원 추가
-                    new_member = Member(**row.to_dict())
-                    db.session.add(new_member)
-            
-            db.session.commit()
-            return jsonify({'message': 'Database imported successfully'}), 200
-        except Exception as e:
-            db.session.rollback()
-            return jsonify({'error': str(e)}), 500
+        # 업로드 파일을 작업 폴더에 저장하고 백그라운드 작업으로 가져온다 (/api/jobs/<id> 로 진행률 확인)
+        job = job_runner.create('import_members', {'filename': secure_filename(file.filename)},
+                                created_by=get_current_user().id)
+        file.save(os.path.join(job_runner.job_folder(job.id), IMPORT_JOB_FILENAME))
+        job_runner.submit(job)
+        return job_accepted(job)
     return jsonify({'error': 'File type not allowed'}), 400
 
-@app.route('/api/members/<int:id>/photo', methods=['PUT'])
+@job_runner.handler('generate_thumbnails')
+def run_thumbnails_job(job, params):
+    filenames = photo_store.originals()
+    job.progress(0, len(filenames), force=True)
+    for index, filename in enumerate(filenames, 1):
+        photo_store.make_thumbnails(filename)
+        job.progress(index)
+    return {'photos': len(filenames)}
+
+@bp.route('/api/admin/photos/thumbnails', methods=['POST'])
+@admin_required
+def create_thumbnails_job():
+    # 저장된 모든 사진의 썸네일을 다시 만든다 (업로드 시 썸네일은 스레드 풀에서 생성)
+    job = job_runner.enqueue('generate_thumbnails', created_by=get_current_user().id)
+    return job_accepted(job)
+
+@job_runner.handler('backup')
+def run_backup_job(job, params):
+    compression = params.get('compression', 'gzip')
+    extension, mimetype = BACKUP_COMPRESSIONS[compression]
+    filename = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
+    manifest = database_backup.write(job.path(filename), job.folder, compression, progress=job.progress)
+    return {'filename': filename, 'mimetype': mimetype, 'revision': manifest['revision'],
+            'uploads': manifest['uploads'], 'bytes': os.path.getsize(job.path(filename))}
+
+@bp.route('/api/admin/backup', methods=['POST'])
+@super_admin_required
+def create_backup_job():
+    """DB 와 업로드 파일을 백그라운드에서 백업한다. 완료 후 /api/jobs/<id>/download 로 받는다."""
+    compression = request.args.get('compression', current_app.config['BACKUP_COMPRESSION'])
+    if compression not in BACKUP_COMPRESSIONS:
+        return jsonify({"error": "지원하지 않는 압축 형식입니다. (gzip, zstd)"}), 400
+    if not compression_available(compression):
+        return jsonify({"error": "zstd 압축을 사용하려면 zstandard 패키지가 필요합니다."}), 501
+    if not database_backup.supported:
+        return jsonify({"error": "이 DB 는 백업을 지원하지 않습니다. (SQLite, PostgreSQL)"}), 501
+    job = job_runner.enqueue('backup', {'compression': compression}, created_by=get_current_user().id)
+    return job_accepted(job)
+
+RESTORE_JOB_FILENAME = 'backup.tar'
+
+@job_runner.handler('restore')
+def run_restore_job(job, params):
+    path = job.path(RESTORE_JOB_FILENAME)
+    result = database_backup.restore(path, job.folder, progress=job.progress)
+    os.remove(path)
+    response_cache.invalidate('members')
+    member_calendar.clear_cache()
+    return result
+
+@bp.route('/api/admin/restore', methods=['POST'])
+@super_admin_required
+def create_restore_job():
+    """백업 파일을 올려 DB 와 업로드 파일을 복원한다. (/api/jobs/<id> 로 진행률 확인)"""
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file part'}), 400
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No selected file'}), 400
+    job = job_runner.create('restore', {'filename': secure_filename(file.filename)},
+                            created_by=get_current_user().id)
+    path = os.path.join(job_runner.job_folder(job.id), RESTORE_JOB_FILENAME)
+    file.save(path)
+    try:
+        # 형식/DB 종류/스키마 버전은 작업을 만들기 전에 확인한다
+        manifest = database_backup.check(read_manifest(path))
+    except InvalidBackup as e:
+        shutil.rmtree(job_runner.job_folder(job.id), ignore_errors=True)
+        return jsonify({'error': str(e)}), 400
+    job.params = json.dumps({'filename': secure_filename(file.filename), 'created_at': manifest['created_at'],
+                             'revision': manifest['revision']}, ensure_ascii=False)
+    job_runner.submit(job)
+    return job_accepted(job)
+
+@bp.route('/api/jobs', methods=['GET'])
+@admin_required
+def list_jobs():
+    query = Job.query
+    status = request.args.get('status')
+    if status:
+        query = query.filter(Job.status == status)
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    jobs = query.order_by(Job.created_at.desc()).limit(limit).all()
+    return jsonify([job.to_dict() for job in jobs]), 200
+
+@bp.route('/api/jobs/<job_id>', methods=['GET'])
+@admin_required
+def get_job(job_id):
+    job = job_runner.get(job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    return jsonify(job.to_dict()), 200
+
+@bp.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+@admin_required
+def cancel_job(job_id):
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    if not job_runner.cancel(job):
+        return jsonify({"error": "이미 끝난 작업입니다.", "job": job.to_dict()}), 409
+    return jsonify(job.to_dict()), 200
+
+@bp.route('/api/jobs/<job_id>/download', methods=['GET'])
+@admin_required
+def download_job_result(job_id):
+    job = db.session.get(Job, job_id)
+    if job is None or job.kind not in ('export_members', 'backup'):
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    if job.kind == 'backup' and get_current_user().role != UserRole.SUPER_ADMIN:
+        # 백업에는 비밀번호 해시가 들어 있다
+        return jsonify({"error": "최고 관리자 권한이 필요합니다."}), 403
+    if job.status != 'succeeded':
+        return jsonify({"error": "작업이 아직 끝나지 않았습니다.", "job": job.to_dict()}), 409
+    result = json.loads(job.result)
+    if not os.path.exists(os.path.join(job_runner.job_folder(job.id), result['filename'])):
+        return jsonify({"error": "보관 기간이 지나 파일이 삭제되었습니다."}), 410
+    mimetype = result.get('mimetype') or EXPORT_FORMATS[result['format']][0]
+    return send_from_directory(job_runner.job_folder(job.id), result['filename'], mimetype=mimetype,
+                               as_attachment=True, download_name=result['filename'])
+
+@bp.route('/api/members/<int:id>/photo', methods=['PUT'])
 @jwt_required()
 def update_member_photo(id):
     if 'photo' not in request.files:
@@ -629,14 +1422,55 @@ def update_member_photo(id):
     if file.filename == '':
         return jsonify({"message": "No selected file"}), 400
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
         member = Member.query.get_or_404(id)
-        member.photoUrl = filename
+        member.photo = photo_store.save_stream(file.stream, file.filename.rsplit('.', 1)[1].lower())
         db.session.commit()
         return jsonify({"message": "Photo updated successfully"}), 200
     return jsonify({"message": "File type not allowed"}), 400
 
+def create_app(config_name=None, overrides=None):
+    """애플리케이션 팩토리 - config_name 은 config.py 의 config 키 (기본: FLASK_CONFIG 또는 'default')
+
+    overrides 는 설정 클래스 값 위에 덮어쓸 설정 (테스트/벤치마크용)
+    """
+    config_name = config_name or os.getenv('FLASK_CONFIG', 'default')
+    app = Flask(__name__)
+    app.config.from_object(config[config_name])
+    app.config.update(overrides or {})
+    init_json(app)
+    CORS(app, resources={r"/api/*": {"origins": app.config['CORS_ORIGINS']}}, supports_credentials=True)
+
+    configure_engine_options(app)
+    db.init_app(app)
+    configure_engine(app, db)
+    instrumentation.init_app(app, db)
+    credentials.init_app(app)
+    migrate.init_app(app, db)
+    jwt.init_app(app)
+    limiter.init_app(app)
+
+    # Redis 공유 커넥션 풀 (연결은 첫 명령 때 맺으므로 시작 시 Redis 가 없어도 된다)
+    redis_client = create_redis_client(app.config['REDIS_URL']) if app.config['REDIS_URL'] else None
+    app.extensions['redis'] = redis_client
+
+    token_blocklist.init_app(app, redis_client)
+    member_search_index.init_app(app, db, Member)
+    response_cache.init_app(app, redis_client)
+    member_stats.init_app(app, db, Member, MemberStat)
+    member_calendar.init_app(app, db, Member, generation=lambda: response_cache.generation('members'))
+    member_changes.init_app(app, db, Member, MemberTombstone, SyncCounter)
+    member_households.init_app(app, db, Member, Household, member_changes, on_change=invalidate_member_caches)
+    job_runner.init_app(app, db, Job, redis_client)
+    database_backup.init_app(app, db, Job, member_changes)
+    photo_store.init_app(app)
+    member_serializer.init_app(app, Member, photo_store)
+
+    app.register_blueprint(bp)
+    return app
+
 if __name__ == '__main__':
-    create_super_admin()
-    app.run(port=5001)
\ No newline at end of file
+    # 개발 서버 - 운영 환경에서는 wsgi.py (gunicorn) 와 flask run-jobs 를 사용한다
+    app = create_app()
+    # 가져오기/내보내기 작업 워커 (리로더가 워커를 중복으로 띄우지 않도록 리로더는 끄고 실행)
+    job_runner.start_workers(app.config['JOB_WORKERS'])
+    app.run(port=5001, use_reloader=False)
\ No newline at end of file
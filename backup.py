@@ -0,0 +1,430 @@
+"""DB/업로드 파일 온라인 백업과 복원
+
+백업 파일은 압축(gzip 또는 zstd)한 tar 스트림이다.
+  manifest.json      형식 버전, 만든 시각, DB 종류, 스키마(alembic) 버전, 항목 크기
+  database.sqlite    SQLite: 온라인 백업 API 로 복사한 DB 파일
+  database.pgdump    PostgreSQL: pg_dump -Fc 논리 덤프
+  uploads/<파일>     UPLOAD_FOLDER 의 사진/썸네일
+
+- 백업: SQLite 는 WAL 모드에서 한 번의 읽기 트랜잭션으로 복사하므로 복사 중에도 쓰기가 막히지 않는다.
+  (WAL 이 아니면 BACKUP_STEP_PAGES 페이지씩 나눠 복사해 사이사이 쓰기가 끼어들 수 있게 한다)
+  DB 사본을 작업 폴더에 만든 뒤 업로드 파일과 함께 청크 단위로 압축하며 쓴다.
+- 복원: 백업 파일을 청크 단위로 풀면서(진행률 보고, 이 단계에서는 취소 가능) DB 사본과 업로드 파일을 준비하고,
+  무결성을 확인한 뒤 현재 DB 에 한 번에 적용한다. 적용은 SQLite 백업 API(한 트랜잭션) 또는
+  pg_restore --single-transaction 이라 도중에 실패해도 이전 DB 가 그대로 남는다.
+  적용하는 동안(보통 수 초) 다른 쓰기는 잠금을 기다린다. 업로드 파일은 추가/덮어쓰기만 하고 지우지 않는다.
+- job 테이블(작업 기록)은 복원하지 않고 현재 기록을 유지한다.
+- 복원 후 회원 변경 번호를 뒤로 옮겨, 이전 DB 에서 받은 동기화 token 은 전체 재동기화를 요구한다.
+- 스키마 버전이 다른 백업은 복원하지 않는다. (같은 버전으로 마이그레이션한 뒤 복원)
+"""
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import tarfile
+import tempfile
+import time
+import zlib
+from datetime import datetime
+
+import click
+from sqlalchemy import func, inspect, select, text
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BACKUP_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+# DB 종류 -> 백업 안의 DB 파일 이름
+DATABASE_NAMES = {'sqlite': 'database.sqlite', 'postgresql': 'database.pgdump'}
+UPLOADS_PREFIX = 'uploads/'
+# 압축 -> (파일 확장자, mimetype)
+COMPRESSIONS = {
+    'gzip': ('.tar.gz', 'application/gzip'),
+    'zstd': ('.tar.zst', 'application/zstd'),
+}
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_STEP_PAGES = 1024
+DEFAULT_STEP_SLEEP = 0.05  # 초
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+# 업로드 파일 이름 (하위 폴더, 숨김 파일, 경로 조작 없이)
+UPLOAD_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9._-]*$')
+# 복원 중인 업로드 파일 (숨김 파일이라 사진 목록에 나오지 않는다)
+RESTORE_PREFIX = '.restore-'
+
+
+class InvalidBackup(ValueError):
+    """백업 파일이 아니거나 손상되었거나 이 DB 에 복원할 수 없음"""
+
+
+def compression_available(compression):
+    return compression == 'gzip' or (compression == 'zstd' and zstandard is not None)
+
+
+def _corrupt_errors():
+    errors = (tarfile.TarError, EOFError, zlib.error, gzip.BadGzipFile)
+    return errors + (zstandard.ZstdError,) if zstandard is not None else errors
+
+
+def _open_writer(fh, compression):
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd 로 압축하려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdCompressor(level=3).stream_writer(fh, closefd=False)
+    return gzip.GzipFile(fileobj=fh, mode='wb', compresslevel=6)
+
+
+def _open_reader(fh):
+    magic = fh.read(len(ZSTD_MAGIC))
+    fh.seek(0)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=fh, mode='rb')
+    if magic == ZSTD_MAGIC:
+        if zstandard is None:
+            raise InvalidBackup("zstd 로 압축된 백업을 풀려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdDecompressor().stream_reader(fh, closefd=False)
+    raise InvalidBackup("백업 파일 형식이 아닙니다. (.tar.gz, .tar.zst)")
+
+
+class _ProgressReader:
+    """읽은 바이트 수를 progress(offset + 누적) 로 알리는 파일 래퍼 (tar 에 항목을 쓸 때)"""
+
+    def __init__(self, fh, progress, offset):
+        self.fh = fh
+        self.progress = progress
+        self.offset = offset
+
+    def read(self, size=-1):
+        data = self.fh.read(size)
+        self.offset += len(data)
+        self.progress(self.offset)
+        return data
+
+
+def read_manifest(path):
+    """백업 파일의 manifest dict (첫 항목만 읽는다). 백업 파일이 아니면 InvalidBackup"""
+    try:
+        with open(path, 'rb') as fh, _open_reader(fh) as stream, \
+                tarfile.open(fileobj=stream, mode='r|') as tar:
+            member = tar.next()
+            if member is None or member.name != MANIFEST_NAME or not member.isfile():
+                raise InvalidBackup("백업 파일에 manifest.json 이 없습니다.")
+            manifest = json.loads(tar.extractfile(member).read())
+    except InvalidBackup:
+        raise
+    except (ValueError,) + _corrupt_errors() as e:
+        raise InvalidBackup(f"백업 파일을 읽을 수 없습니다: {e}") from e
+    if not isinstance(manifest, dict) or manifest.get('format') != BACKUP_FORMAT:
+        raise InvalidBackup("지원하지 않는 백업 형식입니다.")
+    return manifest
+
+
+def schema_revision(connection):
+    """alembic 스키마 버전 (마이그레이션 대신 create_all 로 만든 DB 는 None)"""
+    if not inspect(connection).has_table('alembic_version'):
+        return None
+    return connection.execute(text('SELECT version_num FROM alembic_version')).scalar()
+
+
+def _postgresql_env(url):
+    """pg_dump/pg_restore 접속 정보 (비밀번호가 명령줄에 보이지 않도록 환경 변수로)"""
+    values = {'PGHOST': url.host, 'PGPORT': url.port, 'PGUSER': url.username, 'PGPASSWORD': url.password,
+              'PGDATABASE': url.database}
+    return dict(os.environ, **{name: str(value) for name, value in values.items() if value is not None})
+
+
+def _run(command, env, stdout=None):
+    try:
+        result = subprocess.run(command, env=env, stdout=stdout, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        raise RuntimeError(f"{command[0]} 명령을 찾을 수 없습니다. (PostgreSQL 클라이언트 설치 필요)")
+    if result.returncode != 0:
+        raise RuntimeError(f"{command[0]} 실패: {result.stderr.decode('utf-8', 'replace').strip()}")
+
+
+class DatabaseBackup:
+    def __init__(self, app=None, db=None, job_model=None, change_feed=None):
+        self.db = None
+        self.job_model = None
+        self.change_feed = None
+        if app is not None:
+            self.init_app(app, db, job_model, change_feed)
+
+    def init_app(self, app, db, job_model, change_feed):
+        self.db = db
+        self.job_model = job_model
+        self.change_feed = change_feed
+        self.upload_folder = app.config['UPLOAD_FOLDER']
+        self.compression = app.config.get('BACKUP_COMPRESSION', 'gzip')
+        self.step_pages = app.config.get('BACKUP_STEP_PAGES', DEFAULT_STEP_PAGES)
+        self.step_sleep = app.config.get('BACKUP_STEP_SLEEP', DEFAULT_STEP_SLEEP)
+        app.extensions['backup'] = self
+
+        @app.cli.command('backup-db')
+        @click.argument('path')
+        @click.option('--compression', type=click.Choice(list(COMPRESSIONS)), default=None,
+                      help='기본: BACKUP_COMPRESSION')
+        def backup_db(path, compression):
+            # 앱을 멈추지 않고 백업 파일을 만든다 (cron 용)
+            work_folder = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.backup-')
+            try:
+                manifest = self.write(path, work_folder, compression)
+            finally:
+                shutil.rmtree(work_folder, ignore_errors=True)
+            print(f"Wrote backup {path}: {manifest['uploads']} uploads, {manifest['bytes']} bytes before compression, "
+                  f"{os.path.getsize(path)} bytes compressed.")
+
+    @property
+    def dialect(self):
+        return self.db.engine.dialect.name
+
+    @property
+    def supported(self):
+        return self.dialect in DATABASE_NAMES
+
+    # 백업
+
+    def write(self, path, work_folder, compression=None, progress=None):
+        """DB 와 업로드 파일을 path 에 백업하고 manifest 를 반환한다.
+
+        progress 는 JobContext.progress 형식 - progress(처리한 바이트, 전체 바이트, force)
+        """
+        compression = compression or self.compression
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        dialect = self.dialect
+        if dialect not in DATABASE_NAMES:
+            raise RuntimeError(f"{dialect} DB 는 백업을 지원하지 않습니다.")
+        database_name = DATABASE_NAMES[dialect]
+        database_path = os.path.join(work_folder, database_name)
+        uploads = self._list_uploads()
+        members = self.change_feed.model.__table__
+        with self.db.engine.connect() as connection:
+            revision = schema_revision(connection)
+            member_count = connection.execute(select(func.count()).select_from(members)).scalar()
+        try:
+            if dialect == 'sqlite':
+                self._copy_sqlite(database_path)
+                # 복사한 시점의 회원 수
+                copy = sqlite3.connect(database_path)
+                try:
+                    member_count = copy.execute(f'SELECT count(*) FROM "{members.name}"').fetchone()[0]
+                finally:
+                    copy.close()
+            else:
+                self._dump_postgresql(database_path)
+            database_bytes = os.path.getsize(database_path)
+            manifest = {
+                'format': BACKUP_FORMAT,
+                'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+                'dialect': dialect,
+                'revision': revision,
+                'members': member_count,
+                'compression': compression,
+                'database': database_name,
+                'database_bytes': database_bytes,
+                'uploads': len(uploads),
+                'bytes': database_bytes + sum(size for _, size in uploads),
+            }
+            if progress:
+                progress(0, manifest['bytes'])
+            with open(path, 'wb') as fh, _open_writer(fh, compression) as stream, \
+                    tarfile.open(fileobj=stream, mode='w|', copybufsize=CHUNK_SIZE) as tar:
+                data = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+                info = tarfile.TarInfo(MANIFEST_NAME)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+                written = self._add_file(tar, database_path, database_name, 0, progress)
+                for name, _ in uploads:
+                    try:
+                        written = self._add_file(tar, os.path.join(self.upload_folder, name), UPLOADS_PREFIX + name,
+                                                 written, progress)
+                    except FileNotFoundError:
+                        # 백업 도중 지워진 파일
+                        continue
+            if progress:
+                progress(written, force=True)
+        finally:
+            if os.path.exists(database_path):
+                os.remove(database_path)
+        return manifest
+
+    def _list_uploads(self):
+        if not os.path.isdir(self.upload_folder):
+            return []
+        uploads = []
+        with os.scandir(self.upload_folder) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False) and UPLOAD_NAME_PATTERN.match(entry.name):
+                    uploads.append((entry.name, entry.stat().st_size))
+        return sorted(uploads)
+
+    @staticmethod
+    def _add_file(tar, path, arcname, offset, progress):
+        with open(path, 'rb') as fh:
+            info = tar.gettarinfo(arcname=arcname, fileobj=fh)
+            tar.addfile(info, _ProgressReader(fh, progress, offset) if progress else fh)
+        return offset + info.size
+
+    def _copy_sqlite(self, target):
+        raw = self.db.engine.raw_connection()
+        try:
+            source = raw.driver_connection
+            wal = str(source.execute('PRAGMA journal_mode').fetchone()[0]).lower() == 'wal'
+            destination = sqlite3.connect(target)
+            try:
+                if wal:
+                    # 한 번의 읽기 트랜잭션으로 전체를 복사 - WAL 에서는 그동안에도 쓰기가 계속된다
+                    source.backup(destination)
+                else:
+                    # 롤백 저널 모드에서는 읽는 동안 쓰기가 막히므로 나눠 복사한다
+                    # (사이에 다른 연결이 쓰면 처음부터 다시 복사한다)
+                    source.backup(destination, pages=self.step_pages, sleep=self.step_sleep)
+            finally:
+                destination.close()
+        finally:
+            raw.close()
+
+    def _dump_postgresql(self, target):
+        with open(target, 'wb') as fh:
+            _run(['pg_dump', '--format=custom', '--no-owner', '--no-privileges'],
+                 _postgresql_env(self.db.engine.url), stdout=fh)
+
+    # 복원
+
+    def check(self, manifest):
+        """이 DB 에 복원할 수 있는 백업인지 확인하고 manifest 를 반환한다. (아니면 InvalidBackup)"""
+        if manifest.get('dialect') != self.dialect or manifest.get('database') != DATABASE_NAMES.get(self.dialect):
+            raise InvalidBackup(f"{manifest.get('dialect')} DB 의 백업은 {self.dialect} DB 에 복원할 수 없습니다.")
+        with self.db.engine.connect() as connection:
+            revision = schema_revision(connection)
+        if manifest.get('revision') != revision:
+            raise InvalidBackup(f"스키마 버전이 다릅니다. (백업 {manifest.get('revision')}, 현재 {revision}) "
+                                f"같은 버전으로 마이그레이션한 뒤 복원하세요.")
+        return manifest
+
+    def restore(self, path, work_folder, progress=None):
+        """path 의 백업으로 DB 와 업로드 파일을 복원하고 요약 dict 를 반환한다. (progress 는 write() 와 같다)
+
+        progress 가 예외(작업 취소)를 발생시키면 현재 DB 와 업로드 파일은 바뀌지 않는다.
+        """
+        manifest = self.check(read_manifest(path))
+        database_name = manifest['database']
+        database_path = os.path.join(work_folder, database_name)
+        uploads = []
+        try:
+            extracted = self._extract(path, database_path, uploads, manifest['bytes'], progress)
+            if not os.path.exists(database_path):
+                raise InvalidBackup("백업 파일에 DB 가 없습니다.")
+            if self.dialect == 'sqlite':
+                self._verify_sqlite(database_path)
+
+            # 여기부터 현재 DB 에 적용 (취소하지 않는다)
+            engine = self.db.engine
+            jobs = self.job_model.__table__
+            with engine.connect() as connection:
+                job_rows = [dict(row._mapping) for row in connection.execute(select(jobs))]
+                horizon = self.change_feed.current_version(connection) + 1
+            if self.dialect == 'sqlite':
+                self._apply_sqlite(database_path)
+            else:
+                self._apply_postgresql(database_path)
+            with engine.begin() as connection:
+                connection.execute(jobs.delete())
+                if job_rows:
+                    connection.execute(jobs.insert(), job_rows)
+                self.change_feed.rebase(connection, horizon)
+            for name in uploads:
+                os.replace(os.path.join(self.upload_folder, RESTORE_PREFIX + name),
+                           os.path.join(self.upload_folder, name))
+        finally:
+            if os.path.exists(database_path):
+                os.remove(database_path)
+            for name in uploads:
+                temp_path = os.path.join(self.upload_folder, RESTORE_PREFIX + name)
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return {
+            'created_at': manifest['created_at'],
+            'revision': manifest['revision'],
+            'members': manifest.get('members'),
+            'uploads': len(uploads),
+            'bytes': extracted,
+        }
+
+    def _extract(self, path, database_path, uploads, total, progress):
+        """DB 를 database_path 에, 업로드 파일을 UPLOAD_FOLDER 의 임시 이름으로 푼다. 푼 바이트 수를 반환"""
+        if progress:
+            progress(0, total)
+        extracted = 0
+        os.makedirs(self.upload_folder, exist_ok=True)
+        try:
+            with open(path, 'rb') as fh, _open_reader(fh) as stream, \
+                    tarfile.open(fileobj=stream, mode='r|') as tar:
+                for member in tar:
+                    name = member.name
+                    if not member.isfile() or name == MANIFEST_NAME:
+                        continue
+                    if name == os.path.basename(database_path):
+                        target = database_path
+                    elif name.startswith(UPLOADS_PREFIX) and UPLOAD_NAME_PATTERN.match(name[len(UPLOADS_PREFIX):]):
+                        name = name[len(UPLOADS_PREFIX):]
+                        existing = os.path.join(self.upload_folder, name)
+                        if os.path.exists(existing) and os.path.getsize(existing) == member.size:
+                            # 내용 해시 이름이므로 크기가 같으면 같은 파일
+                            extracted += member.size
+                            continue
+                        uploads.append(name)
+                        target = os.path.join(self.upload_folder, RESTORE_PREFIX + name)
+                    else:
+                        # 알 수 없는 항목
+                        continue
+                    source = tar.extractfile(member)
+                    with open(target, 'wb') as out:
+                        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                            out.write(chunk)
+                            extracted += len(chunk)
+                            if progress:
+                                progress(extracted)
+        except _corrupt_errors() as e:
+            raise InvalidBackup(f"백업 파일이 손상되었습니다: {e}") from e
+        if progress:
+            progress(extracted, force=True)
+        return extracted
+
+    @staticmethod
+    def _verify_sqlite(path):
+        connection = sqlite3.connect(path)
+        try:
+            result = connection.execute('PRAGMA quick_check').fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            raise InvalidBackup(f"백업의 DB 파일이 손상되었습니다: {e}") from e
+        finally:
+            connection.close()
+        if result != 'ok':
+            raise InvalidBackup(f"백업의 DB 파일이 손상되었습니다: {result}")
+
+    def _apply_sqlite(self, source_path):
+        source = sqlite3.connect(source_path)
+        raw = self.db.engine.raw_connection()
+        try:
+            # 현재 DB 의 모든 페이지를 한 트랜잭션으로 바꾼다 (다른 연결은 다음 쿼리부터 새 내용을 본다)
+            source.backup(raw.driver_connection)
+        finally:
+            raw.close()
+            source.close()
+
+    def _apply_postgresql(self, source_path):
+        url = self.db.engine.url
+        _run(['pg_restore', '--clean', '--if-exists', '--no-owner', '--no-privileges', '--single-transaction',
+              '--exit-on-error', f'--dbname={url.database}', source_path], _postgresql_env(url))
+        # 다시 만든 테이블을 가리키는 기존 연결을 버린다
+        self.db.engine.dispose()
@@ -0,0 +1,58 @@
+"""JWT 블록리스트 확인 비용 벤치마크 (인증 요청 1건당 추가 지연)
+
+사용법: python benchmarks/bench_blocklist.py [REDIS_URL]
+- before: 요청마다 백엔드를 직접 조회 (기존 jwt_redis_blocklist.get 방식)
+- after : TokenBlocklist (로컬 음성 캐시 + 백엔드)
+Redis 에 연결할 수 없으면 redis 항목은 건너뛴다.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from token_blocklist import (MemoryBlocklistBackend, RedisBlocklistBackend, SQLiteBlocklistBackend,
+                             TokenBlocklist, create_redis_client)
+
+REQUESTS = 20000
+ACTIVE_TOKENS = 200  # 동시에 사용 중인 토큰 수
+
+
+def measure(check):
+    tokens = [str(uuid.uuid4()) for _ in range(ACTIVE_TOKENS)]
+    samples = []
+    for i in range(REQUESTS):
+        jti = tokens[i % ACTIVE_TOKENS]
+        start = time.perf_counter()
+        check(jti)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.99)]
+
+
+def run(name, backend):
+    blocklist = TokenBlocklist()
+    blocklist.backend = backend
+    blocklist.local_ttl = 2.0
+    before = measure(backend.contains)
+    after = measure(blocklist.is_revoked)
+    print(f"{name:<7} before mean {before[0]:8.1f}us p99 {before[1]:8.1f}us   "
+          f"after mean {after[0]:8.1f}us p99 {after[1]:8.1f}us")
+
+
+if __name__ == '__main__':
+    print(f"{REQUESTS} authenticated requests, {ACTIVE_TOKENS} active tokens")
+    run('memory', MemoryBlocklistBackend())
+    with tempfile.TemporaryDirectory() as tmp:
+        run('sqlite', SQLiteBlocklistBackend(os.path.join(tmp, 'blocklist.db')))
+    url = sys.argv[1] if len(sys.argv) > 1 else os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    client = create_redis_client(url)
+    try:
+        client.ping()
+    except Exception as e:
+        print(f"redis   skipped ({e})")
+    else:
+        run('redis', RedisBlocklistBackend(client))
@@ -0,0 +1,67 @@
+"""회원 내보내기 메모리 벤치마크: 스트리밍 CSV 내보내기 vs 전체 로드 후 직렬화
+
+사용법: python benchmarks/bench_export.py [회원 수]
+각 방식은 별도 프로세스에서 실행하여 최대 RSS 를 비교한다.
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(rows):
+    from app import create_app, db, Member
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        for start in range(0, rows, 10000):
+            db.session.execute(Member.__table__.insert(), [{
+                'name': f'회원{i}', 'email': f'member{i}@example.com', 'register_date': date(2024, 1, 1),
+                'birth_year': 1950 + i % 50, 'birth_month': i % 12 + 1, 'birth_day': i % 28 + 1,
+                'phone': f'010-0000-{i % 10000:04d}', 'gender': '남' if i % 2 else '여',
+                'address': f'{i} Main St', 'city': 'Los Angeles', 'state': 'CA', 'zipcode': '90001',
+                'district': f'{i % 20 + 1}구역', 'position': '집사', 'role': '회원'
+            } for i in range(start, min(start + 10000, rows))])
+            db.session.commit()
+
+
+def measure(mode):
+    from app import create_app, Member, generate_csv_export, iter_export_rows
+    app = create_app('testing')
+    with app.test_request_context('/api/members/export'):
+        baseline = peak_rss_mb()
+        start = time.perf_counter()
+        size = 0
+        if mode == 'stream':
+            for chunk in generate_csv_export(iter_export_rows()):
+                size += len(chunk)
+        else:
+            # 기존 방식: 전체 회원을 ORM 객체로 읽은 뒤 한 번에 직렬화
+            import json
+            size = len(json.dumps([member.to_dict() for member in Member.query.all()], ensure_ascii=False))
+        elapsed = time.perf_counter() - start
+    print(f"{mode:<7} {size / 1024 / 1024:8.1f} MB output  {elapsed:6.2f}s  peak RSS +{peak_rss_mb() - baseline:7.1f} MB")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == '--measure':
+        measure(sys.argv[2])
+        sys.exit(0)
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, TEST_DATABASE_URI='sqlite:///' + os.path.join(tmp, 'bench.db'))
+        subprocess.run([sys.executable, '-c', f'import sys; sys.path.insert(0, {ROOT!r}); '
+                        f'from benchmarks.bench_export import seed; seed({rows})'], env=env, check=True, cwd=ROOT)
+        print(f"{rows} members")
+        for mode in ('stream', 'all'):
+            subprocess.run([sys.executable, __file__, '--measure', mode], env=env, check=True)
@@ -0,0 +1,70 @@
+"""CSV 가져오기 벤치마크: 기존 행 단위 루프 vs member_import 일괄 엔진
+
+사용법: python benchmarks/bench_import.py [행 수]
+"""
+import io
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+os.environ.setdefault('TEST_DATABASE_URI', 'sqlite://')
+
+import pandas as pd
+
+from app import create_app, db, Member
+from member_import import import_members_csv
+
+app = create_app('testing')
+
+
+def make_csv(rows, offset=0):
+    buf = io.StringIO()
+    buf.write('name,email,register_date,birth_year,birth_month,birth_day,phone,gender,district,position\n')
+    for i in range(offset, offset + rows):
+        buf.write(f"회원{i},member{i}@example.com,2024-01-01,{1950 + i % 50},{i % 12 + 1},{i % 28 + 1},"
+                  f"010-0000-{i % 10000:04d},{'남' if i % 2 else '여'},{i % 20 + 1}구역,집사\n")
+    return buf.getvalue().encode('utf-8')
+
+
+def legacy_import(data):
+    # 기존 import_db 의 iterrows + 행마다 SELECT 방식
+    df = pd.read_csv(io.StringIO(data.decode('utf-8')), dtype={'phone': str})
+    for _, row in df.iterrows():
+        record = row.to_dict()
+        record['register_date'] = date.fromisoformat(record['register_date'])
+        for column in ('birth_year', 'birth_month', 'birth_day'):
+            record[column] = int(record[column])
+        member = Member.query.filter_by(email=record['email']).first()
+        if member:
+            for column, value in record.items():
+                setattr(member, column, value)
+        else:
+            db.session.add(Member(**record))
+    db.session.commit()
+
+
+def bulk_import(data):
+    import_members_csv(io.BytesIO(data), db.session, Member)
+
+
+def run(label, func, data, rows):
+    db.drop_all()
+    db.create_all()
+    # 절반은 기존 회원(업데이트), 절반은 신규 회원(삽입)이 되도록 미리 채운다
+    bulk_import(make_csv(rows // 2))
+    start = time.perf_counter()
+    func(data)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {rows:>8} rows  {elapsed:8.3f}s  {rows / elapsed:10.0f} rows/sec")
+    return elapsed
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    data = make_csv(rows)
+    with app.app_context():
+        legacy = run('legacy', legacy_import, data, rows)
+        bulk = run('bulk', bulk_import, data, rows)
+    print(f"speedup  {legacy / bulk:.1f}x")
@@ -0,0 +1,114 @@
+"""로그인이 몰릴 때 비밀번호 해시가 다른 요청을 얼마나 늦추는지 비교한다.
+
+사용법: python benchmarks/bench_login_storm.py [로그인 스레드 수] [시간(초)]
+로그인 스레드가 scrypt(PASSWORD_HASH_METHOD 기본값) 로그인을 계속 보내는 동안
+읽기 스레드 READERS 개가 회원 목록을 조회하고 응답 시간을 잰다.
+- inline : PASSWORD_HASH_WORKERS=0 (요청 스레드에서 바로 해시)
+- pool   : PASSWORD_HASH_WORKERS=1 (해시 스레드 풀, 대기 작업 상한 PASSWORD_HASH_QUEUE)
+- shed   : pool + PASSWORD_HASH_QUEUE=2 (넘치는 로그인은 503 + Retry-After)
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from config import Config
+
+LOGIN_THREADS = 8
+READERS = 2
+DURATION = 5.0
+PASSWORD = 'Login-storm-1234'
+
+MODES = [
+    ('inline', {'PASSWORD_HASH_WORKERS': 0}),
+    ('pool', {'PASSWORD_HASH_WORKERS': 1}),
+    ('shed', {'PASSWORD_HASH_WORKERS': 1, 'PASSWORD_HASH_QUEUE': 2}),
+]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def run(mode, overrides, login_threads, duration):
+    from app import create_app, db, Member, User, UserRole
+
+    path = os.path.join(tempfile.mkdtemp(prefix='login-storm-'), 'members.db')
+    app = create_app('testing', dict(overrides, RATELIMIT_ENABLED=False, INSTRUMENTATION_ENABLED=False,
+                                     SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}',
+                                     PASSWORD_HASH_METHOD=Config.PASSWORD_HASH_METHOD))
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(Member(name=f'회원{i}', email=f'member{i}@example.com', register_date=date(2024, 1, 1),
+                                  birth_year=1980, birth_month=1, birth_day=1, phone='010-0000-0000',
+                                  district=f'{i % 10 + 1}구역', password_hash='x') for i in range(200))
+        admin = User(email='admin@example.com', role=UserRole.SUPER_ADMIN)
+        admin.set_password(PASSWORD)
+        db.session.add(admin)
+        db.session.commit()
+
+    token = app.test_client().post('/api/auth/login', json={'email': 'admin@example.com', 'password': PASSWORD}) \
+        .get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    done = threading.Event()
+    lock = threading.Lock()
+    statuses = {}
+    login_times = []
+    read_times = []
+
+    def login():
+        client = app.test_client()
+        while not done.is_set():
+            start = time.perf_counter()
+            response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': PASSWORD})
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    login_times.append(time.perf_counter() - start)
+            if response.status_code == 503:
+                time.sleep(float(response.headers.get('Retry-After', 1)) / 10)
+
+    def read(thread_index):
+        client = app.test_client()
+        i = 0
+        while not done.is_set():
+            # 응답 캐시를 거치지 않도록 매번 다른 쿼리 문자열
+            start = time.perf_counter()
+            client.get(f'/api/members?per_page=20&reader={thread_index}-{i}', headers=headers)
+            with lock:
+                read_times.append(time.perf_counter() - start)
+            i += 1
+
+    threads = [threading.Thread(target=login) for _ in range(login_threads)] + \
+        [threading.Thread(target=read, args=(i,)) for i in range(READERS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"{mode:6}  logins/s {statuses.get(200, 0) / duration:6.1f}  "
+          f"login p50 {statistics.median(login_times) * 1000 if login_times else 0:7.1f}ms  "
+          f"reads/s {len(read_times) / duration:6.1f}  "
+          f"read p50 {percentile(read_times, 0.5) * 1000:6.1f}ms  p99 {percentile(read_times, 0.99) * 1000:7.1f}ms  "
+          f"503 {statuses.get(503, 0)}")
+
+
+def main():
+    login_threads = int(sys.argv[1]) if len(sys.argv) > 1 else LOGIN_THREADS
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else DURATION
+    print(f"{Config.PASSWORD_HASH_METHOD}, login threads {login_threads}, readers {READERS}, "
+          f"{duration:.0f}s, cpus {os.cpu_count()}")
+    for mode, overrides in MODES:
+        run(mode, overrides, login_threads, duration)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""회원 이름 검색 지연 시간 벤치마크 (FTS5 색인 vs 기존 LIKE '%name%')
+
+사용법: python benchmarks/bench_search.py [회원 수]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+os.environ.setdefault('TEST_DATABASE_URI', 'sqlite://')
+
+from app import create_app, db, Member, member_search_index
+
+app = create_app('testing')
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN = '민서준지현우수영진하은도윤예성재희경철동혁'
+QUERIES = ['김', '김철', '김철수', '철수', 'ㄱㅊㅅ', 'ㅊㅅ', '박지', '현우', '없는이름']
+
+
+def korean_name(rng):
+    return rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN)
+
+
+def timed(func, repeat=50):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(42)
+    with app.app_context():
+        db.create_all()
+        for start in range(0, rows, 10000):
+            db.session.execute(Member.__table__.insert(), [{
+                'name': korean_name(rng), 'email': f'member{i}@example.com', 'register_date': date(2024, 1, 1),
+                'birth_year': 1970, 'birth_month': 1, 'birth_day': 1, 'phone': '010-0000-0000'
+            } for i in range(start, min(start + 10000, rows))])
+        db.session.commit()
+        member_search_index.rebuild()
+
+        print(f"{rows} members, limit 20 (median / max ms)")
+        for query in QUERIES:
+            indexed = timed(lambda: member_search_index.search(query, 20))
+            like = timed(lambda: Member.query.filter(Member.name.like(f'%{query}%')).all(), repeat=5)
+            print(f"{query:<8} fts {indexed[0]:7.2f} / {indexed[1]:7.2f}   like(all rows) {like[0]:8.2f} / {like[1]:8.2f}")
@@ -0,0 +1,84 @@
+"""회원 목록 응답 직렬화 벤치마크 (1k / 10k 명)
+
+사용법: python benchmarks/bench_serialization.py [회원 수 ...]
+- orm+json    : ORM 객체 + member_list_item() (행마다 to_dict/url_for) + 표준 json 프로바이더
+- tuple+json  : 필요한 컬럼만 튜플로 조회 + MemberSerializer + 표준 json 프로바이더
+- tuple+orjson: 필요한 컬럼만 튜플로 조회 + MemberSerializer + orjson 프로바이더
+조회부터 응답 본문 생성까지의 시간 (중앙값 / 최솟값 ms). 회원 절반은 사진이 있다.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+os.environ.setdefault('TEST_DATABASE_URI', 'sqlite://')
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app, db, Member, member_list_item, member_serializer
+from json_provider import OrjsonProvider, orjson
+
+app = create_app('testing')
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN = '민서준지현우수영진하은도윤예성재희경철동혁'
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def populate(rows):
+    rng = random.Random(42)
+    db.drop_all()
+    db.create_all()
+    db.session.execute(Member.__table__.insert(), [{
+        'name': rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN),
+        'email': f'member{i}@example.com', 'register_date': date(2024, 1, 1),
+        'birth_year': rng.randint(1940, 2010), 'birth_month': rng.randint(1, 12), 'birth_day': rng.randint(1, 28),
+        'phone': '010-0000-0000', 'gender': rng.choice('남여'), 'city': '서울', 'district': f'{i % 20 + 1}구역',
+        'address': '서울시 어딘가 123', 'position': '집사', 'photo': f'{i:032x}.jpg' if i % 2 else None,
+    } for i in range(rows)])
+    db.session.commit()
+
+
+def orm_payload():
+    members = Member.query.order_by(Member.name, Member.id).all()
+    return {'members': [member_list_item(member) for member in members]}
+
+
+def tuple_payload():
+    rows = member_serializer.select(Member.query.order_by(Member.name, Member.id)).all()
+    return {'members': member_serializer.serialize(rows)}
+
+
+if __name__ == '__main__':
+    sizes = [int(value) for value in sys.argv[1:]] or [1000, 10000]
+    providers = {'json': DefaultJSONProvider(app)}
+    if orjson is not None:
+        providers['orjson'] = OrjsonProvider(app)
+    else:
+        print("orjson 이 설치되어 있지 않아 tuple+orjson 은 건너뜁니다.")
+    cases = [('orm+json', orm_payload, 'json'), ('tuple+json', tuple_payload, 'json')]
+    if 'orjson' in providers:
+        cases.append(('tuple+orjson', tuple_payload, 'orjson'))
+
+    with app.app_context():
+        for rows in sizes:
+            populate(rows)
+            repeat = 20 if rows <= 1000 else 5
+            print(f"{rows} members (median / min ms, response bytes)")
+            with app.test_request_context():
+                for name, payload, provider in cases:
+                    build = lambda: providers[provider].response(payload()).get_data()
+                    size = len(build())
+                    median, best = timed(build, repeat)
+                    print(f"  {name:<13} {median:8.2f} / {best:8.2f}  {size:>10,d} B")
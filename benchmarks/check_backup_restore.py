@@ -0,0 +1,232 @@
+"""쓰기가 계속되는 중에 백업/복원 API 를 실행해 보고 결과를 확인한다.
+
+사용법: python benchmarks/check_backup_restore.py [회원 수] [--database-uri URI] [--compression gzip|zstd]
+1. synthetic.py 로 회원을 만들고 업로드 폴더에 가짜 사진 파일을 둔다.
+2. 쓰기 스레드가 회원을 계속 추가하는 동안 POST /api/admin/backup 작업을 실행하고
+   그동안 쓰기 지연(최대/p99)과 실패 수를 잰다. (WAL 에서는 백업이 쓰기를 막지 않아야 한다)
+3. 쓰기를 더 한 뒤 사진 일부를 지우고 POST /api/admin/restore 로 받은 백업을 복원한다.
+4. 복원 후 회원 수가 백업 안의 DB 와 같은지, 지운 사진이 돌아왔는지, 복원 작업 기록과 진행률이 남았는지,
+   복원 전에 받은 변경 피드 token 이 만료(410)되는지 확인한다. 하나라도 틀리면 종료 코드 1.
+"""
+import argparse
+import io
+import os
+import sqlite3
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+import synthetic
+
+PASSWORD = 'Backup-check-1234'
+ADMIN_EMAIL = 'user0@example.com'
+PHOTOS = 50
+PHOTO_BYTES = 64 * 1024
+WRITE_INTERVAL = 0.01  # 초
+
+
+class Writer(threading.Thread):
+    """회원을 한 명씩 계속 추가하며 커밋 지연 시간을 기록한다."""
+
+    def __init__(self, app, start):
+        super().__init__(daemon=True)
+        self.app = app
+        self.start_index = start
+        self.stop = threading.Event()
+        self.latencies = []
+        self.errors = []
+
+    def run(self):
+        from app import db, Member
+
+        with self.app.app_context():
+            for index, row in enumerate(synthetic.members(10 ** 9, seed=7, start=self.start_index)):
+                if self.stop.is_set():
+                    break
+                started = time.perf_counter()
+                try:
+                    db.session.add(Member(**row))
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    self.errors.append(str(e))
+                self.latencies.append(time.perf_counter() - started)
+                time.sleep(WRITE_INTERVAL)
+            db.session.remove()
+
+    def measure(self):
+        """지금까지의 기록을 돌려주고 비운다."""
+        latencies, errors = self.latencies, self.errors
+        self.latencies, self.errors = [], []
+        return latencies, errors
+
+
+def run_job(app, client, headers, response):
+    from app import job_runner
+
+    if response.status_code != 202:
+        raise SystemExit(f"{response.status_code} {response.get_json()}")
+    job_id = response.get_json()['id']
+    started = time.perf_counter()
+    with app.app_context():
+        job_runner.claim(job_id)
+        job_runner.run(job_id)
+    elapsed = time.perf_counter() - started
+    return client.get(f'/api/jobs/{job_id}', headers=headers).get_json(), elapsed
+
+
+def summary(latencies, errors):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0
+    return (f"{len(latencies)} writes, p99 {p99 * 1000:.1f}ms, max {max(latencies, default=0) * 1000:.1f}ms, "
+            f"{len(errors)} errors")
+
+
+def member_emails(app):
+    from app import db, Member
+
+    with app.app_context():
+        emails = {email for email, in db.session.query(Member.email)}
+        db.session.remove()
+    return emails
+
+
+def member_index(email):
+    return int(email[len('member'):].split('@')[0])
+
+
+def emails_in_backup(path, tmp):
+    from backup import _open_reader
+
+    with open(path, 'rb') as fh, _open_reader(fh) as stream, tarfile.open(fileobj=stream, mode='r|') as tar:
+        for member in tar:
+            if member.name == 'database.sqlite':
+                target = os.path.join(tmp, 'backup-copy.sqlite')
+                with open(target, 'wb') as out:
+                    out.write(tar.extractfile(member).read())
+                connection = sqlite3.connect(target)
+                try:
+                    return {email for email, in connection.execute('SELECT email FROM member')}
+                finally:
+                    connection.close()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='백업/복원 확인')
+    parser.add_argument('members', type=int, nargs='?', default=20000)
+    parser.add_argument('--database-uri', help='기본: 임시 SQLite 파일')
+    parser.add_argument('--compression', default='gzip')
+    args = parser.parse_args()
+
+    from app import create_app, db, User, UserRole
+
+    tmp = tempfile.mkdtemp(prefix='check-backup-')
+    uploads = os.path.join(tmp, 'uploads')
+    overrides = {'SQLALCHEMY_DATABASE_URI': args.database_uri or 'sqlite:///' + os.path.join(tmp, 'members.db'),
+                 'RATELIMIT_ENABLED': False, 'INSTRUMENTATION_ENABLED': False,
+                 'JOB_FOLDER': os.path.join(tmp, 'jobs'), 'UPLOAD_FOLDER': uploads}
+    app = create_app('testing', overrides)
+    with app.app_context():
+        synthetic.populate(args.members, 10, password=PASSWORD)
+        User.query.filter_by(email=ADMIN_EMAIL).update({'role': UserRole.SUPER_ADMIN})
+        db.session.commit()
+        db.session.remove()
+    photos = []
+    for index in range(PHOTOS):
+        name = f'{index:032x}.jpg'
+        with open(os.path.join(uploads, name), 'wb') as fh:
+            fh.write(os.urandom(PHOTO_BYTES))
+        photos.append(name)
+
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={'email': ADMIN_EMAIL, 'password': PASSWORD}).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    problems = []
+
+    writer = Writer(app, args.members)
+    writer.start()
+    time.sleep(1)
+    print(f"before backup : {summary(*writer.measure())}")
+    job, elapsed = run_job(app, client, headers,
+                           client.post(f'/api/admin/backup?compression={args.compression}', headers=headers))
+    latencies, errors = writer.measure()
+    print(f"during backup : {summary(latencies, errors)}  ({elapsed:.2f}s, {job['status']}, {job['result']})")
+    if job['status'] != 'succeeded':
+        problems.append(f"backup {job['status']}: {job['error']}")
+        writer.stop.set()
+        raise SystemExit('\n'.join(problems))
+    if errors:
+        problems.append(f"{len(errors)} writes failed during backup: {errors[0]}")
+    download = client.get(f"/api/jobs/{job['id']}/download", headers=headers)
+    backup_path = os.path.join(tmp, job['result']['filename'])
+    with open(backup_path, 'wb') as fh:
+        fh.write(download.data)
+    download.close()
+    backup_emails = emails_in_backup(backup_path, tmp) if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite') \
+        else None
+
+    # 백업 이후의 변경 - 복원하면 사라져야 한다
+    time.sleep(1)
+    token_before = client.get('/api/members/changes', headers=headers).get_json()
+    before_restore = member_emails(app)
+    for name in photos[:PHOTOS // 2]:
+        os.remove(os.path.join(uploads, name))
+
+    response = client.post('/api/admin/restore', headers=headers, content_type='multipart/form-data',
+                           data={'file': (open(backup_path, 'rb'), os.path.basename(backup_path))})
+    job, elapsed = run_job(app, client, headers, response)
+    latencies, errors = writer.measure()
+    writer.stop.set()
+    writer.join()
+    print(f"during restore: {summary(latencies, errors)}  ({elapsed:.2f}s, {job['status']}, {job['result']})")
+    if job['status'] != 'succeeded':
+        problems.append(f"restore {job['status']}: {job['error']}")
+    elif job['processed'] != job['total']:
+        problems.append(f"restore progress {job['processed']}/{job['total']}")
+
+    restored = member_emails(app)
+    if job['status'] == 'succeeded' and backup_emails is not None:
+        # 복원된 DB = 백업의 회원 + 복원 뒤에 쓴 회원 (백업과 복원 사이에 쓴 회원은 없어야 한다)
+        lost = backup_emails - restored
+        after_backup = before_restore - backup_emails
+        kept = restored & after_backup
+        written_after = restored - backup_emails - before_restore
+        if lost:
+            problems.append(f"{len(lost)} members from the backup missing after restore")
+        if kept:
+            problems.append(f"{len(kept)} members written after the backup survived the restore")
+        if job['result']['members'] != len(backup_emails):
+            problems.append(f"manifest says {job['result']['members']} members, backup has {len(backup_emails)}")
+        if written_after and min(map(member_index, written_after)) <= max(map(member_index, before_restore)):
+            problems.append("unexpected members after restore")
+        print(f"members: backup {len(backup_emails)}, written between backup and restore {len(after_backup)}, "
+              f"written after restore {len(written_after)}, now {len(restored)}")
+    missing = [name for name in photos if not os.path.exists(os.path.join(uploads, name))]
+    if missing:
+        problems.append(f"{len(missing)} photos not restored")
+    leftovers = [name for name in os.listdir(uploads) if name.startswith('.')]
+    if leftovers:
+        problems.append(f"temporary files left in uploads: {leftovers[:3]}")
+    changes = client.get(f"/api/members/changes?since={token_before.get('token', 0)}", headers=headers)
+    if changes.status_code != 410:
+        problems.append(f"change token from before restore returned {changes.status_code}, expected 410")
+
+    invalid = client.post('/api/admin/restore', headers=headers, content_type='multipart/form-data',
+                          data={'file': (io.BytesIO(b'not a backup'), 'x.tar.gz')})
+    if invalid.status_code != 400:
+        problems.append(f"invalid backup upload returned {invalid.status_code}, expected 400")
+
+    for problem in problems:
+        print(f"FAIL {problem}")
+    print('OK' if not problems else f"{len(problems)} problems")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""여러 프로세스 x 스레드에서 동시에 회원을 등록해 SQLite 잠금 오류가 없는지 확인한다.
+
+사용법: python benchmarks/check_concurrent_writes.py [프로세스 수] [프로세스당 스레드 수] [스레드당 요청 수]
+(gunicorn 워커 여러 개가 같은 DB 파일에 쓰는 상황 - 프로세스마다 목록을 계속 조회하는 읽기 스레드 READERS 개를 함께 돌린다)
+- default: 엔진 옵션/PRAGMA 없이 (롤백 저널, sqlite3 기본 잠금 대기 5초, BEGIN DEFERRED)
+- tuned  : 운영 설정(ProductionConfig)의 SQLITE_PRAGMAS (WAL, synchronous=NORMAL, busy_timeout 15초, mmap_size)
+           + 쓰기 요청은 BEGIN IMMEDIATE (SQLITE_IMMEDIATE_WRITES)
+모드마다 임시 DB 파일을 쓴다. tuned 에서 실패한 요청이 있으면 종료 코드 1.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+PROCESSES = 3
+THREADS = 4
+REQUESTS_PER_THREAD = 60
+READERS = 2
+
+
+def make_app(mode):
+    from app import create_app
+    from config import ProductionConfig
+
+    overrides = {'RATELIMIT_ENABLED': False, 'SQLITE_PRAGMAS': ProductionConfig.SQLITE_PRAGMAS}
+    if mode == 'default':
+        overrides.update(SQLALCHEMY_ENGINE_OPTIONS={}, SQLITE_PRAGMAS={}, SQLITE_IMMEDIATE_WRITES=False)
+    return create_app('testing', overrides)
+
+
+def init(mode):
+    from app import db
+
+    app = make_app(mode)
+    with app.app_context():
+        db.create_all()
+        print(db.session.execute(db.text('PRAGMA journal_mode')).scalar())
+
+
+def worker(mode, process_index, start_at, threads, requests_per_thread):
+    app = make_app(mode)
+    statuses = {}
+    errors = []
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def read_members(thread_index):
+        # 응답 캐시를 거치지 않도록 매번 다른 쿼리 문자열
+        client = app.test_client()
+        time.sleep(max(0, start_at - time.time()))
+        i = 0
+        while not done.is_set():
+            client.get(f'/api/members?per_page=20&sort_by=name&reader={thread_index}-{i}')
+            i += 1
+
+    def post_members(thread_index):
+        client = app.test_client()
+        time.sleep(max(0, start_at - time.time()))
+        for i in range(requests_per_thread):
+            key = f'{process_index}-{thread_index}-{i}'
+            response = client.post('/api/members', json={
+                'name': f'회원{key}', 'email': f'member{key}@example.com',
+                'birthYear': 1980, 'birthMonth': i % 12 + 1, 'birthDay': i % 28 + 1,
+                'phone': '010-0000-0000', 'gender': '남' if i % 2 else '여', 'district': f'{thread_index + 1}구역',
+            })
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code != 201 and len(errors) < 2:
+                    errors.append(response.get_json().get('error', '').splitlines()[0][:120])
+
+    readers = [threading.Thread(target=read_members, args=(index,)) for index in range(READERS)]
+    workers = [threading.Thread(target=post_members, args=(index,)) for index in range(threads)]
+    for thread in readers + workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+    print(json.dumps({'statuses': statuses, 'errors': errors, 'finished': time.time()}, ensure_ascii=False))
+
+
+def run(mode, tmp, processes, threads, requests_per_thread):
+    env = dict(os.environ, TEST_DATABASE_URI='sqlite:///' + os.path.join(tmp, 'concurrency.db'),
+               JOB_FOLDER=os.path.join(tmp, 'jobs'))
+    journal_mode = subprocess.run([sys.executable, __file__, 'init', mode], env=env,
+                                  capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1]
+    start_at = time.time() + 3  # 모든 프로세스가 앱을 불러온 뒤 동시에 시작
+    children = [
+        subprocess.Popen([sys.executable, __file__, 'worker', mode, str(index), str(start_at),
+                          str(threads), str(requests_per_thread)],
+                         env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for index in range(processes)
+    ]
+    results = [json.loads(child.communicate()[0].strip().splitlines()[-1]) for child in children]
+    statuses = {}
+    errors = []
+    for result in results:
+        for status, count in result['statuses'].items():
+            statuses[status] = statuses.get(status, 0) + count
+        errors.extend(result['errors'])
+    elapsed = max(result['finished'] for result in results) - start_at
+
+    from sqlite3 import connect
+    with connect(os.path.join(tmp, 'concurrency.db')) as conn:
+        rows = conn.execute('SELECT COUNT(*) FROM member').fetchone()[0]
+    return journal_mode, statuses, errors, elapsed, rows
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'init':
+        init(sys.argv[2])
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == 'worker':
+        worker(sys.argv[2], int(sys.argv[3]), float(sys.argv[4]), int(sys.argv[5]), int(sys.argv[6]))
+        sys.exit(0)
+
+    processes, threads, requests_per_thread = [int(value) for value in sys.argv[1:4]] + \
+        [PROCESSES, THREADS, REQUESTS_PER_THREAD][len(sys.argv[1:4]):]
+    total = processes * threads * requests_per_thread
+    print(f"{processes} processes x {threads} threads x {requests_per_thread} requests = {total} POST /api/members")
+    failed = False
+    for mode in ('default', 'tuned'):
+        with tempfile.TemporaryDirectory() as tmp:
+            journal_mode, statuses, errors, elapsed, rows = run(mode, tmp, processes, threads, requests_per_thread)
+        ok = statuses.get('201', 0)
+        print(f"{mode:8s} journal={journal_mode:6s} {ok:5d}/{total} created  rows={rows:5d}  "
+              f"{elapsed:6.2f}s  {ok / elapsed:7.1f} req/s  statuses={statuses}")
+        for error in errors[:3]:
+            print(f"         {error}")
+        if mode == 'tuned':
+            failed = ok != total or rows != total
+    sys.exit(1 if failed else 0)
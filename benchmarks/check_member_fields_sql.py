@@ -0,0 +1,108 @@
+"""fields= (sparse fieldsets) 가 필요한 컬럼만 조회하는지 실제 실행된 SQL 로 확인한다.
+
+사용법: python benchmarks/check_member_fields_sql.py
+/api/members, /api/members/public 을 호출하면서 member 테이블 SELECT 의 컬럼 목록을 기록하고
+기대한 컬럼과 다르거나 password_hash 를 읽으면 종료 코드 1 로 끝난다.
+"""
+import os
+import re
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+os.environ.setdefault('TEST_DATABASE_URI', 'sqlite://')
+
+from sqlalchemy import event
+
+from app import create_app, db, Member, User, UserRole
+
+ALL_COLUMNS = ['id', 'name', 'birth_year', 'birth_month', 'birth_day', 'phone', 'gender', 'address', 'city',
+               'state', 'zipcode', 'district', 'spouse', 'spouse_id', 'household_id', 'position', 'email', 'role',
+               'is_active', 'photo']
+# (쿼리 문자열, 응답 키, 목록 SELECT 컬럼)
+CASES = [
+    ('', None, ALL_COLUMNS),
+    ('fields=name,phone,district', ['district', 'id', 'name', 'phone'], ['id', 'name', 'phone', 'district']),
+    ('fields=name,photoUrl', ['id', 'name', 'photoUrl'], ['id', 'name', 'photo']),
+    ('fields=name&sort_by=birth_year', ['id', 'name'], ['id', 'name']),
+    ('fields=name&cursor=&sort_by=register_date', ['id', 'name'], ['id', 'name', 'register_date']),
+    ('fields=phone&cursor=&sort_by=name', ['id', 'phone'], ['id', 'phone', 'name']),
+]
+PUBLIC_COLUMNS = ['id', 'name', 'spouse', 'photo']
+
+SELECT_PATTERN = re.compile(r'^SELECT (?P<columns>.*?)\s+FROM member\b', re.S)
+
+
+def selected_columns(statements):
+    # member 행을 읽는 SELECT 의 컬럼 이름 (COUNT 쿼리 제외)
+    result = []
+    for statement in statements:
+        match = SELECT_PATTERN.match(statement.strip())
+        if match and 'count(' not in match.group('columns').lower():
+            result.append([column.strip().rpartition('.')[2].split(' AS ')[0]
+                           for column in match.group('columns').split(',')])
+    return result
+
+
+def add_members(count=5):
+    # 현재 앱 컨텍스트의 DB 에 회원 count 명 (홀수 번째만 사진)
+    for i in range(count):
+        db.session.add(Member(name=f'회원{i}', email=f'member{i}@example.com', register_date=date(2024, 1, i + 1),
+                              birth_year=1980 + i, birth_month=1, birth_day=1, phone='010-0000-0000',
+                              district='1구역', photo=f'{i:032x}.jpg' if i % 2 else None, password_hash='x'))
+    db.session.commit()
+
+
+def main():
+    app = create_app('testing', {'RATELIMIT_ENABLED': False})
+    statements = []
+
+    with app.app_context():
+        db.create_all()
+        add_members()
+        admin = User(email='admin@example.com', role=UserRole.SUPER_ADMIN)
+        admin.set_password('Check-fields-1234')
+        db.session.add(admin)
+        db.session.commit()
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={'email': 'admin@example.com',
+                                                 'password': 'Check-fields-1234'}).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    failed = False
+    for query_string, keys, columns in CASES:
+        statements.clear()
+        response = client.get(f'/api/members?{query_string}', headers=headers)
+        members = response.get_json()['members']
+        selects = selected_columns(statements)
+        ok = response.status_code == 200 and selects == [columns] and \
+            (keys is None or all(sorted(member) == keys for member in members))
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} /api/members?{query_string}")
+        for select in selects:
+            print(f"       SELECT {', '.join(select)}")
+
+    statements.clear()
+    response = client.get('/api/members/public')
+    selects = selected_columns(statements)
+    ok = response.status_code == 200 and selects == [PUBLIC_COLUMNS]
+    failed |= not ok
+    print(f"{'ok  ' if ok else 'FAIL'} /api/members/public")
+    for select in selects:
+        print(f"       SELECT {', '.join(select)}")
+
+    response = client.get('/api/members?fields=name,password_hash', headers=headers)
+    ok = response.status_code == 400
+    failed |= not ok
+    print(f"{'ok  ' if ok else 'FAIL'} fields=name,password_hash -> {response.status_code} {response.get_json()['error']}")
+
+    read_password = any('password_hash' in statement and 'FROM member' in statement for statement in statements)
+    failed |= read_password
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""여러 워커 프로세스에서 속도 제한이 전체 합으로 지켜지는지 확인한다.
+
+사용법: REDIS_URL=redis://localhost:6379/15 python benchmarks/check_rate_limits.py [프로세스 수] [프로세스당 스레드 수]
+gunicorn 워커처럼 프로세스마다 앱을 만들고, 같은 클라이언트(127.0.0.1)로 동시에
+- POST /api/auth/login  (5 per minute)
+- GET /api/members/public (기본 한도 50 per hour)
+를 한도보다 훨씬 많이 보낸 뒤 통과한 요청 수를 합친다.
+- memory : 프로세스마다 따로 세는 memory:// (통과 수가 프로세스 수만큼 늘어난다)
+- redis  : leased+REDIS_URL (rate_limit_storage.py) - 합이 한도를 넘으면 종료 코드 1
+Redis 에 연결할 수 없으면 memory 만 실행하고 종료 코드 2. 키는 실행마다 다른 RATELIMIT_KEY_PREFIX 로 만든다.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+PROCESSES = 4
+THREADS = 4
+REQUESTS_PER_THREAD = 40
+# 요청 이름 -> 한도 (프로세스 전체 합)
+ENDPOINTS = {'login': 5, 'public': 50}
+
+
+def make_app(storage_uri, key_prefix):
+    from app import create_app
+
+    return create_app('testing', {'RATELIMIT_STORAGE_URI': storage_uri, 'RATELIMIT_KEY_PREFIX': key_prefix,
+                                  'INSTRUMENTATION_ENABLED': False})
+
+
+def init():
+    from app import db
+
+    app = make_app('memory://', 'init')
+    with app.app_context():
+        db.create_all()
+
+
+def worker(storage_uri, key_prefix, start_at, threads):
+    from app import limiter
+
+    app = make_app(storage_uri, key_prefix)
+    allowed = {name: 0 for name in ENDPOINTS}
+    limited = {name: 0 for name in ENDPOINTS}
+    lock = threading.Lock()
+
+    def send(thread_index):
+        client = app.test_client()
+        time.sleep(max(0, start_at - time.time()))
+        for _ in range(REQUESTS_PER_THREAD):
+            for name in ENDPOINTS:
+                if name == 'login':
+                    # 없는 계정 - 비밀번호 해시 없이 401
+                    response = client.post('/api/auth/login', json={'email': f'nobody{thread_index}@example.com',
+                                                                    'password': 'x'})
+                else:
+                    response = client.get('/api/members/public')
+                with lock:
+                    if response.status_code == 429:
+                        limited[name] += 1
+                    else:
+                        allowed[name] += 1
+
+    workers = [threading.Thread(target=send, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    stats = getattr(limiter.storage, 'stats', {})
+    print(json.dumps({'allowed': allowed, 'limited': limited, 'stats': stats}))
+
+
+def run(storage_uri, tmp, processes, threads):
+    env = dict(os.environ, TEST_DATABASE_URI='sqlite:///' + os.path.join(tmp, 'rate_limits.db'),
+               JOB_FOLDER=os.path.join(tmp, 'jobs'))
+    subprocess.run([sys.executable, __file__, 'init'], env=env, capture_output=True, check=True)
+    key_prefix = f'check-rate-limits-{uuid.uuid4().hex[:8]}'
+    start_at = time.time() + 3  # 모든 프로세스가 앱을 불러온 뒤 동시에 시작
+    children = [
+        subprocess.Popen([sys.executable, __file__, 'worker', storage_uri, key_prefix, str(start_at), str(threads)],
+                         env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for _ in range(processes)
+    ]
+    results = [json.loads(child.communicate()[0].strip().splitlines()[-1]) for child in children]
+    allowed = {name: sum(result['allowed'][name] for result in results) for name in ENDPOINTS}
+    stats = {}
+    for result in results:
+        for key, value in result['stats'].items():
+            stats[key] = stats.get(key, 0) + value
+    return allowed, stats
+
+
+def redis_available(url):
+    from token_blocklist import create_redis_client
+
+    try:
+        return bool(url) and create_redis_client(url).ping()
+    except Exception:
+        return False
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'init':
+        init()
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == 'worker':
+        worker(sys.argv[2], sys.argv[3], float(sys.argv[4]), int(sys.argv[5]))
+        sys.exit(0)
+
+    processes, threads = [int(value) for value in sys.argv[1:3]] + [PROCESSES, THREADS][len(sys.argv[1:3]):]
+    redis_url = os.environ.get('REDIS_URL', '')
+    modes = [('memory', 'memory://')]
+    if redis_available(redis_url):
+        modes.append(('redis', f'leased+{redis_url}'))
+    print(f"{processes} processes x {threads} threads x {REQUESTS_PER_THREAD} requests per endpoint "
+          f"(limits: {', '.join(f'{name} {limit}' for name, limit in ENDPOINTS.items())})")
+
+    failed = False
+    for mode, storage_uri in modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            allowed, stats = run(storage_uri, tmp, processes, threads)
+        over = {name: count for name, count in allowed.items() if count > ENDPOINTS[name]}
+        print(f"{mode:6s} allowed {allowed}  {'OVER LIMIT ' + str(over) if over else 'within limits'}"
+              + (f"  storage {stats}" if stats else ''))
+        if mode == 'redis':
+            failed = bool(over)
+    if len(modes) == 1:
+        print(f"Redis ({redis_url or 'REDIS_URL 없음'}) 에 연결할 수 없어 공유 저장소는 확인하지 못했습니다.")
+        sys.exit(2)
+    sys.exit(1 if failed else 0)
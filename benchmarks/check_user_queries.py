@@ -0,0 +1,108 @@
+"""권한 확인이 요청마다 User 를 몇 번 조회하는지 실제 실행된 SQL 로 확인한다.
+
+사용법: python benchmarks/check_user_queries.py
+관리자 권한이 필요한 읽기 요청(GET)은 토큰 클레임만 쓰므로 User SELECT 0 번,
+변경 요청과 토큰 갱신은 최신 권한을 확인하려고 정확히 1 번 조회해야 한다.
+권한을 내린 관리자의 변경 요청이 바로 403 이 되는지도 확인한다. 하나라도 틀리면 종료 코드 1.
+"""
+import os
+import re
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+os.environ.setdefault('TEST_DATABASE_URI', 'sqlite://')
+
+from sqlalchemy import event
+
+from app import create_app, db, Member, User, UserRole
+
+PASSWORD = 'Check-users-1234'
+USER_SELECT = re.compile(r'^SELECT\b.*\bFROM "?user"?\b', re.S | re.I)
+
+# (메서드, 경로, JSON 본문, 기대 상태 코드, 기대 User SELECT 수) - {id} 는 회원 id
+CASES = [
+    ('GET', '/api/stats', None, 200, 0),
+    ('GET', '/api/jobs', None, 200, 0),
+    ('GET', '/api/admin/cache/stats', None, 200, 0),
+    ('GET', '/api/auth/check', None, 200, 0),
+    ('PUT', '/api/members/{id}', {'phone': '010-1111-2222'}, 200, 1),
+    ('POST', '/api/members/batch', {'update': [{'id': '{id}', 'district': '2구역'}]}, 200, 1),
+    ('DELETE', '/api/members/{id}', None, 200, 1),
+]
+
+
+def user_selects(statements):
+    return sum(1 for statement in statements if USER_SELECT.match(statement.strip()))
+
+
+def fill(value, member_id):
+    if isinstance(value, dict):
+        return {key: fill(item, member_id) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, member_id) for item in value]
+    if value == '{id}':
+        return member_id
+    return value
+
+
+def new_member(email):
+    return Member(name='회원', email=email, register_date=date(2024, 1, 1), birth_year=1980, birth_month=1,
+                  birth_day=1, phone='010-0000-0000', district='1구역')
+
+
+def main():
+    app = create_app('testing', {'RATELIMIT_ENABLED': False})
+    statements = []
+
+    with app.app_context():
+        db.create_all()
+        member = new_member('member@example.com')
+        admin = User(email='admin@example.com', role=UserRole.ADMIN)
+        admin.set_password(PASSWORD)
+        db.session.add_all([member, admin])
+        db.session.commit()
+        member_id, admin_id = member.id, admin.id
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+    client = app.test_client()
+    tokens = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': PASSWORD}).get_json()
+    headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+
+    failed = False
+    for method, path, body, status, expected in CASES:
+        statements.clear()
+        response = client.open(path.format(id=member_id), method=method, headers=headers,
+                               json=fill(body, member_id))
+        count = user_selects(statements)
+        ok = response.status_code == status and count == expected
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {method:6s} {path:24s} {response.status_code}  "
+              f"User SELECT {count} (expected {expected})")
+
+    statements.clear()
+    response = client.post('/api/auth/refresh', headers={'Authorization': f"Bearer {tokens['refresh_token']}"})
+    count = user_selects(statements)
+    ok = response.status_code == 200 and count == 1
+    failed |= not ok
+    print(f"{'ok  ' if ok else 'FAIL'} POST   /api/auth/refresh        {response.status_code}  "
+          f"User SELECT {count} (expected 1)")
+
+    # 권한을 내리면 읽기는 토큰이 만료될 때까지 허용되지만 변경은 바로 막힌다
+    with app.app_context():
+        db.session.get(User, admin_id).role = UserRole.USER
+        db.session.commit()
+        member = new_member('member2@example.com')
+        db.session.add(member)
+        db.session.commit()
+        member_id = member.id
+    response = client.put(f'/api/members/{member_id}', headers=headers, json={'phone': '010-3333-4444'})
+    ok = response.status_code == 403
+    failed |= not ok
+    print(f"{'ok  ' if ok else 'FAIL'} PUT after demotion -> {response.status_code} (expected 403)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""회원 목록 필터가 인덱스를 사용하는지 EXPLAIN 으로 확인한다.
+
+사용법: python benchmarks/explain_member_filters.py
+SQLite 기준으로 /api/members 의 각 필터 조합과 생일 구간(/api/members/birthdays)에 대한
+쿼리 계획을 출력하고,
+전체 테이블 스캔이 나오면 종료 코드 1 로 끝난다.
+"""
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+os.environ.setdefault('TEST_DATABASE_URI', 'sqlite://')
+
+from app import create_app, db, Member, apply_member_filters, member_calendar
+from member_calendar import day_of_year
+
+app = create_app('testing')
+
+CASES = [
+    'birth_year_min=1960&birth_year_max=1969',
+    'birth_year=1970&birth_month_min=3&birth_month_max=5',
+    'birth_month=7',
+    'city_prefix=Los',
+    'city=Irvine&district=3구역',
+    'district_prefix=1',
+    'district=2구역&position=집사',
+    'position_prefix=권',
+]
+# 생일 구간 (시작, 끝) - 시작이 끝보다 뒤면 연말을 넘는 구간
+CALENDAR_CASES = [
+    ('03-01', '03-07'),
+    ('12-28', '01-03'),
+]
+
+
+def explain(query):
+    compiled = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {compiled}')).all()
+    return [row[-1] for row in rows]
+
+
+if __name__ == '__main__':
+    failed = False
+    with app.app_context():
+        db.create_all()
+        db.session.execute(Member.__table__.insert(), [{
+            'name': f'회원{i}', 'email': f'member{i}@example.com', 'register_date': date(2024, 1, 1),
+            'birth_year': 1940 + i % 60, 'birth_month': i % 12 + 1, 'birth_day': i % 28 + 1,
+            'birth_day_of_year': day_of_year(i % 12 + 1, i % 28 + 1),
+            'phone': '010-0000-0000', 'city': ['Los Angeles', 'Irvine', 'Fullerton'][i % 3],
+            'district': f'{i % 20 + 1}구역', 'position': ['집사', '권사', '장로', '성도'][i % 4]
+        } for i in range(5000)])
+        db.session.commit()
+        db.session.execute(db.text('ANALYZE'))
+        queries = []
+        for case in CASES:
+            with app.test_request_context(f'/api/members?{case}'):
+                queries.append((case, apply_member_filters(Member.query)))
+        for start, end in CALENDAR_CASES:
+            start_day = day_of_year(*start.split('-'))
+            end_day = day_of_year(*end.split('-'))
+            queries.append((f'birthdays from={start}&to={end}', member_calendar.range_query(start_day, end_day)))
+        for case, query in queries:
+            plan = explain(query)
+            uses_index = any('USING INDEX' in step or 'USING COVERING INDEX' in step for step in plan)
+            failed = failed or not uses_index
+            print(f"{'OK  ' if uses_index else 'SCAN'} {case}")
+            for step in plan:
+                print(f"       {step}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,262 @@
+"""부하 시나리오 모음 - 처리량과 p50/p95/p99 지연 시간을 재고 저장된 기준값과 비교한다.
+
+사용법: python benchmarks/load_suite.py [--members 1000] [--database-uri URI] [--concurrency 4]
+                                        [--requests 200] [--scenarios get_members,login] [--reuse]
+                                        [--save-baseline] [--tolerance 0.3]
+- DB: 기본은 임시 SQLite 파일. 로컬 PostgreSQL 은 --database-uri postgresql://localhost/church_bench
+  (해당 DB 의 테이블을 지우고 synthetic.py 로 회원 --members 명, 사용자 USERS 명을 만든다. 1k / 100k / 1M)
+  --reuse 는 회원 수가 같으면 다시 만들지 않는다. (import_db 가 회원을 추가하므로 그 뒤에는 다시 만든다)
+- 요청은 앱의 test_client 로 --concurrency 개 스레드에서 보낸다. (네트워크/WSGI 서버 제외)
+  조회 요청은 매번 다른 쿼리 문자열(_r=)로 응답 캐시를 거치지 않은 경로를 잰다.
+- 시나리오
+  get_members        : 목록 - 페이지/정렬/구역·직분 필터 섞어서
+  search_members     : 이름/초성 검색
+  get_public_members : 공개 목록 - 5번 중 4번은 이름 검색, 1번은 전체 목록
+  login              : 가상 사용자 로그인 (테스트 설정의 가벼운 해시, --password-hash-method 로 변경)
+  import_db          : CSV IMPORT_ROWS 행(절반 기존 회원 수정, 절반 신규) 업로드 + 가져오기 작업 실행까지, 스레드 1개
+- 기준값: benchmarks/baselines/<DB 종류>-<회원 수>.json. --save-baseline 으로 저장하고, 있으면 비교해서
+  p95 가 (1 + tolerance) 배를 넘거나 처리량이 (1 - tolerance) 배 밑으로 떨어지거나 오류 응답이 있으면 종료 코드 1.
+  기준값은 측정한 기계에 따라 다르므로 같은 기계에서 만든 값과 비교한다.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+import synthetic
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+USERS = 200
+PASSWORD = 'Load-suite-1234'
+ADMIN_EMAIL = 'user0@example.com'
+IMPORT_ROWS = 1000
+IMPORT_REQUESTS = 10
+WARMUP_REQUESTS = 5
+SORTS = ['name', 'birth_year', 'register_date']
+SEARCHES = ['김', '이현', '박지', 'ㄱㅁ', 'ㅇㅈㅎ', '서준', '최영희', '없는이름']
+
+
+class Context:
+    """시나리오가 공유하는 앱/데이터 정보"""
+
+    def __init__(self, app, members, districts, admin_headers):
+        self.app = app
+        self.members = members
+        self.districts = districts
+        self.admin_headers = admin_headers
+        self.import_offset = members
+        self.lock = threading.Lock()
+
+
+def get_members(client, ctx, rng, i):
+    params = {'page': rng.randint(1, 50), 'per_page': 20, 'sort_by': rng.choice(SORTS), '_r': i}
+    kind = rng.random()
+    if kind < 0.3:
+        params['district'] = f'{rng.randint(1, ctx.districts)}구역'
+    elif kind < 0.5:
+        params['position'] = synthetic._position(rng)
+    return client.get('/api/members', query_string=params), 200
+
+
+def search_members(client, ctx, rng, i):
+    return client.get('/api/members/search', query_string={'name': rng.choice(SEARCHES), '_r': i}), 200
+
+
+def get_public_members(client, ctx, rng, i):
+    if i % 5:
+        return client.get('/api/members/public', query_string={'name': rng.choice(SEARCHES), '_r': i}), 200
+    return client.get('/api/members/public', query_string={'_r': i}), 200
+
+
+def login(client, ctx, rng, i):
+    email = f'user{rng.randrange(USERS)}@example.com'
+    return client.post('/api/auth/login', json={'email': email, 'password': PASSWORD}), 200
+
+
+def import_db(client, ctx, rng, i):
+    from app import job_runner
+
+    with ctx.lock:
+        start = ctx.import_offset
+        ctx.import_offset += IMPORT_ROWS // 2
+    # 앞 절반은 기존 회원(이메일이 같은 행은 수정), 뒤 절반은 신규
+    existing = synthetic.members_csv(IMPORT_ROWS // 2, seed=i, start=rng.randrange(max(1, ctx.members - IMPORT_ROWS)))
+    new = synthetic.members_csv(IMPORT_ROWS - IMPORT_ROWS // 2, seed=i, start=start)
+    data = existing + new.split(b'\n', 1)[1]
+    response = client.post('/api/import-db', headers=ctx.admin_headers,
+                           data={'file': (io.BytesIO(data), 'members.csv')}, content_type='multipart/form-data')
+    if response.status_code != 202:
+        return response, 202
+    # 작업 워커 대신 이 스레드에서 바로 실행
+    job_id = response.get_json()['id']
+    with ctx.app.app_context():
+        job_runner.claim(job_id)
+        job_runner.run(job_id)
+    return client.get(f'/api/jobs/{job_id}', headers=ctx.admin_headers), 200
+
+
+# 이름 -> (함수, 고정 동시성(None 이면 --concurrency), 요청 수(None 이면 --requests))
+SCENARIOS = {
+    'get_members': (get_members, None, None),
+    'search_members': (search_members, None, None),
+    'get_public_members': (get_public_members, None, None),
+    'login': (login, None, None),
+    'import_db': (import_db, 1, IMPORT_REQUESTS),
+}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def run_scenario(ctx, name, concurrency, requests):
+    func, fixed_concurrency, fixed_requests = SCENARIOS[name]
+    concurrency = fixed_concurrency or concurrency
+    requests = fixed_requests or requests
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def send(thread_index, count, measure):
+        client = ctx.app.test_client()
+        rng = random.Random(f'{name}-{thread_index}-{measure}')
+        for n in range(count):
+            i = thread_index * count + n + (0 if measure else 10 ** 6)
+            start = time.perf_counter()
+            response, expected = func(client, ctx, rng, i)
+            elapsed = time.perf_counter() - start
+            if measure:
+                with lock:
+                    latencies.append(elapsed)
+                    if response.status_code != expected or \
+                            (name == 'import_db' and response.get_json().get('status') != 'succeeded'):
+                        errors.append(f'{response.status_code} {response.get_data(as_text=True)[:120]}')
+
+    if name != 'import_db':
+        send(0, WARMUP_REQUESTS, False)
+    per_thread = max(1, requests // concurrency)
+    threads = [threading.Thread(target=send, args=(index, per_thread, True)) for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput': round(len(latencies) / wall, 2),
+        'p50': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99': round(percentile(latencies, 0.99) * 1000, 2),
+    }, errors
+
+
+def prepare(app, members, reuse):
+    from app import db, Member, User, UserRole
+
+    with app.app_context():
+        db.create_all()
+        if not (reuse and db.session.query(Member.id).count() == members):
+            synthetic.populate(members, USERS, password=PASSWORD)
+        # import_db 는 최고 관리자만 호출할 수 있다
+        User.query.filter_by(email=ADMIN_EMAIL).update({'role': UserRole.SUPER_ADMIN})
+        db.session.commit()
+        db.session.remove()
+
+
+def compare(result, baseline, tolerance):
+    """기준값보다 나빠진 항목 목록"""
+    problems = []
+    if result['errors']:
+        problems.append(f"{result['errors']} errors")
+    if baseline:
+        if result['p95'] > baseline['p95'] * (1 + tolerance):
+            problems.append(f"p95 {result['p95']:.1f}ms > {baseline['p95']:.1f}ms x {1 + tolerance:.2f}")
+        if result['throughput'] < baseline['throughput'] * (1 - tolerance):
+            problems.append(f"req/s {result['throughput']:.1f} < {baseline['throughput']:.1f} x {1 - tolerance:.2f}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부하 시나리오 벤치마크')
+    parser.add_argument('--members', type=int, default=1000)
+    parser.add_argument('--database-uri', help='기본: 임시 SQLite 파일')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200, help='시나리오당 요청 수')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--password-hash-method', help='기본: 테스트 설정 (pbkdf2:sha256:1000)')
+    parser.add_argument('--reuse', action='store_true', help='회원 수가 같으면 데이터를 다시 만들지 않는다')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.3)
+    args = parser.parse_args()
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    from app import create_app, db
+
+    database_uri = args.database_uri or \
+        'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='load-suite-'), 'members.db')
+    overrides = {'SQLALCHEMY_DATABASE_URI': database_uri, 'RATELIMIT_ENABLED': False,
+                 'INSTRUMENTATION_ENABLED': False, 'JOB_FOLDER': tempfile.mkdtemp(prefix='load-suite-jobs-')}
+    if args.password_hash_method:
+        overrides['PASSWORD_HASH_METHOD'] = args.password_hash_method
+    app = create_app('testing', overrides)
+    prepare(app, args.members, args.reuse)
+    with app.app_context():
+        dialect = db.engine.dialect.name
+    token = app.test_client().post('/api/auth/login', json={'email': ADMIN_EMAIL, 'password': PASSWORD}) \
+        .get_json()['access_token']
+    ctx = Context(app, args.members, synthetic.district_count(args.members),
+                  {'Authorization': f'Bearer {token}'})
+
+    baseline_path = os.path.join(BASELINE_DIR, f'{dialect}-{args.members}.json')
+    baseline = {}
+    if os.path.exists(baseline_path) and not args.save_baseline:
+        with open(baseline_path) as fh:
+            baseline = json.load(fh)['scenarios']
+
+    print(f"{dialect}, {args.members} members, concurrency {args.concurrency}, "
+          f"{args.requests} requests per scenario, cpus {os.cpu_count()}"
+          + (f", baseline {os.path.relpath(baseline_path, ROOT)}" if baseline else ''))
+    print(f"{'scenario':20s} {'requests':>8s} {'errors':>6s} {'req/s':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s}  (ms)")
+    results = {}
+    failed = False
+    for name in names:
+        result, errors = run_scenario(ctx, name, args.concurrency, args.requests)
+        results[name] = result
+        problems = compare(result, baseline.get(name), args.tolerance)
+        failed |= bool(problems)
+        print(f"{name:20s} {result['requests']:8d} {result['errors']:6d} {result['throughput']:8.1f} "
+              f"{result['p50']:8.1f} {result['p95']:8.1f} {result['p99']:8.1f}"
+              + (f"  REGRESSION: {'; '.join(problems)}" if problems else ''))
+        for error in errors[:3]:
+            print(f"    {error}")
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path, 'w') as fh:
+            json.dump({
+                'environment': {'python': platform.python_version(), 'cpus': os.cpu_count(),
+                                'concurrency': args.concurrency, 'requests': args.requests},
+                'scenarios': results,
+            }, fh, indent=2, sort_keys=True)
+            fh.write('\n')
+        print(f"Saved baseline {os.path.relpath(baseline_path, ROOT)}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""벤치마크/부하 시험용 가상 교인 데이터 생성기
+
+사용법: python benchmarks/synthetic.py <회원 수> [--users N] [--database-uri URI] [--csv 파일]
+- --database-uri 의 DB(기본: TEST_DATABASE_URI / 테스트 설정)를 비우고 회원/사용자를 채운다.
+- --csv 를 주면 DB 대신 /api/import-db 형식의 CSV 파일을 쓴다.
+
+members(), users(), members_csv() 는 다른 벤치마크에서 가져다 쓴다. 같은 seed 면 같은 데이터가 나온다.
+- 이름: 성씨 빈도를 반영한 한글 이름 (외자 5%), 초성(name_initials) 포함
+- 구역: 회원 30명당 한 구역(5~500), 직분/역할/도시는 교회 분포를 흉내 낸 가중치
+- 부부: 약 35% 가 같은 구역/주소의 부부로 짝지어져 서로를 spouse 로 가진다
+- 사진: 60% 가 사진 파일 이름을 가진다 (파일은 만들지 않으므로 썸네일 없이 원본 URL 로 응답)
+일괄 INSERT 는 매퍼 이벤트를 거치지 않으므로 연중 일자/변경 번호를 직접 채우고, 끝나면 검색 색인과 통계를 다시 만든다.
+1M 명은 SQLite 기준 수 분, 디스크 약 400MB.
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from itertools import accumulate, islice
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from member_calendar import day_of_year, register_day_of_year
+from member_search import hangul_initials
+
+SURNAMES = {
+    '김': 215, '이': 147, '박': 84, '최': 47, '정': 43, '강': 24, '조': 21, '윤': 21, '장': 20, '임': 17,
+    '한': 15, '오': 15, '서': 14, '신': 14, '권': 14, '황': 14, '안': 13, '송': 13, '류': 12, '전': 11,
+    '홍': 11, '고': 9, '문': 9, '양': 9, '손': 9, '배': 8, '백': 8, '허': 7, '유': 7, '남': 6,
+}
+GIVEN_SYLLABLES = '민서준지현우수영진하은도윤예성재희경철동혁승연주원정태호석상용미숙자순옥혜소유아채'
+POSITIONS = {'성도': 55, '집사': 20, '권사': 8, '안수집사': 6, '장로': 3, '청년': 6, '전도사': 1, '목사': 1}
+ROLES = {'회원': 90, '비회원': 6, '구역장': 3, '당회 및 교역자': 1}
+CITIES = {'서울': 50, '성남': 12, '용인': 10, '수원': 8, '하남': 6, '광주': 5, '인천': 5, '고양': 4}
+ROADS = '중앙 한강 세종 율곡 은행 분당 판교 동문 신흥 수정'.split()
+REGISTER_START = date(1990, 1, 1)
+SPOUSE_RATE = 0.35
+PHOTO_RATE = 0.6
+USER_ROLES = {'USER': 95, 'ADMIN': 4, 'SUPER_ADMIN': 1}
+
+CSV_COLUMNS = ['name', 'email', 'register_date', 'birth_year', 'birth_month', 'birth_day', 'phone', 'gender',
+               'address', 'city', 'district', 'spouse', 'position', 'role']
+
+
+class Weighted:
+    """가중치 표에서 빠르게 뽑기 (rng.choices 는 호출마다 누적 합을 다시 계산한다)"""
+
+    def __init__(self, weights):
+        self.values = list(weights)
+        self.cumulative = list(accumulate(weights.values()))
+
+    def __call__(self, rng):
+        return rng.choices(self.values, cum_weights=self.cumulative)[0]
+
+
+_surname = Weighted(SURNAMES)
+_position = Weighted(POSITIONS)
+_role = Weighted(ROLES)
+_city = Weighted(CITIES)
+
+
+def korean_name(rng):
+    given = rng.choice(GIVEN_SYLLABLES)
+    if rng.random() >= 0.05:
+        given += rng.choice(GIVEN_SYLLABLES)
+    return _surname(rng) + given
+
+
+def district_count(count):
+    return min(500, max(5, count // 30))
+
+
+def members(count, seed=42, start=0, version_start=None, total=None):
+    """회원 행 dict 를 count 개 만든다. (member 테이블 컬럼 이름, id 제외)
+
+    start 는 이메일 번호의 시작 값 - 같은 DB 에 나눠 넣을 때 겹치지 않게 하고, total 은 전체 회원 수(구역 수 계산용)
+    version_start 를 주면 version 을 그 번호부터 차례로 채운다. (member_changes.reserve 로 발급한 범위)
+    """
+    rng = random.Random(f'{seed}-{start}')
+    districts = district_count(total or count)
+    today = date.today()
+    now = datetime.utcnow()
+    pending_spouse = None
+    for i in range(start, start + count):
+        if pending_spouse is not None:
+            # 바로 앞 회원의 배우자
+            row = pending_spouse
+            pending_spouse = None
+        else:
+            row = _member(rng, districts, today)
+            if rng.random() < SPOUSE_RATE and i + 1 < start + count:
+                spouse = _member(rng, districts, today)
+                spouse.update(gender='여' if row['gender'] == '남' else '남', district=row['district'],
+                              city=row['city'], address=row['address'], spouse=row['name'])
+                spouse['birth_year'] = min(today.year, max(1930, row['birth_year'] + rng.randint(-4, 4)))
+                row['spouse'] = spouse['name']
+                pending_spouse = spouse
+        row['email'] = f'member{i}@example.com'
+        if version_start is not None:
+            row['version'] = version_start + i - start
+            row['updated_at'] = now
+        yield row
+
+
+def _member(rng, districts, today):
+    name = korean_name(rng)
+    birth_year = int(rng.triangular(1935, today.year, 1975))
+    birth_month = rng.randint(1, 12)
+    birth_day = rng.randint(1, 28 if birth_month == 2 else 30)
+    # 등록일은 REGISTER_START 와 출생일 중 늦은 날 이후
+    first = max(REGISTER_START, date(birth_year, birth_month, birth_day))
+    register_date = first + timedelta(days=rng.randint(0, max(0, (today - first).days)))
+    city = _city(rng)
+    return {
+        'name': name,
+        'name_initials': hangul_initials(name),
+        'register_date': register_date,
+        'register_day_of_year': register_day_of_year(register_date),
+        'birth_year': birth_year,
+        'birth_month': birth_month,
+        'birth_day': birth_day,
+        'birth_day_of_year': day_of_year(birth_month, birth_day),
+        'phone': f'010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}',
+        'gender': '남' if rng.random() < 0.45 else '여',
+        'city': city,
+        'address': f'{city} {rng.choice(ROADS)}로 {rng.randint(1, 300)}',
+        'district': f'{rng.randint(1, districts)}구역',
+        'position': _position(rng),
+        'role': _role(rng),
+        'is_active': rng.random() < 0.8,
+        'spouse': None,
+        'photo': f'{rng.getrandbits(128):032x}.jpg' if rng.random() < PHOTO_RATE else None,
+        'password_hash': None,
+    }
+
+
+def users(count, password_hash, seed=42, start=0):
+    """사용자 행 dict (email user<i>@example.com, 모두 같은 비밀번호 해시 - 해시 계산은 느리므로 한 번만)"""
+    rng = random.Random(f'users-{seed}-{start}')
+    role = Weighted(USER_ROLES)
+    for i in range(start, start + count):
+        yield {'email': f'user{i}@example.com', 'password_hash': password_hash, 'role': role(rng)}
+
+
+def members_csv(count, seed=42, start=0):
+    """/api/import-db 로 올릴 CSV (UTF-8 bytes)"""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, CSV_COLUMNS, extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(members(count, seed, start))
+    return buf.getvalue().encode('utf-8')
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def populate(member_count, user_count=0, password='Synthetic-1234', seed=42, chunk_size=10000, progress=print):
+    """현재 앱 컨텍스트의 DB 를 비우고 가상 회원/사용자로 채운다."""
+    from app import db, Member, User, credentials, member_changes, member_search_index, member_stats
+
+    started = time.perf_counter()
+    db.drop_all()
+    db.create_all()
+    session = db.session
+    table = Member.__table__
+    inserted = 0
+    for chunk_start in range(0, member_count, chunk_size):
+        size = min(chunk_size, member_count - chunk_start)
+        last = member_changes.reserve(session.connection(), size)
+        session.execute(table.insert(), list(members(size, seed, chunk_start, version_start=last - size + 1,
+                                                          total=member_count)))
+        session.commit()
+        inserted += size
+        if progress and member_count >= 100000 and inserted % 100000 < chunk_size:
+            progress(f"  {inserted}/{member_count} members ({time.perf_counter() - started:.0f}s)")
+    if user_count:
+        password_hash = credentials.hash(password)
+        for chunk in chunked(users(user_count, password_hash, seed), chunk_size):
+            session.execute(User.__table__.insert(), chunk)
+        session.commit()
+    member_search_index.rebuild()
+    member_stats.rebuild()
+    if progress:
+        progress(f"Generated {member_count} members, {user_count} users in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가상 교인 데이터 생성')
+    parser.add_argument('members', type=int)
+    parser.add_argument('--users', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-uri', help='기본: TEST_DATABASE_URI 또는 테스트 설정의 DB')
+    parser.add_argument('--csv', help='DB 대신 CSV 파일로 저장')
+    args = parser.parse_args()
+
+    if args.csv:
+        with open(args.csv, 'wb') as fh:
+            fh.write(members_csv(args.members, args.seed))
+        print(f"Wrote {args.members} members to {args.csv}")
+        return
+
+    from app import create_app
+
+    overrides = {'INSTRUMENTATION_ENABLED': False}
+    if args.database_uri:
+        overrides['SQLALCHEMY_DATABASE_URI'] = args.database_uri
+    app = create_app('testing', overrides)
+    with app.app_context():
+        populate(args.members, args.users, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
-from app import app, db
+from app import create_app, db
 from sqlalchemy import inspect
 
 def check_db_structure():
+    app = create_app()
     with app.app_context():
         inspector = inspect(db.engine)
         tables = inspector.get_table_names()
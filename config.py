@@ -1,27 +1,124 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
-load_dotenv()
+basedir = os.path.abspath(os.path.dirname(__file__))
+load_dotenv(os.path.join(basedir, '.env'))
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'you-will-never-guess'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URI')
+
+    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:3000').split(',')
+
+    # REDIS_URL 을 빈 값으로 두면 Redis 없이 동작 (블록리스트는 JWT_BLOCKLIST_BACKEND, 캐시는 로컬 LRU)
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    JWT_BLOCKLIST_BACKEND = os.environ.get('JWT_BLOCKLIST_BACKEND', 'redis')
+    JWT_BLOCKLIST_SQLITE_PATH = os.environ.get('JWT_BLOCKLIST_SQLITE_PATH', os.path.join(basedir, 'instance', 'token_blocklist.db'))
+    JWT_BLOCKLIST_LOCAL_TTL = float(os.environ.get('JWT_BLOCKLIST_LOCAL_TTL', '2'))
+    JWT_BLOCKLIST_FAIL_OPEN = os.environ.get('JWT_BLOCKLIST_FAIL_OPEN', '').lower() in ('1', 'true', 'yes')
+    # Redis 블록리스트 오류 후 JWT_BLOCKLIST_SQLITE_PATH 로 대신 처리할 시간(초)
+    JWT_BLOCKLIST_RETRY_INTERVAL = float(os.environ.get('JWT_BLOCKLIST_RETRY_INTERVAL', '5'))
+
+    # 속도 제한 (rate_limit_storage.py) - Redis 의 moving window 카운터를 워커들이 공유하고,
+    # 여유가 많은 키는 워커가 항목 몇 개를 미리 확보해 Redis 왕복 없이 통과시킨다. Redis 장애 시에는 워커별로 센다.
+    RATELIMIT_STRATEGY = 'moving-window'
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI') or (f'leased+{REDIS_URL}' if REDIS_URL else 'memory://')
+    RATELIMIT_STORAGE_OPTIONS = {
+        'socket_timeout': 0.5,
+        'socket_connect_timeout': 0.5,
+        'lease_fraction': float(os.environ.get('RATELIMIT_LEASE_FRACTION', '0.1')),
+        'max_lease': int(os.environ.get('RATELIMIT_MAX_LEASE', '20')),
+        'lease_ttl': float(os.environ.get('RATELIMIT_LEASE_TTL', '1')),
+        'retry_interval': float(os.environ.get('RATELIMIT_RETRY_INTERVAL', '5')),
+    }
+
+    # 백그라운드 작업 (가져오기/내보내기/썸네일) - 워커 프로세스 수와 작업 파일 폴더
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+    JOB_FOLDER = os.environ.get('JOB_FOLDER', os.path.join(basedir, 'instance', 'jobs'))
+    # 이 시간(초) 동안 heartbeat 가 없는 실행 중 작업은 실패 처리, 끝난 작업 파일 보관 기간(일)
+    JOB_LEASE_TIMEOUT = int(os.environ.get('JOB_LEASE_TIMEOUT', '120'))
+    JOB_RETENTION_DAYS = float(os.environ.get('JOB_RETENTION_DAYS', '7'))
+
+    UPLOAD_FOLDER = os.path.join(basedir, 'uploads')
+    # 업로드 파일 전송을 프록시에 맡길 때: 'x-sendfile' (apache/lighttpd) 또는 'x-accel-redirect' (nginx)
+    UPLOADS_OFFLOAD = os.environ.get('UPLOADS_OFFLOAD', '')
+    UPLOADS_ACCEL_PREFIX = os.environ.get('UPLOADS_ACCEL_PREFIX', '/protected-uploads/')
+
+    # orjson 이 설치되어 있으면 JSON 응답 직렬화에 사용 (json_provider.py)
+    JSON_USE_ORJSON = os.environ.get('JSON_USE_ORJSON', '1').lower() not in ('0', 'false', 'no')
+
+    # 계측 (instrumentation.py) - 느린 쿼리 기준(초), 느린 쿼리 파라미터 기록(회원/사용자 테이블은 항상 생략),
+    # /metrics 접근 토큰 (비우면 METRICS_PUBLIC 일 때만 누구나 조회)
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', '1').lower() not in ('0', 'false', 'no')
+    SLOW_QUERY_THRESHOLD = float(os.environ.get('SLOW_QUERY_THRESHOLD', '0.2'))
+    SLOW_QUERY_LOG_PARAMETERS = os.environ.get('SLOW_QUERY_LOG_PARAMETERS', '0').lower() not in ('0', 'false', 'no')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+    METRICS_PUBLIC = True
+
+    # 비밀번호 해시 (credentials.py) - werkzeug 방식 문자열, 해시 스레드 수(0 이면 요청 스레드에서 계산), 대기 작업 상한
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '1'))
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', '32'))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', '10'))
+
+    # 백업 (backup.py) - 압축 형식(gzip 또는 zstd: zstandard 패키지 필요),
+    # WAL 이 아닌 SQLite 를 나눠 복사할 때 한 번에 복사할 페이지 수와 사이 대기 시간(초)
+    BACKUP_COMPRESSION = os.environ.get('BACKUP_COMPRESSION', 'gzip')
+    BACKUP_STEP_PAGES = int(os.environ.get('BACKUP_STEP_PAGES', '1024'))
+    BACKUP_STEP_SLEEP = float(os.environ.get('BACKUP_STEP_SLEEP', '0.05'))
+
+    # PostgreSQL/MySQL 커넥션 풀 (워커 프로세스마다 pool_size + max_overflow 개까지 연결)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))  # MySQL wait_timeout 보다 짧게
+    DB_POOL_PRE_PING = True
+    # SQLite 연결마다 적용할 PRAGMA
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000')),  # ms
+        'mmap_size': 256 * 1024 * 1024,
+    }
+    # SQLite 쓰기 트랜잭션을 BEGIN IMMEDIATE 로 시작 (db_engine.py)
+    SQLITE_IMMEDIATE_WRITES = os.environ.get('SQLITE_IMMEDIATE_WRITES', '1') == '1'
 
 class DevelopmentConfig(Config):
     DEBUG = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(os.path.abspath(os.path.dirname(__file__)), 'instance', 'church_members_dev.db')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URI') or \
+        'sqlite:///' + os.path.join(basedir, 'instance', 'church_members_dev.db')
 
 class TestingConfig(Config):
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///instance/church_members_test.db'
+    DB_POOL_SIZE = 2
+    DB_MAX_OVERFLOW = 5
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URI') or 'sqlite:///instance/church_members_test.db'
+    JWT_BLOCKLIST_BACKEND = 'memory'
+    JOB_WORKERS = 0
+    RATELIMIT_STORAGE_URI = 'memory://'
+    # 테스트/벤치마크 로그인이 느려지지 않도록 가벼운 해시
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    PASSWORD_HASH_WORKERS = 0
 
 class ProductionConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URI') or \
         'sqlite:///instance/church_members_prod.db'
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '10'))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '20'))
+    # 워커 프로세스마다 해시 스레드 수 (CPU 절반 정도, 나머지는 일반 요청용)
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(max(1, (os.cpu_count() or 2) // 2))))
+    SQLITE_PRAGMAS = dict(Config.SQLITE_PRAGMAS, busy_timeout=int(os.environ.get('SQLITE_BUSY_TIMEOUT', '15000')))
+    # 운영에서는 METRICS_TOKEN 이 있어야 /metrics 를 조회할 수 있다
+    METRICS_PUBLIC = False
 
 config = {
     'development': DevelopmentConfig,
     'testing': TestingConfig,
     'production': ProductionConfig,
     'default': DevelopmentConfig
-}
\ No newline at end of file
+}
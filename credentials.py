@@ -0,0 +1,99 @@
+"""비밀번호 해시/검증 서비스
+
+- PASSWORD_HASH_METHOD (werkzeug 형식: 'scrypt:32768:8:1', 'pbkdf2:sha256:600000') 로 환경별 알고리즘/비용을 정한다.
+- 로그인에 성공했는데 저장된 해시의 방식이 현재 설정과 다르면 새 방식으로 다시 해시한다. (needs_rehash)
+- 해시 계산은 PASSWORD_HASH_WORKERS 개 스레드 풀에서 실행한다. hashlib 의 scrypt/pbkdf2 는 계산 중 GIL 을
+  놓으므로 로그인이 몰려도 해시는 풀 크기만큼만 CPU 를 쓰고, 나머지 요청 스레드는 계속 처리된다.
+- 대기+실행 중인 해시 작업이 PASSWORD_HASH_QUEUE 개를 넘으면 기다리지 않고 CredentialServiceBusy 를 발생시킨다.
+  (503 + Retry-After) PASSWORD_HASH_WORKERS=0 이면 요청 스레드에서 바로 계산한다.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+DEFAULT_MAX_PENDING = 32
+DEFAULT_TIMEOUT = 10  # 초 - 해시 결과를 기다리는 최대 시간
+
+
+class CredentialServiceBusy(Exception):
+    """해시 작업이 밀려 있어 요청을 받지 않음"""
+
+
+def hash_method(pwhash):
+    """'scrypt:32768:8:1$salt$hash' -> 'scrypt:32768:8:1'"""
+    return (pwhash or '').split('$', 1)[0]
+
+
+class CredentialService:
+    def __init__(self, app=None):
+        self.method = DEFAULT_METHOD
+        self.workers = 1
+        self.max_pending = DEFAULT_MAX_PENDING
+        self.timeout = DEFAULT_TIMEOUT
+        self._canonical_method = None
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD') or DEFAULT_METHOD
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 1)
+        self.max_pending = app.config.get('PASSWORD_HASH_QUEUE', DEFAULT_MAX_PENDING)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', DEFAULT_TIMEOUT)
+        self._canonical_method = None
+        app.extensions['credentials'] = self
+
+    def _get_executor(self):
+        # gunicorn preload 후 fork 된 워커에는 부모의 스레드가 없으므로 프로세스마다 새로 만든다
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+            self._executor_pid = pid
+            self._pending = 0
+        return self._executor
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, func, *args):
+        if self.workers <= 0:
+            return func(*args)
+        with self._lock:
+            executor = self._get_executor()
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise CredentialServiceBusy()
+            self._pending += 1
+        future = executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise CredentialServiceBusy()
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        if not pwhash or password is None:
+            return False
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """저장된 해시가 현재 설정(알고리즘/비용)으로 만든 것이 아니면 True"""
+        if self._canonical_method is None:
+            # 'scrypt' 처럼 비용을 생략한 설정은 werkzeug 기본값이 붙은 형태로 저장되므로 한 번 만들어 비교한다
+            self._canonical_method = hash_method(generate_password_hash('', self.method))
+        return hash_method(pwhash) != self._canonical_method
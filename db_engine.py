@@ -0,0 +1,93 @@
+"""데이터베이스 엔진/커넥션 풀 설정
+
+- PostgreSQL/MySQL: 커넥션 풀 크기, overflow, pool_pre_ping(끊긴 연결 감지), pool_recycle
+- SQLite: 연결마다 PRAGMA (WAL, synchronous=NORMAL, busy_timeout, mmap_size) 적용
+  WAL 에서는 읽기와 쓰기가 서로를 막지 않고, 쓰기끼리는 busy_timeout 동안 잠금을 기다린다.
+- SQLite 쓰기 요청의 세션 트랜잭션은 BEGIN IMMEDIATE 로 시작한다. (SQLITE_IMMEDIATE_WRITES)
+  pysqlite 기본(BEGIN DEFERRED)에서는 읽은 뒤 쓰기 잠금으로 올리는 순간 다른 연결이 쓰고 있으면
+  busy_timeout 을 기다리지 않고 바로 "database is locked" 가 난다. (교착을 피하려고 SQLite 가 즉시 포기한다)
+  처음부터 쓰기 잠금을 잡으면 잠금 대기가 트랜잭션 시작에서 일어나므로 busy_timeout 이 적용된다.
+  (쓰기가 몰리면 대기가 길어지므로 운영 설정은 busy_timeout 을 15초로 둔다)
+  GET/HEAD/OPTIONS 요청과 세션 밖의 연결은 pysqlite 기본 동작 그대로 - benchmarks/check_concurrent_writes.py
+
+값은 config.py 의 DB_* / SQLITE_PRAGMAS 로 환경별로 정한다.
+SQLALCHEMY_ENGINE_OPTIONS 를 직접 설정하면 그 값이 우선한다.
+"""
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+READ_ONLY_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+def engine_options(config):
+    """DB 종류에 맞는 SQLALCHEMY_ENGINE_OPTIONS"""
+    uri = config.get('SQLALCHEMY_DATABASE_URI')
+    if not uri:
+        return {}
+    url = make_url(uri)
+    if url.get_backend_name() == 'sqlite':
+        if url.database in (None, '', ':memory:'):
+            # 메모리 DB 는 Flask-SQLAlchemy 기본값(단일 연결 공유)을 그대로 쓴다
+            return {}
+        # busy_timeout 은 PRAGMA 로도 설정하지만, 연결 직후 PRAGMA 실행 중의 잠금도 기다리도록 함께 지정
+        return {
+            'connect_args': {'timeout': config.get('SQLITE_PRAGMAS', {}).get('busy_timeout', 5000) / 1000},
+        }
+    return {
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+    }
+
+
+def configure_engine_options(app):
+    """db.init_app() 전에 호출 - 엔진 옵션을 채운다"""
+    if 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """SQLite 엔진의 새 연결마다 PRAGMA 를 실행한다. (같은 엔진에는 한 번만 등록)"""
+    if engine.dialect.name != 'sqlite' or not pragmas or getattr(engine, 'sqlite_pragmas', None):
+        return
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    event.listen(engine, 'connect', set_pragmas)
+    engine.sqlite_pragmas = dict(pragmas)
+
+
+def apply_sqlite_immediate_writes(session, engine):
+    """쓰기 요청의 세션 트랜잭션을 BEGIN IMMEDIATE 로 시작한다. (같은 세션에는 한 번만 등록)
+
+    pysqlite 는 첫 INSERT/UPDATE/DELETE 직전에야 BEGIN 을 실행하므로, 세션이 트랜잭션을 시작하는 시점
+    (after_begin - 아직 아무 문도 실행하지 않았다)에 직접 BEGIN IMMEDIATE 를 실행한다.
+    세션 밖의 연결(engine.connect()/begin())과 읽기 요청, CLI/백그라운드 작업은 pysqlite 기본 동작 그대로다.
+    """
+    if engine.dialect.name != 'sqlite' or getattr(engine, 'sqlite_immediate_writes', False):
+        return
+
+    def begin_immediate(session, transaction, connection):
+        if connection.engine is engine and has_request_context() and request.method not in READ_ONLY_METHODS:
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    event.listen(session, 'after_begin', begin_immediate)
+    engine.sqlite_immediate_writes = True
+
+
+def configure_engine(app, db):
+    """db.init_app() 뒤에 호출 - SQLite PRAGMA 와 트랜잭션 시작 방식을 등록한다"""
+    with app.app_context():
+        apply_sqlite_pragmas(db.engine, app.config.get('SQLITE_PRAGMAS'))
+        if app.config.get('SQLITE_IMMEDIATE_WRITES', True):
+            apply_sqlite_immediate_writes(db.session, db.engine)
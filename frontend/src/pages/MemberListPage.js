@@ -341,6 +341,17 @@ function MemberListPage() {
           },
         });
         console.log('파일 업로드 성공:', response.data);
+
+        // 가져오기는 백그라운드 작업으로 실행되므로 끝날 때까지 상태를 확인
+        let job = response.data;
+        while (job.status === 'queued' || job.status === 'running') {
+          await new Promise(resolve => setTimeout(resolve, 1000));
+          job = (await axios.get(`/api/jobs/${job.id}`)).data;
+        }
+        console.log('가져오기 작업 결과:', job);
+        if (job.status !== 'succeeded') {
+          setError('데이터베이스 가져오기 중 오류가 발생했습니다.');
+        }
         fetchMembers();
       } catch (error) {
         console.error('파일 업로드 실패:', error);
@@ -495,13 +506,15 @@ function MemberListPage() {
                       <td>
                         <div className="photo-container" onMouseEnter={handleMouseEnter}>
                           <img 
-                            src={getFullImageUrl(member.photoUrl) || '/default-profile.png'} 
+                            src={getFullImageUrl(member.photoUrls?.list || member.photoUrl) || '/default-profile.png'} 
                             alt={member.name} 
                             className="member-photo-thumbnail"
+                            loading="lazy"
                           />
                           <div className="photo-hover">
                             <img 
-                              src={getFullImageUrl(member.photoUrl) || '/default-profile.png'} 
+                              src={getFullImageUrl(member.photoUrls?.detail || member.photoUrl) || '/default-profile.png'} 
+                              loading="lazy"
                               alt={member.name} 
                               className="member-photo-large"
                             />
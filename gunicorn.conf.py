@@ -0,0 +1,35 @@
+"""gunicorn 설정 - gunicorn -c gunicorn.conf.py wsgi:app
+
+preload_app 으로 마스터에서 앱과 모듈을 한 번만 불러온 뒤 fork 하므로 워커가 빨리 뜨고
+불러온 코드/데이터는 copy-on-write 로 공유한다. 값은 환경 변수로 조정한다.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5001')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# 요청 대부분이 DB/Redis 대기이므로 워커마다 스레드를 둔다
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 5
+# 메모리 누수 대비 주기적으로 워커 교체
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = 200
+accesslog = '-'
+
+
+def pre_fork(server, worker):
+    # 불러온 객체를 GC 추적에서 빼서, 워커에서 GC 가 돌 때 공유 페이지가 복사되지 않게 한다
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # 마스터에서 만든 DB 커넥션은 워커끼리 공유하면 안 된다
+    from app import db
+    from wsgi import app
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,217 @@
+"""요청/SQL 계측과 Prometheus /metrics
+
+- 엔드포인트별 응답 시간 히스토그램 (before_request / after_request)
+- 요청마다 SQL 실행 횟수와 시간 (before/after_cursor_execute) - N+1 은 요청당 쿼리 수 히스토그램에 드러난다
+- 느린 쿼리 로그: SLOW_QUERY_THRESHOLD(초) 이상 걸린 쿼리의 SQL 을 경고로 남긴다
+  파라미터는 SLOW_QUERY_LOG_PARAMETERS 를 켠 경우에만 남기고, user/member*/household 테이블 쿼리의
+  파라미터(이메일, 전화번호, 비밀번호 해시 등)는 켜도 남기지 않는다.
+- metrics_response(): Prometheus 텍스트 형식 (/metrics, METRICS_TOKEN 을 설정하면 Authorization: Bearer 토큰 필요)
+  METRICS_PUBLIC 이 꺼져 있으면(운영 설정) 토큰 없이는 조회할 수 없다.
+
+값은 프로세스마다 따로 모은다. gunicorn 워커가 여러 개면 워커마다 다른 값이 보이므로
+수집기에서 합산하거나 워커별로 긁어 간다.
+"""
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, abort, g, got_request_exception, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_THRESHOLD = 0.2  # 초
+MAX_LOGGED_PARAMETERS = 500  # 느린 쿼리 로그에 남길 파라미터 문자열 길이
+# 파라미터를 로그에 남기지 않는 테이블 (개인정보 - 회원 검색 색인과 가정 이름에도 이름이 들어 있다)
+REDACTED_TABLES = re.compile(r'(?<![\w.])"?(user|member\w*|household)"?(?![\w"])', re.IGNORECASE)
+# 요청 밖(백그라운드 작업, CLI)에서 실행된 쿼리의 endpoint 라벨
+BACKGROUND_ENDPOINT = 'background'
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def inc(self, labels=(), amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield f'{self.name}{_labels(self.labelnames, labels)} {_number(value)}'
+
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=REQUEST_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # labels -> [버킷별 개수..., +Inf 개수, 합계]
+
+    def observe(self, labels, value):
+        counts = self._values.get(labels)
+        if counts is None:
+            counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def samples(self):
+        for labels, counts in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}'
+            yield f'{self.name}_sum{_labels(self.labelnames, labels)} {_number(counts[-1])}'
+            yield f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}'
+
+
+class Instrumentation:
+    def __init__(self, app=None, db=None):
+        self._lock = threading.Lock()
+        self.slow_query_threshold = DEFAULT_SLOW_QUERY_THRESHOLD
+        self.log_parameters = False
+        self.metrics_token = None
+        self.metrics_public = True
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', '요청 처리 시간', ('endpoint', 'method', 'status'), REQUEST_BUCKETS)
+        self.request_queries = Histogram(
+            'http_request_db_queries', '요청당 SQL 실행 횟수', ('endpoint',), QUERY_COUNT_BUCKETS)
+        self.query_duration = Histogram(
+            'db_query_duration_seconds', 'SQL 실행 시간', ('endpoint',), QUERY_BUCKETS)
+        self.slow_queries = Counter('db_slow_queries_total', '느린 쿼리 수', ('endpoint',))
+        self.exceptions = Counter('http_request_exceptions_total', '처리되지 않은 예외 수', ('endpoint', 'exception'))
+        self.metrics = [self.request_duration, self.request_queries, self.query_duration,
+                        self.slow_queries, self.exceptions]
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        self.slow_query_threshold = app.config.get('SLOW_QUERY_THRESHOLD', DEFAULT_SLOW_QUERY_THRESHOLD)
+        self.log_parameters = app.config.get('SLOW_QUERY_LOG_PARAMETERS', False)
+        self.metrics_token = app.config.get('METRICS_TOKEN')
+        self.metrics_public = app.config.get('METRICS_PUBLIC', True)
+        if not self.metrics_token and not self.metrics_public:
+            logger.warning("METRICS_TOKEN 이 없어 /metrics 를 사용할 수 없습니다.")
+        app.extensions['instrumentation'] = self
+        if not app.config.get('INSTRUMENTATION_ENABLED', True):
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        got_request_exception.connect(self._on_exception, app)
+        with app.app_context():
+            self.watch_engine(db.engine)
+
+    def watch_engine(self, engine):
+        """engine 의 SQL 실행 시간을 잰다. (같은 엔진에는 한 번만 등록)"""
+        if getattr(engine, 'instrumented', False):
+            return
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        engine.instrumented = True
+
+    @staticmethod
+    def _endpoint():
+        if has_request_context():
+            return request.endpoint or 'unmatched'
+        return BACKGROUND_ENDPOINT
+
+    def _before_request(self):
+        g.instrumentation_start = time.perf_counter()
+        g.db_queries = 0
+        g.db_time = 0.0
+
+    def _after_request(self, response):
+        start = g.pop('instrumentation_start', None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = self._endpoint()
+        with self._lock:
+            self.request_duration.observe((endpoint, request.method, str(response.status_code)), elapsed)
+            self.request_queries.observe((endpoint,), g.get('db_queries', 0))
+        # 브라우저 개발자 도구에서 확인할 수 있도록
+        response.headers['Server-Timing'] = (f'app;dur={elapsed * 1000:.1f}, '
+                                             f'db;dur={g.get("db_time", 0.0) * 1000:.1f};'
+                                             f'desc="{g.get("db_queries", 0)} queries"')
+        return response
+
+    def _on_exception(self, sender, exception, **extra):
+        with self._lock:
+            self.exceptions.inc((self._endpoint(), type(exception).__name__))
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('instrumentation_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('instrumentation_start')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        endpoint = self._endpoint()
+        if has_request_context() and 'db_queries' in g:
+            g.db_queries += 1
+            g.db_time += elapsed
+        with self._lock:
+            self.query_duration.observe((endpoint,), elapsed)
+            if elapsed >= self.slow_query_threshold:
+                self.slow_queries.inc((endpoint,))
+        if elapsed >= self.slow_query_threshold:
+            if not self.log_parameters:
+                params = '(생략)'
+            elif REDACTED_TABLES.search(statement):
+                params = '(개인정보 생략)'
+            else:
+                params = repr(parameters)[:MAX_LOGGED_PARAMETERS]
+            logger.warning("느린 쿼리 %.3fs [%s]%s: %s | parameters=%s", elapsed, endpoint,
+                           ' executemany' if executemany else '', ' '.join(statement.split()), params)
+
+    def metrics_response(self):
+        """/metrics 응답 (METRICS_TOKEN 이 있으면 Bearer 토큰 확인, 공개하지 않는데 토큰이 없으면 404)"""
+        if not self.metrics_token:
+            if not self.metrics_public:
+                abort(404)
+        elif request.headers.get('Authorization') != f'Bearer {self.metrics_token}':
+            abort(401)
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self._lock:
+            for metric in self.metrics:
+                lines.append(f'# HELP {metric.name} {metric.documentation}')
+                lines.append(f'# TYPE {metric.name} {metric.type}')
+                lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
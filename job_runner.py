@@ -0,0 +1,418 @@
+"""백그라운드 작업 실행기 (가져오기/내보내기/사진 처리)
+
+- 작업은 job 테이블에 기록한다. 상태: queued -> running -> succeeded / failed / cancelled
+- 워커는 별도 프로세스 풀로 실행한다. (flask run-jobs 또는 app.run 과 함께 시작)
+- 대기열은 항상 job 테이블이고, Redis 가 있으면 새 작업을 Redis 리스트로 알려 워커가 바로 깨어난다.
+  작업은 'queued -> running' 조건부 UPDATE 로 가져가므로 여러 워커가 같은 작업을 실행하지 않는다.
+- 실행 중인 작업은 progress() 에서 취소 요청을 확인하고 JobCancelled 로 중단한다.
+- 실행 중에는 HEARTBEAT_INTERVAL 마다 heartbeat_at 을 갱신한다. 워커 프로세스가 죽어
+  JOB_LEASE_TIMEOUT 초 넘게 갱신되지 않은 running 작업은 워커가 실패(failed)로 정리한다.
+  (가져오기처럼 일부가 이미 커밋된 작업이 있으므로 다시 실행하지 않는다)
+- 끝난 지 JOB_RETENTION_DAYS 일이 지난 작업의 파일(내보내기/백업 결과 등)은 워커가 지운다.
+  (flask sweep-jobs 로 직접 실행할 수도 있다. 작업 기록은 남는다)
+"""
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import click
+from sqlalchemy import func, select, update
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+DEFAULT_POLL_INTERVAL = 1.0  # 초 - Redis 가 없을 때 job 테이블 조회 간격
+REDIS_POLL_INTERVAL = 5.0  # 초 - Redis 알림을 기다리는 시간 (알림이 유실된 작업도 이 간격으로 확인)
+PROGRESS_INTERVAL = 0.5  # 초 - 진행률을 DB 에 기록하는 최소 간격
+HEARTBEAT_INTERVAL = 10.0  # 초 - 실행 중인 작업의 heartbeat_at 갱신 간격
+DEFAULT_LEASE_TIMEOUT = 120  # 초 - 이보다 오래 heartbeat 가 없으면 워커가 죽은 것으로 본다
+DEFAULT_RETENTION_DAYS = 7  # 끝난 작업 파일 보관 기간
+MAINTENANCE_INTERVAL = 60.0  # 초 - 워커가 멈춘 작업 정리/파일 삭제를 확인하는 간격
+STALE_JOB_ERROR = '작업 워커가 응답하지 않아 실패 처리했습니다.'
+QUEUE_KEY = 'jobs:queue'
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    """작업 함수에 전달되는 실행 정보 (진행률 보고, 취소 확인, 작업 파일 폴더)"""
+
+    def __init__(self, runner, job_id, params):
+        self.runner = runner
+        self.id = job_id
+        self.params = params
+        self.folder = runner.job_folder(job_id)
+        self.processed = 0
+        self.total = None
+        self._last_report = 0
+
+    def path(self, filename):
+        return os.path.join(self.folder, filename)
+
+    def progress(self, processed, total=None, force=False):
+        """처리한 항목 수를 기록한다. 취소가 요청되었으면 JobCancelled 를 발생시킨다."""
+        self.processed = processed
+        if total is not None:
+            self.total = total
+        now = time.monotonic()
+        if not force and now - self._last_report < PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        table = self.runner.model.__table__
+        values = {'processed': self.processed, 'heartbeat_at': datetime.utcnow()}
+        if self.total is not None:
+            values['total'] = self.total
+        with self.runner.db.engine.begin() as connection:
+            connection.execute(update(table).where(table.c.id == self.id).values(**values))
+            cancel_requested = connection.execute(
+                select(table.c.cancel_requested).where(table.c.id == self.id)
+            ).scalar()
+        if cancel_requested:
+            raise JobCancelled()
+
+
+class Heartbeat(threading.Thread):
+    """작업이 실행되는 동안 heartbeat_at 을 주기적으로 갱신한다. (progress() 를 드물게 부르는 작업도 살아 있음을 알린다)"""
+
+    def __init__(self, engine, table, job_id, interval=HEARTBEAT_INTERVAL):
+        super().__init__(name=f'job-heartbeat-{job_id}', daemon=True)
+        self.engine = engine
+        self.table = table
+        self.job_id = job_id
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        table = self.table
+        while not self.stopped.wait(self.interval):
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(update(table).where(table.c.id == self.job_id, table.c.status == RUNNING)
+                                       .values(heartbeat_at=datetime.utcnow()))
+            except Exception as e:
+                logger.warning("작업 heartbeat 기록 실패 %s: %s", self.job_id, e)
+
+    def stop(self):
+        self.stopped.set()
+
+
+class JobRunner:
+    def __init__(self, app=None, db=None, model=None, redis_client=None):
+        self.app = None
+        self.db = db
+        self.model = model
+        self.redis = None
+        self.handlers = {}
+        self.complete_hooks = {}
+        self._observed = set()
+        if app is not None:
+            self.init_app(app, db, model, redis_client)
+
+    def init_app(self, app, db, model, redis_client=None):
+        self.app = app
+        self.db = db
+        self.model = model
+        self.redis = redis_client
+        self.folder = app.config.get('JOB_FOLDER') or os.path.join(app.instance_path, 'jobs')
+        self.poll_interval = app.config.get('JOB_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+        self.lease_timeout = app.config.get('JOB_LEASE_TIMEOUT', DEFAULT_LEASE_TIMEOUT)
+        self.retention_days = app.config.get('JOB_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+        app.extensions['job_runner'] = self
+
+        @app.cli.command('sweep-jobs')
+        @click.option('--days', type=float, default=self.retention_days, show_default=True,
+                      help='끝난 작업 파일 보관 기간(일)')
+        def sweep_jobs(days):
+            stale = self.recover_stale()
+            removed = self.sweep(days)
+            print(f"Marked {stale} stale running jobs as failed, removed files of {removed} finished jobs.")
+
+        @app.cli.command('run-jobs')
+        @click.option('--workers', default=app.config.get('JOB_WORKERS', 2), show_default=True,
+                      help='워커 프로세스 수')
+        def run_jobs(workers):
+            processes = self.start_workers(workers, daemon=False)
+            print(f"Started {len(processes)} job workers.")
+            try:
+                for process in processes:
+                    process.join()
+            except KeyboardInterrupt:
+                for process in processes:
+                    if hasattr(process, 'terminate'):
+                        process.terminate()
+
+    def handler(self, kind):
+        """kind 작업을 실행할 함수 등록: f(job: JobContext, params: dict) -> 결과 dict"""
+        def decorator(f):
+            self.handlers[kind] = f
+            return f
+        return decorator
+
+    def on_complete(self, kind):
+        """kind 작업이 끝난 것을 이 프로세스에서 처음 조회할 때 실행할 함수 등록: f(job)
+
+        워커 프로세스에서 비운 프로세스 내 캐시(Redis 가 없을 때의 응답 캐시 등)를
+        웹 프로세스에서도 비우기 위해 사용한다.
+        """
+        def decorator(f):
+            self.complete_hooks.setdefault(kind, []).append(f)
+            return f
+        return decorator
+
+    def job_folder(self, job_id):
+        return os.path.join(self.folder, job_id)
+
+    # 요청 프로세스 쪽 API
+
+    def create(self, kind, params=None, created_by=None):
+        """작업 행을 만든다. (입력 파일을 job_folder 에 쓴 뒤 submit() 으로 대기열에 넣는다)"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = self.model(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            status=QUEUED,
+            params=json.dumps(params or {}, ensure_ascii=False),
+            created_by=created_by,
+            created_at=datetime.utcnow(),
+        )
+        os.makedirs(self.job_folder(job.id), exist_ok=True)
+        return job
+
+    def submit(self, job):
+        self.db.session.add(job)
+        self.db.session.commit()
+        if self.redis is not None:
+            try:
+                self.redis.rpush(QUEUE_KEY, job.id)
+            except Exception as e:
+                # 알림이 실패해도 워커가 job 테이블을 주기적으로 확인한다
+                logger.warning("작업 대기열 알림 실패 %s: %s", job.id, e)
+        return job
+
+    def enqueue(self, kind, params=None, created_by=None):
+        return self.submit(self.create(kind, params, created_by))
+
+    def get(self, job_id):
+        job = self.db.session.get(self.model, job_id)
+        if job is not None and job.status in FINISHED_STATUSES and job.id not in self._observed:
+            self._observed.add(job.id)
+            for hook in self.complete_hooks.get(job.kind, []):
+                hook(job)
+        return job
+
+    def cancel(self, job):
+        """대기 중이면 바로 취소하고, 실행 중이면 취소를 요청한다. 이미 끝난 작업이면 False"""
+        table = self.model.__table__
+        result = self.db.session.execute(
+            update(table).where(table.c.id == job.id, table.c.status == QUEUED)
+            .values(status=CANCELLED, finished_at=datetime.utcnow())
+        )
+        if result.rowcount == 0:
+            result = self.db.session.execute(
+                update(table).where(table.c.id == job.id, table.c.status == RUNNING)
+                .values(cancel_requested=True)
+            )
+        self.db.session.commit()
+        self.db.session.refresh(job)
+        if job.status == CANCELLED:
+            shutil.rmtree(self.job_folder(job.id), ignore_errors=True)
+        return result.rowcount > 0
+
+    # 워커 쪽
+
+    def claim(self, job_id):
+        table = self.model.__table__
+        with self.db.engine.begin() as connection:
+            result = connection.execute(
+                update(table).where(table.c.id == job_id, table.c.status == QUEUED)
+                .values(status=RUNNING, started_at=datetime.utcnow(), heartbeat_at=datetime.utcnow(),
+                        worker=f'pid-{os.getpid()}')
+            )
+        return result.rowcount == 1
+
+    def _finish(self, job_id, status, processed, total, result=None, error=None):
+        table = self.model.__table__
+        values = {'status': status, 'finished_at': datetime.utcnow(), 'processed': processed,
+                  'result': json.dumps(result, ensure_ascii=False) if result is not None else None,
+                  'error': error}
+        if total is not None:
+            values['total'] = total
+        with self.db.engine.begin() as connection:
+            connection.execute(update(table).where(table.c.id == job_id).values(**values))
+
+    def run(self, job_id):
+        job = self.db.session.get(self.model, job_id)
+        context = JobContext(self, job_id, json.loads(job.params or '{}'))
+        handler = self.handlers.get(job.kind)
+        self.db.session.commit()
+        started = time.monotonic()
+        heartbeat = Heartbeat(self.db.engine, self.model.__table__, job_id)
+        heartbeat.start()
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job.kind}")
+            result = handler(context, context.params)
+        except JobCancelled:
+            self.db.session.rollback()
+            self._finish(job_id, CANCELLED, context.processed, context.total)
+            status = CANCELLED
+        except Exception as e:
+            self.db.session.rollback()
+            logger.exception("작업 실패 %s", job_id)
+            self._finish(job_id, FAILED, context.processed, context.total, error=str(e))
+            status = FAILED
+        else:
+            self._finish(job_id, SUCCEEDED, context.processed, context.total, result=result)
+            status = SUCCEEDED
+        finally:
+            heartbeat.stop()
+            self.db.session.remove()
+        elapsed = time.monotonic() - started
+        logger.info("작업 %s %s: %d건, %.2f초 (%.1f건/초)", job_id, status, context.processed, elapsed,
+                    context.processed / elapsed if elapsed > 0 else 0)
+        return status
+
+    # 정리
+
+    def recover_stale(self):
+        """heartbeat 가 JOB_LEASE_TIMEOUT 초 넘게 없는 running 작업을 실패로 바꾸고 그 수를 반환한다."""
+        table = self.model.__table__
+        cutoff = datetime.utcnow() - timedelta(seconds=self.lease_timeout)
+        with self.db.engine.begin() as connection:
+            result = connection.execute(
+                update(table)
+                .where(table.c.status == RUNNING,
+                       func.coalesce(table.c.heartbeat_at, table.c.started_at) < cutoff)
+                .values(status=FAILED, finished_at=datetime.utcnow(), error=STALE_JOB_ERROR)
+            )
+        if result.rowcount:
+            logger.warning("응답 없는 작업 %d건을 실패 처리했습니다.", result.rowcount)
+        return result.rowcount
+
+    def sweep(self, days=None):
+        """끝난 지 days 일이 지난 작업(과 작업 기록이 없는 오래된 폴더)의 파일을 지우고 지운 폴더 수를 반환한다."""
+        days = self.retention_days if days is None else days
+        try:
+            names = os.listdir(self.folder)
+        except FileNotFoundError:
+            return 0
+        if not names:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        table = self.model.__table__
+        jobs = {}
+        with self.db.engine.connect() as connection:
+            for start in range(0, len(names), 500):
+                jobs.update((job_id, (status, finished_at)) for job_id, status, finished_at in connection.execute(
+                    select(table.c.id, table.c.status, table.c.finished_at)
+                    .where(table.c.id.in_(names[start:start + 500]))))
+        removed = 0
+        for name in names:
+            path = os.path.join(self.folder, name)
+            if name in jobs:
+                status, finished_at = jobs[name]
+                expired = status in FINISHED_STATUSES and finished_at is not None and finished_at < cutoff
+            else:
+                # 작업을 만들다 실패했거나 기록이 지워진 폴더
+                try:
+                    expired = datetime.utcfromtimestamp(os.path.getmtime(path)) < cutoff
+                except OSError:
+                    continue
+            if expired and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def maintain(self):
+        """워커가 주기적으로 호출 - 멈춘 작업 정리와 오래된 파일 삭제 (실패해도 작업 실행은 계속한다)"""
+        try:
+            self.recover_stale()
+            self.sweep()
+        except Exception:
+            logger.exception("작업 정리 실패")
+
+    def _next_queued_id(self):
+        table = self.model.__table__
+        with self.db.engine.connect() as connection:
+            return connection.execute(
+                select(table.c.id).where(table.c.status == QUEUED).order_by(table.c.created_at).limit(1)
+            ).scalar()
+
+    def work(self, stop):
+        """stop 이벤트가 설정될 때까지 작업을 가져와 실행한다."""
+        queue = None
+        if self.redis is not None:
+            # BLPOP 대기 시간보다 긴 소켓 타임아웃을 쓰는 워커 전용 클라이언트
+            from token_blocklist import create_redis_client
+            queue = create_redis_client(self.app.config['REDIS_URL'], socket_timeout=REDIS_POLL_INTERVAL + 5,
+                                        max_connections=2)
+        next_maintenance = 0.0
+        while not stop.is_set():
+            if time.monotonic() >= next_maintenance:
+                self.maintain()
+                next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+            job_id = None
+            if queue is not None:
+                try:
+                    item = queue.blpop(QUEUE_KEY, timeout=REDIS_POLL_INTERVAL)
+                    job_id = item[1] if item else None
+                except Exception as e:
+                    logger.warning("작업 대기열(Redis) 조회 실패, job 테이블을 사용합니다: %s", e)
+                    stop.wait(self.poll_interval)
+            if job_id is None:
+                job_id = self._next_queued_id()
+            if job_id is None:
+                if queue is None:
+                    stop.wait(self.poll_interval)
+                continue
+            if self.claim(job_id):
+                self.run(job_id)
+
+    def _worker_main(self):
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+        with self.app.app_context():
+            # 부모 프로세스에서 연 DB 연결은 공유하지 않는다
+            self.db.engine.dispose(close=False)
+            self.work(stop)
+
+    def start_workers(self, count, daemon=True):
+        """워커 프로세스 count 개를 시작한다. (fork 를 쓸 수 없는 플랫폼에서는 스레드)"""
+        if count <= 0:
+            return []
+        workers = []
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+            for index in range(count):
+                process = context.Process(target=self._worker_main, name=f'job-worker-{index}', daemon=daemon)
+                process.start()
+                workers.append(process)
+        else:
+            stop = threading.Event()
+            for index in range(count):
+                thread = threading.Thread(target=self._work_in_context, args=(stop,),
+                                          name=f'job-worker-{index}', daemon=True)
+                thread.start()
+                workers.append(thread)
+        return workers
+
+    def _work_in_context(self, stop):
+        with self.app.app_context():
+            self.work(stop)
@@ -0,0 +1,45 @@
+"""orjson 기반 JSON 프로바이더
+
+orjson 이 설치되어 있으면 jsonify()/request.get_json() 을 orjson 으로 처리하고,
+없으면 Flask 기본 프로바이더(표준 json 모듈)를 그대로 쓴다.
+응답 형식은 기본 프로바이더와 같게 맞춘다. (키 정렬, 날짜는 HTTP 날짜 형식, 끝 줄바꿈)
+단, 한글은 \\uXXXX 로 이스케이프하지 않고 UTF-8 그대로 내보낸다.
+"""
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    # datetime/date/dataclass 는 orjson 기본 변환(ISO 형식) 대신 Flask 기본 변환을 따른다
+    options = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+               | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # indent 등 orjson 이 지원하지 않는 인자는 표준 json 으로
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self.options).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if self._app.debug:
+            # 디버그 모드는 들여쓰기 출력 (기본 프로바이더)
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self.options) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app):
+    """orjson 을 쓸 수 있으면 앱의 JSON 프로바이더를 교체한다"""
+    if orjson is not None and app.config.get('JSON_USE_ORJSON', True):
+        app.json = OrjsonProvider(app)
+    return app.json
@@ -0,0 +1,322 @@
+"""회원 일괄 등록/수정/삭제 (/api/members/batch)
+
+유효한 항목을 한 트랜잭션에서 집합 단위 SQL 로 반영한다.
+- 삭제: DELETE ... WHERE id IN (...)
+- 수정: 같은 값으로 바꾸는 회원들은 UPDATE ... WHERE id IN (...), 나머지는 bulk_update_mappings
+- 등록: INSERT 한 번 (executemany)
+매퍼 이벤트를 거치지 않으므로 초성/연중 일자는 여기서 계산하고 통계 요약은 변경 전후 값으로 갱신한다.
+검색 색인과 응답 캐시는 호출하는 쪽에서 반환된 id 로 갱신한다.
+"""
+import re
+from datetime import date, datetime
+
+from member_calendar import LEAP_YEAR, day_of_year, register_day_of_year
+from member_search import hangul_initials
+from member_stats import STAT_COLUMNS
+
+# 한 요청의 등록+수정+삭제 항목 수 상한
+MAX_BATCH_SIZE = 500
+
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+# 수정할 수 있는 컬럼 (요청 키는 컬럼 이름 또는 응답 키 birthYear/birthMonth/birthDay)
+UPDATABLE_COLUMNS = ('name', 'birth_year', 'birth_month', 'birth_day', 'phone', 'gender', 'address', 'city',
+                     'state', 'zipcode', 'district', 'spouse', 'position', 'email', 'role', 'is_active')
+FIELD_ALIASES = {'birthYear': 'birth_year', 'birthMonth': 'birth_month', 'birthDay': 'birth_day'}
+INTEGER_COLUMNS = ('birth_year', 'birth_month', 'birth_day')
+BIRTH_DATE_COLUMNS = ('birth_year', 'birth_month', 'birth_day')
+# 목록 응답을 그대로 보내도 되도록 무시하는 키
+READ_ONLY_KEYS = {'id', 'photoUrl', 'photoUrls', 'spouseId', 'householdId'}
+# 수정 전 값을 읽어 둘 컬럼 (생년월일 확인, 연중 일자 재계산, 통계 요약)
+SNAPSHOT_COLUMNS = sorted({'id', 'name', 'email', 'birth_year', 'birth_month', 'birth_day', *STAT_COLUMNS})
+
+
+class InvalidMemberData(ValueError):
+    """요청 본문의 회원 값이 올바르지 않음 (메시지를 그대로 응답에 쓴다)"""
+
+
+def check_birth_date(values, current=None):
+    """values 의 생년월일(values 에 없는 값은 current 의 값)이 실제 날짜인지 확인한다.
+
+    날짜가 아니면(13월, 2/31 등) InvalidMemberData - 연중 일자를 계산할 수 없는 값이 저장되지 않도록 한다.
+    연도를 모르면 윤년 기준으로 본다. (2/29 허용)
+    """
+    if not any(column in values for column in BIRTH_DATE_COLUMNS):
+        return
+    current = current or {}
+    year, month, day = (values[column] if column in values else current.get(column)
+                        for column in BIRTH_DATE_COLUMNS)
+    try:
+        date(LEAP_YEAR if year is None else int(year), int(month), int(day))
+    except (TypeError, ValueError):
+        raise InvalidMemberData(f"생년월일이 올바른 날짜가 아닙니다: {year}-{month}-{day}") from None
+
+
+def new_member_values(data):
+    """회원 등록 요청 본문 -> Member 컬럼 값
+
+    필수 필드가 없으면 KeyError, 이메일 형식이 틀리면 InvalidMemberData
+    """
+    email = data.get('email')
+    if not email or not EMAIL_PATTERN.match(email):
+        raise InvalidMemberData("유효한 이메일 주소를 입력해주세요.")
+    values = {
+        'name': data['name'],
+        'email': email,
+        'register_date': datetime.now().date(),
+        'birth_year': int(data['birthYear']),
+        'birth_month': int(data['birthMonth']),
+        'birth_day': int(data['birthDay']),
+        'phone': data['phone'],
+        'gender': data['gender'],
+        'address': data.get('address'),
+        'city': data.get('city'),
+        'state': data.get('state'),
+        'zipcode': data.get('zipcode'),
+        'district': data.get('district'),
+        'spouse': data.get('spouse'),
+        'position': data.get('position'),
+    }
+    check_birth_date(values)
+    return values
+
+
+def update_values(data):
+    """수정 항목 -> {컬럼: 값} (수정할 수 없는 필드가 있으면 InvalidMemberData)
+
+    생년월일은 현재 값과 합쳐야 확인할 수 있으므로 check_birth_date 로 따로 확인한다.
+    """
+    values = {}
+    for key, value in data.items():
+        if key in READ_ONLY_KEYS:
+            continue
+        column = FIELD_ALIASES.get(key, key)
+        if column not in UPDATABLE_COLUMNS:
+            raise InvalidMemberData(f"수정할 수 없는 필드입니다: {key}")
+        if isinstance(value, (list, dict)):
+            raise InvalidMemberData(f"{key} 값이 올바르지 않습니다.")
+        values[column] = int(value) if column in INTEGER_COLUMNS and value is not None else value
+    if not values:
+        raise InvalidMemberData("수정할 필드가 없습니다.")
+    if 'email' in values and not (values['email'] and EMAIL_PATTERN.match(values['email'])):
+        raise InvalidMemberData("유효한 이메일 주소를 입력해주세요.")
+    if 'name' in values and not values['name']:
+        raise InvalidMemberData("이름은 비워둘 수 없습니다.")
+    return values
+
+
+def _member_id(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise InvalidMemberData("id 는 정수여야 합니다.")
+    return value
+
+
+def _column_defaults(table):
+    # executemany 는 모든 행의 키가 같아야 하므로 빠진 컬럼은 컬럼 기본값으로 채운다
+    return {column.name: column.default.arg if column.default is not None and column.default.is_scalar else None
+            for column in table.columns if not column.primary_key}
+
+
+class BatchResult:
+    """항목별 결과와 반영된 회원 id"""
+
+    def __init__(self):
+        self.items = []
+        self.created = []
+        self.updated = []
+        self.deleted = []
+        self.renamed = []  # 이름이 바뀐 회원 (검색 색인 갱신 대상)
+
+    def ok(self, op, index, member_id):
+        self.items.append({'op': op, 'index': index, 'id': member_id, 'status': 'ok'})
+
+    def error(self, op, index, message, member_id=None):
+        self.items.append({'op': op, 'index': index, 'id': member_id, 'status': 'error', 'error': message})
+
+    @property
+    def failed(self):
+        return sum(1 for item in self.items if item['status'] == 'error')
+
+    def to_dict(self):
+        order = {'delete': 0, 'update': 1, 'create': 2}
+        return {
+            'created': len(self.created),
+            'updated': len(self.updated),
+            'deleted': len(self.deleted),
+            'failed': self.failed,
+            'results': sorted(self.items, key=lambda item: (order[item['op']], item['index'])),
+        }
+
+
+def apply_member_batch(session, model, creates=(), updates=(), deletes=(), stats=None, save_photo=None,
+                       atomic=False):
+    """등록(요청 본문 목록), 수정([{'id': ..., 필드: 값}]), 삭제([id]) 를 검증하고 반영한다. (커밋하지 않는다)
+
+    잘못된 항목은 건너뛰고 결과에 오류로 남긴다. atomic=True 이면 오류가 하나라도 있을 때 아무것도
+    반영하지 않는다. (나머지 항목은 'skipped') stats 는 MemberStats, save_photo 는 base64 사진 -> 파일 이름 함수.
+    (트랜잭션이 롤백되어도 파일이 남지 않도록 호출하는 쪽에서 커밋 뒤에 저장을 마무리한다)
+    """
+    table = model.__table__
+    result = BatchResult()
+    seen_ids = set()
+
+    delete_ids = {}
+    for index, value in enumerate(deletes):
+        try:
+            member_id = _member_id(value)
+        except InvalidMemberData as e:
+            result.error('delete', index, str(e))
+            continue
+        if member_id in seen_ids:
+            result.error('delete', index, "같은 회원이 여러 번 포함되어 있습니다.", member_id)
+            continue
+        seen_ids.add(member_id)
+        delete_ids[member_id] = index
+
+    update_rows = {}
+    for index, data in enumerate(updates):
+        try:
+            if not isinstance(data, dict):
+                raise InvalidMemberData("수정 항목은 객체여야 합니다.")
+            member_id = _member_id(data.get('id'))
+            values = update_values(data)
+        except (InvalidMemberData, TypeError, ValueError) as e:
+            result.error('update', index, str(e), data.get('id') if isinstance(data, dict) else None)
+            continue
+        if member_id in seen_ids:
+            result.error('update', index, "같은 회원이 여러 번 포함되어 있습니다.", member_id)
+            continue
+        seen_ids.add(member_id)
+        update_rows[member_id] = (index, values)
+
+    create_rows = []
+    for index, data in enumerate(creates):
+        try:
+            if not isinstance(data, dict):
+                raise InvalidMemberData("등록 항목은 객체여야 합니다.")
+            values = new_member_values(data)
+        except KeyError as e:
+            result.error('create', index, f"필수 필드가 누락되었습니다: {str(e)}")
+            continue
+        except (InvalidMemberData, TypeError, ValueError) as e:
+            result.error('create', index, str(e))
+            continue
+        create_rows.append((index, data, values))
+
+    # 수정/삭제 대상의 현재 값 (없는 회원 확인, 연중 일자/통계 계산용)
+    before = {}
+    target_ids = list(delete_ids) + list(update_rows)
+    if target_ids:
+        columns = [table.c[name] for name in SNAPSHOT_COLUMNS]
+        for row in session.execute(table.select().with_only_columns(*columns).where(table.c.id.in_(target_ids))):
+            before[row.id] = dict(row._mapping)
+    for member_id, index in list(delete_ids.items()):
+        if member_id not in before:
+            result.error('delete', index, "회원을 찾을 수 없습니다.", member_id)
+            del delete_ids[member_id]
+    for member_id, (index, values) in list(update_rows.items()):
+        if member_id not in before:
+            result.error('update', index, "회원을 찾을 수 없습니다.", member_id)
+            del update_rows[member_id]
+            continue
+        # 월/일 중 하나만 바꾸는 경우도 있으므로 현재 생년월일과 합쳐서 확인
+        try:
+            check_birth_date(values, before[member_id])
+        except InvalidMemberData as e:
+            result.error('update', index, str(e), member_id)
+            del update_rows[member_id]
+
+    # 이메일 중복 - 같은 배치에서 삭제되는 회원의 이메일은 다시 쓸 수 있다
+    wanted = [('update', index, member_id, values['email']) for member_id, (index, values) in update_rows.items()
+              if 'email' in values and values['email'] != before[member_id]['email']]
+    wanted += [('create', index, None, values['email']) for index, _, values in create_rows]
+    owners = {}
+    if wanted:
+        owners = dict(session.execute(
+            table.select().with_only_columns(table.c.email, table.c.id)
+            .where(table.c.email.in_({email for *_, email in wanted}))
+        ).all())
+    # 이메일을 바꾸는 회원의 이전 이메일은 비게 된다
+    for member_id, (index, values) in update_rows.items():
+        if 'email' in values and owners.get(before[member_id]['email']) == member_id:
+            del owners[before[member_id]['email']]
+    claimed = set()
+    rejected = set()
+    for op, index, member_id, email in wanted:
+        owner = owners.get(email)
+        if (owner is not None and owner not in delete_ids) or email in claimed:
+            result.error(op, index, "이미 사용 중인 이메일 주소입니다.", member_id)
+            rejected.add((op, index))
+        claimed.add(email)
+    for member_id, (index, _) in list(update_rows.items()):
+        if ('update', index) in rejected:
+            del update_rows[member_id]
+    create_rows = [row for row in create_rows if ('create', row[0]) not in rejected]
+
+    if atomic and result.failed:
+        for member_id, index in delete_ids.items():
+            result.items.append({'op': 'delete', 'index': index, 'id': member_id, 'status': 'skipped'})
+        for member_id, (index, _) in update_rows.items():
+            result.items.append({'op': 'update', 'index': index, 'id': member_id, 'status': 'skipped'})
+        for index, _, _ in create_rows:
+            result.items.append({'op': 'create', 'index': index, 'id': None, 'status': 'skipped'})
+        return result
+
+    removed, added = [], []
+
+    if delete_ids:
+        session.execute(table.delete().where(table.c.id.in_(list(delete_ids))))
+        for member_id, index in delete_ids.items():
+            removed.append(before[member_id])
+            result.deleted.append(member_id)
+            result.ok('delete', index, member_id)
+
+    if update_rows:
+        groups = {}
+        for member_id, (index, values) in update_rows.items():
+            previous = before[member_id]
+            values = dict(values)
+            if 'name' in values:
+                values['name_initials'] = hangul_initials(values['name'])
+                if values['name'] != previous['name']:
+                    result.renamed.append(member_id)
+            if 'birth_month' in values or 'birth_day' in values:
+                values['birth_day_of_year'] = day_of_year(values.get('birth_month', previous['birth_month']),
+                                                          values.get('birth_day', previous['birth_day']))
+            groups.setdefault(tuple(sorted(values.items())), []).append(member_id)
+            removed.append(previous)
+            added.append({**previous, **values})
+            result.updated.append(member_id)
+            result.ok('update', index, member_id)
+        mappings = []
+        for items, ids in groups.items():
+            if len(ids) > 1:
+                session.execute(table.update().where(table.c.id.in_(ids)).values(dict(items)))
+            else:
+                mappings.append({'id': ids[0], **dict(items)})
+        if mappings:
+            session.bulk_update_mappings(model, mappings)
+
+    if create_rows:
+        defaults = _column_defaults(table)
+        rows = []
+        for index, data, values in create_rows:
+            if data.get('photo') and save_photo is not None:
+                values['photo'] = save_photo(data['photo'])
+            values['name_initials'] = hangul_initials(values['name'])
+            values['birth_day_of_year'] = day_of_year(values['birth_month'], values['birth_day'])
+            values['register_day_of_year'] = register_day_of_year(values['register_date'])
+            rows.append({**defaults, **values})
+        session.execute(table.insert(), rows)
+        ids = dict(session.execute(
+            table.select().with_only_columns(table.c.email, table.c.id)
+            .where(table.c.email.in_([row['email'] for row in rows]))
+        ).all())
+        for (index, _, _), row in zip(create_rows, rows):
+            result.created.append(ids[row['email']])
+            result.ok('create', index, ids[row['email']])
+            added.append(row)
+
+    if stats is not None and (removed or added):
+        stats.apply_rows(session.connection(), removed, added)
+    return result
@@ -0,0 +1,129 @@
+"""생일/등록 기념일 달력 색인
+
+Member 에 윤년(2000년) 기준 연중 일자(1~366) 컬럼을 두고 인덱스를 건다.
+- birth_day_of_year    : birth_month/birth_day
+- register_day_of_year : register_date 의 월/일 (교회 등록 기념일)
+12/28 ~ 1/3 처럼 연말을 넘는 구간은 두 개의 인덱스 범위 조건(OR)으로 조회한다.
+"오늘부터 N일" 결과는 날짜별로 프로세스 안에 캐시한다.
+- 이 프로세스에서 회원이 바뀌면 바로 비운다. (매퍼 이벤트, clear_cache())
+- generation 함수를 주면(응답 캐시의 'members' 세대 - Redis 로 워커끼리 공유) 세대가 바뀐 캐시는 쓰지 않는다.
+- 그래도 다른 워커의 변경을 놓치지 않도록 CALENDAR_CACHE_TTL 초가 지나면 다시 조회한다.
+"""
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import case, event, or_
+
+LEAP_YEAR = 2000
+MAX_UPCOMING_DAYS = 366
+DEFAULT_CACHE_TTL = 60  # 초
+
+# kind -> (연중 일자 컬럼 이름)
+CALENDAR_KINDS = {
+    'birthday': 'birth_day_of_year',
+    'registration': 'register_day_of_year',
+}
+
+
+def day_of_year(month, day):
+    """(월, 일) -> 윤년 기준 연중 일자. 2/29 는 60, 3/1 은 항상 61."""
+    try:
+        return date(LEAP_YEAR, int(month), int(day)).timetuple().tm_yday
+    except (TypeError, ValueError):
+        return None
+
+
+def register_day_of_year(register_date):
+    if register_date is None:
+        return None
+    if not isinstance(register_date, date):
+        try:
+            register_date = date.fromisoformat(str(register_date)[:10])
+        except ValueError:
+            return None
+    return day_of_year(register_date.month, register_date.day)
+
+
+def parse_month_day(value):
+    """'MM-DD' 또는 'YYYY-MM-DD' -> 연중 일자"""
+    parts = value.split('-')
+    if len(parts) == 3:
+        parts = parts[1:]
+    if len(parts) != 2:
+        return None
+    return day_of_year(*parts)
+
+
+class MemberCalendar:
+    def __init__(self, app=None, db=None, model=None, generation=None):
+        self.db = db
+        self.model = model
+        self.generation = generation
+        self.ttl = DEFAULT_CACHE_TTL
+        self._upcoming = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, db, model, generation)
+
+    def init_app(self, app, db, model, generation=None):
+        """generation: 회원이 바뀌면 달라지는 값을 돌려주는 함수 (여러 워커가 공유하는 무효화 세대)"""
+        self.db = db
+        self.model = model
+        self.generation = generation
+        self.ttl = app.config.get('CALENDAR_CACHE_TTL', DEFAULT_CACHE_TTL)
+        self._clear_cache()
+        # 앱을 여러 번 만들어도(create_app) 이벤트는 한 번만 등록
+        if not event.contains(model, 'before_insert', self._set_days_of_year):
+            event.listen(model, 'before_insert', self._set_days_of_year)
+            event.listen(model, 'before_update', self._set_days_of_year)
+            for name in ('after_insert', 'after_update', 'after_delete'):
+                event.listen(model, name, self._clear_cache)
+
+    def _set_days_of_year(self, mapper, connection, target):
+        target.birth_day_of_year = day_of_year(target.birth_month, target.birth_day)
+        target.register_day_of_year = register_day_of_year(target.register_date)
+
+    def _clear_cache(self, *args):
+        with self._lock:
+            self._upcoming.clear()
+
+    def clear_cache(self):
+        self._clear_cache()
+
+    def range_query(self, start, end, kind='birthday'):
+        """연중 일자 start~end (start > end 이면 연말을 넘는 구간) 에 해당하는 회원 쿼리"""
+        model = self.model
+        column = getattr(model, CALENDAR_KINDS[kind])
+        if start <= end:
+            condition = column.between(start, end)
+            order = [column]
+        else:
+            condition = or_(column >= start, column <= end)
+            # 올해 남은 날짜를 먼저, 그 다음 내년 초
+            order = [case((column >= start, 0), else_=1), column]
+        return model.query.filter(condition).order_by(*order, model.name, model.id)
+
+    def upcoming(self, days, kind='birthday', today=None, serializer=None):
+        """오늘부터 days 일 동안의 회원 목록 (날짜별 캐시, 회원 변경/세대 변경/TTL 로 무효화)"""
+        today = today or date.today()
+        days = max(1, min(days, MAX_UPCOMING_DAYS))
+        key = (today, days, kind)
+        generation = self.generation() if self.generation is not None else None
+        now = time.monotonic()
+        cached = self._upcoming.get(key)
+        if cached is not None and cached[0] == generation and cached[1] > now:
+            return cached[2]
+        start = day_of_year(today.month, today.day)
+        last = today + timedelta(days=days - 1)
+        end = day_of_year(last.month, last.day)
+        if days >= MAX_UPCOMING_DAYS:
+            start, end = 1, MAX_UPCOMING_DAYS
+        members = self.range_query(start, end, kind).all()
+        result = [serializer(member) for member in members] if serializer else members
+        with self._lock:
+            # 날짜가 바뀌면 이전 날짜의 캐시는 버린다
+            for stale in [k for k in self._upcoming if k[0] != today]:
+                del self._upcoming[stale]
+            self._upcoming[key] = (generation, now + self.ttl, result)
+        return result
@@ -0,0 +1,214 @@
+"""회원 변경 피드 (델타 동기화)
+
+Member.version 은 회원이 추가/수정될 때마다 새로 발급하는 전역 변경 번호이고,
+삭제된 회원은 member_tombstone(id, version) 에 남긴다.
+/api/members/changes?since=<token> 은 token(마지막으로 받은 변경 번호) 이후에 추가/수정된 회원과
+삭제된 회원 id 만 변경 번호 순으로 반환한다.
+
+변경 번호는 sync_counter 의 한 행을 UPDATE 로 증가시켜 발급한다. 그 행의 잠금이 커밋까지 유지되므로
+작은 번호의 변경이 더 늦게 커밋되어 동기화에서 빠지는 일이 없다. (SQLite 는 쓰기 자체가 직렬화된다)
+일괄 INSERT/UPDATE/DELETE 처럼 매퍼 이벤트를 거치지 않는 쓰기 뒤에는 touch()/record_deletes() 를 호출한다.
+오래된 삭제 기록은 prune() 으로 지우고, 그보다 이전 token 은 전체 재동기화를 요구한다. (ChangeTokenExpired)
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import click
+from sqlalchemy import bindparam, event, func, select
+from sqlalchemy.orm import object_session
+
+VERSION_COUNTER = 'member_version'
+# 이 번호 이하의 삭제 기록은 지워졌다 (그보다 이전 token 은 만료)
+PRUNED_COUNTER = 'member_tombstones_pruned'
+DEFAULT_CHANGES_LIMIT = 500
+MAX_CHANGES_LIMIT = 5000
+TOMBSTONE_RETENTION_DAYS = 90
+
+ChangePage = namedtuple('ChangePage', ['members', 'deleted', 'token', 'has_more'])
+
+
+class ChangeTokenExpired(Exception):
+    """since token 이 삭제 기록 보관 기간보다 오래되었거나 이 DB 에서 발급한 것이 아님"""
+
+
+def parse_token(value):
+    """since= 값 -> 변경 번호 (없으면 0 = 처음부터). 형식이 틀리면 ValueError"""
+    if not value:
+        return 0
+    version = int(value)
+    if version < 0:
+        raise ValueError(value)
+    return version
+
+
+class MemberChangeFeed:
+    def __init__(self, app=None, db=None, model=None, tombstone_model=None, counter_model=None):
+        self.db = None
+        self.model = None
+        self.tombstone_model = None
+        self.counter_model = None
+        if app is not None:
+            self.init_app(app, db, model, tombstone_model, counter_model)
+
+    def init_app(self, app, db, model, tombstone_model, counter_model):
+        self.db = db
+        self.model = model
+        self.tombstone_model = tombstone_model
+        self.counter_model = counter_model
+        # 앱을 여러 번 만들어도(create_app) 이벤트는 한 번만 등록
+        if not event.contains(model, 'before_insert', self._stamp):
+            event.listen(model, 'before_insert', self._stamp)
+            event.listen(model, 'before_update', self._stamp)
+            event.listen(model, 'after_insert', self._after_insert)
+            event.listen(model, 'after_delete', self._after_delete)
+
+        @app.cli.command('prune-member-tombstones')
+        @click.option('--days', default=TOMBSTONE_RETENTION_DAYS, show_default=True, help='보관 기간(일)')
+        def prune_member_tombstones(days):
+            count = self.prune(days)
+            print(f"Pruned {count} member tombstones older than {days} days.")
+
+    def _counter_value(self, connection, name):
+        counter = self.counter_model.__table__
+        return connection.execute(select(counter.c.value).where(counter.c.name == name)).scalar() or 0
+
+    def reserve(self, connection, count=1):
+        """변경 번호 count 개를 발급하고 마지막 번호를 반환한다. (last - count + 1 ~ last)"""
+        counter = self.counter_model.__table__
+        result = connection.execute(
+            counter.update().where(counter.c.name == VERSION_COUNTER).values(value=counter.c.value + count)
+        )
+        if result.rowcount == 0:
+            # 마이그레이션 대신 create_all 로 만든 DB
+            connection.execute(counter.insert().values(name=VERSION_COUNTER, value=count))
+            return count
+        return self._counter_value(connection, VERSION_COUNTER)
+
+    def _stamp(self, mapper, connection, target):
+        session = object_session(target)
+        if session is not None and target in session.dirty and \
+                not session.is_modified(target, include_collections=False):
+            return
+        target.version = self.reserve(connection)
+        target.updated_at = datetime.utcnow()
+
+    def _after_insert(self, mapper, connection, target):
+        # 삭제된 id 가 다시 쓰이면 이전 삭제 기록은 필요 없다
+        tombstones = self.tombstone_model.__table__
+        connection.execute(tombstones.delete().where(tombstones.c.id == target.id))
+
+    def _after_delete(self, mapper, connection, target):
+        self._write_tombstones(connection, [target.id])
+
+    def _write_tombstones(self, connection, ids):
+        tombstones = self.tombstone_model.__table__
+        last = self.reserve(connection, len(ids))
+        now = datetime.utcnow()
+        connection.execute(tombstones.delete().where(tombstones.c.id.in_(ids)))
+        connection.execute(tombstones.insert(), [
+            {'id': member_id, 'version': last - len(ids) + 1 + offset, 'deleted_at': now}
+            for offset, member_id in enumerate(ids)
+        ])
+
+    def touch(self, session, ids):
+        """매퍼 이벤트를 거치지 않고 추가/수정된 회원에 새 변경 번호를 준다."""
+        ids = list(ids)
+        if not ids:
+            return
+        connection = session.connection()
+        table = self.model.__table__
+        tombstones = self.tombstone_model.__table__
+        # 일괄 INSERT 로 삭제된 id 가 다시 쓰였으면 이전 삭제 기록을 지운다
+        connection.execute(tombstones.delete().where(tombstones.c.id.in_(ids)))
+        last = self.reserve(connection, len(ids))
+        connection.execute(
+            table.update().where(table.c.id == bindparam('member_id'))
+            .values(version=bindparam('member_version'), updated_at=datetime.utcnow()),
+            [{'member_id': member_id, 'member_version': last - len(ids) + 1 + offset}
+             for offset, member_id in enumerate(ids)]
+        )
+
+    def record_deletes(self, session, ids):
+        """매퍼 이벤트를 거치지 않고 삭제된 회원의 삭제 기록을 남긴다."""
+        ids = list(ids)
+        if ids:
+            self._write_tombstones(session.connection(), ids)
+
+    def current_version(self, connection):
+        return self._counter_value(connection, VERSION_COUNTER)
+
+    def rebase(self, connection, horizon):
+        """DB 를 통째로 바꾼 뒤(백업 복원) 호출 - horizon 이하의 token 을 모두 만료시킨다.
+
+        복원된 변경 번호는 이전 DB 에서 발급한 token 과 겹칠 수 있으므로 회원/삭제 기록/카운터의 번호를
+        horizon 만큼 뒤로 옮기고, 그 이전 token 은 ChangeTokenExpired(전체 재동기화)로 처리한다.
+        """
+        table = self.model.__table__
+        tombstones = self.tombstone_model.__table__
+        counter = self.counter_model.__table__
+        connection.execute(table.update().where(table.c.version.isnot(None))
+                           .values(version=table.c.version + horizon))
+        connection.execute(tombstones.update().values(version=tombstones.c.version + horizon))
+        for name in (VERSION_COUNTER, PRUNED_COUNTER):
+            value = self._counter_value(connection, name) + horizon
+            result = connection.execute(counter.update().where(counter.c.name == name).values(value=value))
+            if result.rowcount == 0:
+                connection.execute(counter.insert().values(name=name, value=value))
+
+    def changes(self, since, limit=DEFAULT_CHANGES_LIMIT, select_members=None):
+        """since 이후 변경을 변경 번호 순으로 최대 limit 건 -> ChangePage
+
+        select_members(query) 는 Member 쿼리를 응답용 컬럼 쿼리로 바꾸는 함수 (version 컬럼 포함)
+        since=0 이면 전체 회원(삭제 기록 제외)을 처음부터 보낸다.
+        """
+        session = self.db.session
+        connection = session.connection()
+        model = self.model
+        tombstone = self.tombstone_model
+        current = self._counter_value(connection, VERSION_COUNTER)
+        if since and (since > current or since < self._counter_value(connection, PRUNED_COUNTER)):
+            raise ChangeTokenExpired(since)
+
+        query = model.query.filter(model.version > since).order_by(model.version)
+        if select_members is not None:
+            query = select_members(query)
+        members = query.limit(limit + 1).all()
+        deleted = []
+        if since:
+            deleted = session.query(tombstone.id, tombstone.version) \
+                .filter(tombstone.version > since).order_by(tombstone.version).limit(limit + 1).all()
+
+        # 두 목록을 변경 번호 순으로 합쳐 limit 건까지
+        merged = sorted([(row.version, False, row) for row in members] +
+                        [(row.version, True, row) for row in deleted], key=lambda item: item[0])
+        page = merged[:limit]
+        members = [row for _, is_deleted, row in page if not is_deleted]
+        # 다시 쓰인 id 는 현재 행만 보낸다 (클라이언트가 삭제를 나중에 적용해도 안전하도록)
+        live_ids = {row.id for row in members}
+        return ChangePage(
+            members=members,
+            deleted=[row.id for _, is_deleted, row in page if is_deleted and row.id not in live_ids],
+            token=str(page[-1][0] if page else since),
+            has_more=len(merged) > limit,
+        )
+
+    def prune(self, days=TOMBSTONE_RETENTION_DAYS):
+        """days 일보다 오래된 삭제 기록을 지운다. 지운 건수를 반환"""
+        session = self.db.session
+        connection = session.connection()
+        tombstones = self.tombstone_model.__table__
+        counter = self.counter_model.__table__
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        horizon = connection.execute(
+            select(func.max(tombstones.c.version)).where(tombstones.c.deleted_at < cutoff)
+        ).scalar()
+        if horizon is None:
+            return 0
+        count = connection.execute(tombstones.delete().where(tombstones.c.version <= horizon)).rowcount
+        result = connection.execute(
+            counter.update().where(counter.c.name == PRUNED_COUNTER, counter.c.value < horizon).values(value=horizon)
+        )
+        if result.rowcount == 0 and self._counter_value(connection, PRUNED_COUNTER) == 0:
+            connection.execute(counter.insert().values(name=PRUNED_COUNTER, value=horizon))
+        session.commit()
+        return count
@@ -0,0 +1,282 @@
+"""가정(household)과 배우자 연결
+
+Member.spouse 는 자유 입력 이름이라 가족을 보여 주려면 관계마다 이름 검색을 해야 했다.
+- Member.spouse_id: 배우자 회원 id (서로를 가리킨다)
+- Member.household_id: 가정 id - 같은 가정의 회원을 한 번의 조인으로 읽는다
+resolve() (flask resolve-spouses) 는 spouse 이름을 (name, district) 인덱스로 같은 구역의 회원과 맞춰
+spouse_id 를 채우고, 연결된 부부를 한 가정으로 묶는다.
+- 같은 구역에 같은 이름이 여럿이면 서로를 spouse 로 적은 회원만 연결하고, 그래도 여럿이면 건너뛴다. (ambiguous)
+- 상대가 이미 다른 회원과 연결되었거나 다른 사람을 spouse 로 적었으면 건너뛴다. (conflicts)
+- spouse 이름이 바뀌어 연결된 회원 이름과 달라진 연결은 먼저 끊고 다시 맞춘다.
+spouse_id/household_id 를 바꾼 회원은 변경 번호를 새로 받는다. (델타 동기화)
+회원이 삭제되면 그 회원을 가리키던 spouse_id 를 비운다. (SQLite 는 외래 키 ON DELETE 를 적용하지 않는다)
+"""
+from collections import defaultdict
+from datetime import datetime
+
+import click
+from sqlalchemy import and_, bindparam, event, exists, func, insert, or_, select
+from sqlalchemy.orm import aliased, object_session
+
+UPDATE_CHUNK_SIZE = 10000
+
+
+def _chunks(items, size=UPDATE_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class MemberHouseholds:
+    def __init__(self, app=None, db=None, model=None, household_model=None, change_feed=None, on_change=None):
+        self.db = None
+        self.model = None
+        self.household_model = None
+        self.change_feed = None
+        self.on_change = None
+        if app is not None:
+            self.init_app(app, db, model, household_model, change_feed, on_change)
+
+    def init_app(self, app, db, model, household_model, change_feed, on_change=None):
+        """on_change: resolve() 가 회원을 바꾸고 커밋한 뒤 호출할 함수 (응답 캐시 무효화 등)"""
+        self.db = db
+        self.model = model
+        self.household_model = household_model
+        self.change_feed = change_feed
+        self.on_change = on_change
+        app.extensions['member_households'] = self
+        # 앱을 여러 번 만들어도(create_app) 이벤트는 한 번만 등록
+        if not event.contains(model, 'after_delete', self._after_delete):
+            event.listen(model, 'after_delete', self._after_delete)
+
+        @app.cli.command('resolve-spouses')
+        @click.option('--dry-run', is_flag=True, help='결과만 세고 저장하지 않는다')
+        def resolve_spouses(dry_run):
+            result = self.resolve(dry_run=dry_run)
+            print(f"{'Would link' if dry_run else 'Linked'} {result['linked']} members to their spouses "
+                  f"({result['unlinked']} stale links removed, {result['ambiguous']} ambiguous, "
+                  f"{result['unmatched']} unmatched, {result['conflicts']} conflicts), "
+                  f"{result['households']} new households.")
+
+    # 삭제
+
+    def _after_delete(self, mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            self.unlink(session, [target.id])
+
+    def unlink(self, session, ids):
+        """삭제된 회원 ids 를 배우자로 가리키던 회원의 spouse_id 를 비운다. (일괄 삭제 뒤에도 호출)"""
+        ids = list(ids)
+        if not ids:
+            return
+        table = self.model.__table__
+        connection = session.connection()
+        linked = [member_id for member_id, in connection.execute(
+            select(table.c.id).where(table.c.spouse_id.in_(ids), table.c.id.notin_(ids)))]
+        if linked:
+            connection.execute(table.update().where(table.c.id.in_(linked)).values(spouse_id=None))
+            self.change_feed.touch(session, linked)
+
+    # 배우자 연결
+
+    def resolve(self, dry_run=False):
+        """spouse 이름으로 spouse_id 와 가정을 채우고 건수 dict 를 반환한다."""
+        session = self.db.session
+        connection = session.connection()
+        table = self.model.__table__
+        changed = set()
+
+        # 1. spouse 이름과 맞지 않게 된 연결(또는 삭제된 회원을 가리키는 연결)을 끊는다
+        spouse = table.alias('spouse')
+        stale = [member_id for member_id, in connection.execute(
+            select(table.c.id)
+            .select_from(table.outerjoin(spouse, spouse.c.id == table.c.spouse_id))
+            .where(table.c.spouse_id.isnot(None),
+                   or_(spouse.c.id.is_(None), table.c.spouse.is_(None), table.c.spouse != spouse.c.name))
+        )]
+        if stale and not dry_run:
+            for chunk in _chunks(stale):
+                connection.execute(table.update().where(table.c.id.in_(chunk)).values(spouse_id=None))
+        changed.update(stale)
+
+        # 2. 아직 연결되지 않은 회원의 spouse 이름 -> 같은 구역, 같은 이름의 회원 후보
+        #    (후보는 ix_member_name_district 인덱스로 찾는다)
+        stale_ids = set(stale)
+        unlinked = table.c.spouse_id.is_(None)
+        if stale_ids:
+            unlinked = or_(unlinked, table.c.id.in_(stale_ids))
+        named = and_(table.c.spouse.isnot(None), table.c.spouse != '')
+        rows = connection.execute(
+            select(table.c.id, table.c.name, spouse.c.id, spouse.c.spouse, spouse.c.spouse_id)
+            .select_from(table.join(spouse, and_(spouse.c.name == table.c.spouse,
+                                                 spouse.c.district == table.c.district,
+                                                 spouse.c.id != table.c.id)))
+            .where(named, unlinked)
+        ).all()
+        candidates = defaultdict(list)
+        for member_id, name, spouse_id, spouse_spouse, spouse_linked in rows:
+            # dry run 은 1 에서 끊지 않았으므로 끊길 연결(후보 쪽)을 끊긴 것으로 본다
+            candidates[member_id].append((spouse_id, spouse_spouse == name, spouse_spouse,
+                                          None if spouse_id in stale_ids else spouse_linked))
+        pending = connection.execute(select(func.count()).select_from(table).where(named, unlinked)).scalar()
+
+        links = {}  # 회원 id -> 배우자 id
+        ambiguous = conflicts = 0
+        for member_id in sorted(candidates):
+            options = candidates[member_id]
+            mutual = [option for option in options if option[1]]
+            if len(mutual) == 1:
+                choice = mutual[0]
+            elif not mutual and len(options) == 1:
+                choice = options[0]
+            else:
+                ambiguous += 1
+                continue
+            spouse_id, is_mutual, spouse_spouse, spouse_linked = choice
+            if member_id in links:
+                # 상대 쪽에서 먼저 연결됨
+                if links[member_id] != spouse_id:
+                    conflicts += 1
+                continue
+            if (spouse_linked is not None and spouse_linked != member_id) or spouse_id in links or \
+                    (spouse_spouse and not is_mutual):
+                conflicts += 1
+                continue
+            links[member_id] = spouse_id
+            if spouse_linked is None:
+                links[spouse_id] = member_id
+        unmatched = max(0, pending - len(candidates))
+
+        # 3. 연결된 부부(이번에 연결한 쌍과 기존 연결)를 한 가정으로 묶는다
+        households, household_changes = self._households(connection, links, stale_ids, dry_run)
+        changed.update(links, household_changes)
+
+        if not dry_run:
+            updates = [{'member_id': member_id, 'spouse_member': spouse_id}
+                       for member_id, spouse_id in links.items()]
+            for chunk in _chunks(updates):
+                connection.execute(
+                    table.update().where(table.c.id == bindparam('member_id'))
+                    .values(spouse_id=bindparam('spouse_member')),
+                    chunk
+                )
+            for chunk in _chunks(sorted(changed)):
+                self.change_feed.touch(session, chunk)
+            session.commit()
+            # Core UPDATE 는 매퍼 이벤트를 거치지 않으므로 캐시를 직접 무효화한다
+            if changed and self.on_change is not None:
+                self.on_change()
+        else:
+            session.rollback()
+        return {
+            'linked': len(links),
+            'unlinked': len(stale),
+            'ambiguous': ambiguous,
+            'unmatched': unmatched,
+            'conflicts': conflicts,
+            'households': households,
+        }
+
+    def _households(self, connection, links, stale_ids, dry_run):
+        """부부를 같은 가정으로 묶는다 -> (새로 만든 가정 수, household_id 가 바뀐 회원 id 목록)"""
+        table = self.model.__table__
+        households = self.household_model.__table__
+        # 기존 연결 + 이번 연결 (회원 id -> 배우자 id)
+        pairs = {member_id: spouse_id for member_id, spouse_id in connection.execute(
+            select(table.c.id, table.c.spouse_id).where(table.c.spouse_id.isnot(None))
+        ) if member_id not in stale_ids}
+        pairs.update(links)
+        member_ids = set(pairs) | set(pairs.values())
+        current = {}
+        names = {}
+        for chunk in _chunks(sorted(member_ids)):
+            for member_id, name, household_id in connection.execute(
+                    select(table.c.id, table.c.name, table.c.household_id).where(table.c.id.in_(chunk))):
+                current[member_id] = household_id
+                names[member_id] = name
+
+        assignments = {}  # 회원 id -> 가정 id
+        new_households = []  # [(가정 이름, [회원 id, ...])]
+        for member_id, spouse_id in sorted(pairs.items()):
+            if member_id > spouse_id and pairs.get(spouse_id) == member_id:
+                # 서로 가리키는 쌍은 한 번만
+                continue
+            first, second = current.get(member_id), current.get(spouse_id)
+            if first is None and second is None:
+                new_households.append((f"{names.get(member_id, '')} 가정", [member_id, spouse_id]))
+            elif first is None:
+                assignments[member_id] = second
+            elif second is None:
+                assignments[spouse_id] = first
+            # 이미 각자 다른 가정이면 그대로 둔다
+
+        if new_households and not dry_run:
+            now = datetime.utcnow()
+            for chunk in _chunks(new_households):
+                ids = connection.execute(
+                    insert(households).returning(households.c.id, sort_by_parameter_order=True),
+                    [{'name': name, 'created_at': now} for name, _ in chunk]
+                ).scalars().all()
+                for household_id, (_, members) in zip(ids, chunk):
+                    for member_id in members:
+                        assignments[member_id] = household_id
+        elif new_households:
+            for _, members in new_households:
+                assignments.update((member_id, None) for member_id in members)
+
+        if assignments and not dry_run:
+            updates = [{'member_id': member_id, 'household': household_id}
+                       for member_id, household_id in assignments.items()]
+            for chunk in _chunks(updates):
+                connection.execute(
+                    table.update().where(table.c.id == bindparam('member_id'))
+                    .values(household_id=bindparam('household')),
+                    chunk
+                )
+        return len(new_households), list(assignments)
+
+    # 조회
+
+    def household_of(self, member_id, columns):
+        """회원과 같은 가정의 회원(가정이 없으면 본인과 배우자) 을 한 번의 조인으로 읽는다.
+
+        columns 는 Member 컬럼 목록 -> [(columns..., 가정 id, 가정 이름)] (회원이 없으면 빈 목록)
+        """
+        model = self.model
+        household = self.household_model
+        me = aliased(model)
+        return self.db.session.query(*columns, household.id, household.name) \
+            .select_from(me) \
+            .join(model, or_(model.id == me.id,
+                             model.id == me.spouse_id,
+                             and_(me.household_id.isnot(None), model.household_id == me.household_id))) \
+            .outerjoin(household, household.id == me.household_id) \
+            .filter(me.id == member_id) \
+            .order_by(model.id != me.id, model.birth_year, model.id) \
+            .all()
+
+    def households(self, columns, district=None, page=1, per_page=20):
+        """가정 목록 한 페이지와 각 가정의 회원을 한 번의 조인으로 읽는다.
+
+        -> ([(columns..., 가정 id, 가정 이름)], 다음 페이지가 있는지)
+        district 를 주면 그 구역 회원이 있는 가정만
+        """
+        model = self.model
+        household = self.household_model
+        page_query = select(household.id).order_by(household.id)
+        if district:
+            page_query = page_query.where(
+                exists().where(model.household_id == household.id, model.district == district))
+        # 다음 페이지 확인용으로 한 가정 더 읽는다
+        page_ids = page_query.limit(per_page + 1).offset((page - 1) * per_page).subquery()
+        rows = self.db.session.query(*columns, household.id, household.name) \
+            .select_from(page_ids) \
+            .join(household, household.id == page_ids.c.id) \
+            .join(model, model.household_id == household.id) \
+            .order_by(household.id, model.birth_year, model.id) \
+            .all()
+        household_ids = list(dict.fromkeys(row[-2] for row in rows))
+        if len(household_ids) > per_page:
+            last = household_ids[per_page]
+            return [row for row in rows if row[-2] != last], True
+        return rows, False
@@ -0,0 +1,197 @@
+import re
+from datetime import date, datetime
+
+import pandas as pd
+from sqlalchemy import select
+
+from member_calendar import day_of_year, register_day_of_year
+from member_search import hangul_initials
+
+# 한 번에 처리할 CSV 행 수 (청크마다 별도 트랜잭션으로 커밋)
+IMPORT_CHUNK_SIZE = 1000
+
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+# 신규 회원 등록 시 반드시 있어야 하는 컬럼 (register_date 는 없으면 오늘 날짜)
+REQUIRED_COLUMNS = ('name', 'birth_year', 'birth_month', 'birth_day', 'phone', 'email')
+
+# CSV 로 가져올 수 있는 컬럼 - id, password_hash 와 서버가 관리하는 컬럼(변경 번호, 배우자/가정 연결,
+# 초성/연중 일자)은 CSV 에 있어도 무시한다
+IMPORTABLE_COLUMNS = ('register_date', 'name', 'birth_year', 'birth_month', 'birth_day', 'phone', 'address',
+                      'city', 'state', 'zipcode', 'district', 'photo', 'gender', 'spouse', 'position', 'email',
+                      'role', 'is_active')
+
+
+def importable_columns(model):
+    return [column for column in IMPORTABLE_COLUMNS if column in model.__table__.columns]
+
+
+def _clean_value(value):
+    # pandas NaN/NaT -> None, numpy 스칼라 -> 파이썬 기본 타입
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        # 'YYYY-MM-DD' 이외 형식만 느린 pandas 파서로 처리
+        return pd.to_datetime(str(value)).date()
+
+
+def _normalize_row(record, columns):
+    row = {}
+    for column in columns:
+        if column in record:
+            row[column] = _clean_value(record[column])
+    if row.get('email'):
+        row['email'] = str(row['email']).strip()
+    if row.get('name') is not None:
+        row['name'] = str(row['name'])
+        row['name_initials'] = hangul_initials(row['name'])
+    if row.get('register_date') is not None:
+        row['register_date'] = _parse_date(row['register_date'])
+    for column in ('birth_year', 'birth_month', 'birth_day'):
+        if row.get(column) is not None:
+            row[column] = int(row[column])
+    # 일괄 INSERT/UPDATE 는 매퍼 이벤트를 거치지 않으므로 연중 일자를 여기서 계산
+    if row.get('birth_month') is not None and row.get('birth_day') is not None:
+        row['birth_day_of_year'] = day_of_year(row['birth_month'], row['birth_day'])
+    if row.get('register_date') is not None:
+        row['register_day_of_year'] = register_day_of_year(row['register_date'])
+    for column in ('phone', 'zipcode'):
+        if row.get(column) is not None:
+            row[column] = str(row[column])
+    return row
+
+
+def _insert_new_rows(session, model, rows):
+    """신규 행 일괄 삽입 - SQLite/PostgreSQL 은 INSERT ... ON CONFLICT 로 동시 등록과의 충돌을 흡수"""
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        # executemany 는 모든 행의 키가 같아야 하므로 컬럼 집합을 맞춘다
+        keys = sorted({key for row in rows for key in row})
+        params = [{key: row.get(key) for key in keys} for row in rows]
+        stmt = insert(model.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.__table__.c.email],
+            set_={key: stmt.excluded[key] for key in keys if key != 'email'}
+        )
+        session.execute(stmt, params)
+    else:
+        session.bulk_insert_mappings(model, rows)
+
+
+def import_chunk(session, model, records, columns):
+    """CSV 한 청크를 처리하고 inserted/updated/rejected 건수를 반환한다.
+
+    청크의 이메일은 IN 쿼리 한 번으로 미리 조회하고, 기존 회원은
+    bulk_update_mappings, 신규 회원은 일괄 INSERT 로 반영한다.
+    """
+    result = {'inserted': 0, 'updated': 0, 'rejected': 0, 'errors': [], 'emails': []}
+    rows_by_email = {}
+    for offset, record in records:
+        try:
+            row = _normalize_row(record, columns)
+        except (TypeError, ValueError) as e:
+            result['rejected'] += 1
+            result['errors'].append({'row': offset, 'error': str(e)})
+            continue
+        email = row.get('email')
+        if not email or not EMAIL_PATTERN.match(email):
+            result['rejected'] += 1
+            result['errors'].append({'row': offset, 'error': '유효하지 않은 이메일 주소입니다.'})
+            continue
+        if email in rows_by_email:
+            # 같은 청크 안의 중복 이메일은 마지막 행으로 덮어쓴다
+            result['rejected'] += 1
+            result['errors'].append({'row': rows_by_email[email][0], 'error': '중복된 이메일 주소입니다.'})
+        rows_by_email[email] = (offset, row)
+
+    if not rows_by_email:
+        return result
+
+    existing = dict(session.execute(
+        select(model.email, model.id).where(model.email.in_(list(rows_by_email)))
+    ).all())
+
+    inserts, updates = [], []
+    for email, (offset, row) in rows_by_email.items():
+        if email in existing:
+            # 비어 있는 필수 값으로 기존 데이터를 덮어쓰지 않는다
+            for column in REQUIRED_COLUMNS + ('register_date',):
+                if column in row and row[column] is None:
+                    del row[column]
+            row['id'] = existing[email]
+            updates.append(row)
+            continue
+        missing = [column for column in REQUIRED_COLUMNS if row.get(column) is None]
+        if missing:
+            result['rejected'] += 1
+            result['errors'].append({'row': offset, 'error': f"필수 필드가 누락되었습니다: {', '.join(missing)}"})
+            continue
+        row.setdefault('register_date', None)
+        if row['register_date'] is None:
+            row['register_date'] = date.today()
+        inserts.append(row)
+
+    try:
+        _insert_new_rows(session, model, inserts)
+        if updates:
+            session.bulk_update_mappings(model, updates)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        result['rejected'] += len(inserts) + len(updates)
+        result['errors'].append({'row': None, 'error': str(e)})
+        return result
+
+    result['inserted'] = len(inserts)
+    result['updated'] = len(updates)
+    result['emails'] = [row['email'] for row in inserts] + [email for email in rows_by_email if email in existing]
+    return result
+
+
+def import_members_csv(stream, session, model, chunk_size=IMPORT_CHUNK_SIZE, after_chunk=None, progress=None):
+    """CSV 스트림을 chunk_size 행씩 읽어 회원 테이블에 반영하고 청크별 결과 목록을 반환한다.
+
+    after_chunk(session, emails) 는 청크가 커밋된 뒤 반영된 이메일 목록으로 호출된다.
+    (일괄 INSERT/UPDATE 는 매퍼 이벤트를 거치지 않으므로 검색 색인 등은 여기서 갱신한다)
+    progress(처리한 행 수) 는 청크마다 호출되며, 예외를 발생시키면 남은 청크를 건너뛴다.
+    """
+    allowed = set(importable_columns(model))
+    chunks = []
+    reader = pd.read_csv(stream, chunksize=chunk_size, encoding='utf-8', dtype={'phone': str, 'zipcode': str})
+    start = 0
+    for index, frame in enumerate(reader):
+        columns = [column for column in frame.columns if column in allowed]
+        records = [(start + i, record) for i, record in enumerate(frame.to_dict('records'))]
+        result = import_chunk(session, model, records, columns)
+        result['chunk'] = index
+        emails = result.pop('emails')
+        if after_chunk is not None and emails:
+            after_chunk(session, emails)
+        chunks.append(result)
+        start += len(frame)
+        if progress is not None:
+            progress(start)
+    return chunks
@@ -0,0 +1,198 @@
+"""회원 이름 검색 인덱스
+
+- SQLite: FTS5 가상 테이블(member_search)에 이름과 초성의 모든 접미사를 토큰으로 넣고
+  접두어 MATCH 로 부분 문자열 검색을 인덱스만으로 처리한다.
+- PostgreSQL: pg_trgm GIN 인덱스(name, name_initials)를 사용한다.
+- 그 외 DB: LIKE 검색으로 동작한다.
+
+Member 의 insert/update/delete 는 SQLAlchemy 매퍼 이벤트로 인덱스에 반영되고,
+일괄 INSERT 처럼 이벤트를 거치지 않는 쓰기는 index_members() 로 직접 반영한다.
+"""
+from sqlalchemy import event, text
+
+SEARCH_TABLE = 'member_search'
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# 초성 (호환용 자모 - 키보드로 입력되는 문자)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+
+
+def hangul_initials(text_value):
+    """'김철수' -> 'ㄱㅊㅅ' (한글 음절 이외의 문자는 그대로 둔다)"""
+    if not text_value:
+        return text_value
+    result = []
+    for char in text_value:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSEONG[(code - HANGUL_BASE) // (JUNGSEONG_COUNT * JONGSEONG_COUNT)])
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def has_initials(query):
+    return any(char in CHOSEONG for char in query)
+
+
+def search_tokens(name):
+    # 단어마다 모든 접미사를 토큰으로 만들어 '철수'* 같은 접두어 검색이 부분 문자열 검색이 되도록 한다
+    tokens = []
+    for word in (name or '').lower().split():
+        for source in {word, hangul_initials(word)}:
+            tokens.extend(source[i:] for i in range(len(source)))
+    return ' '.join(tokens)
+
+
+def fts_query(query):
+    # 사용자 입력을 FTS5 구문으로 안전하게 변환: 단어마다 "단어"* (AND)
+    words = query.lower().split()
+    return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+def create_fts_table(connection):
+    connection.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+        "USING fts5(tokens, tokenize='unicode61', prefix='1 2')"
+    ))
+
+
+class MemberSearchIndex:
+    def __init__(self, app=None, db=None, model=None):
+        self.db = db
+        self.model = model
+        self._fts_ready = None
+        if app is not None:
+            self.init_app(app, db, model)
+
+    def init_app(self, app, db, model):
+        self.db = db
+        self.model = model
+        # 새 앱은 다른 DB 를 쓸 수 있으므로 FTS 테이블 확인을 다시 한다
+        self._fts_ready = None
+        # 앱을 여러 번 만들어도(create_app) 이벤트는 한 번만 등록
+        if not event.contains(model, 'after_insert', self._after_write):
+            event.listen(model, 'before_insert', self._set_initials)
+            event.listen(model, 'before_update', self._set_initials)
+            event.listen(model, 'after_insert', self._after_write)
+            event.listen(model, 'after_update', self._after_write)
+            event.listen(model, 'after_delete', self._after_delete)
+
+        @app.cli.command('rebuild-search-index')
+        def rebuild_search_index():
+            count = self.rebuild()
+            print(f"Indexed {count} members for search.")
+
+    def _set_initials(self, mapper, connection, target):
+        target.name_initials = hangul_initials(target.name)
+
+    def fts_available(self, connection):
+        if connection.dialect.name != 'sqlite':
+            return False
+        if self._fts_ready is None:
+            exists = connection.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+            ), {'name': SEARCH_TABLE}).first()
+            if exists:
+                self._fts_ready = True
+            else:
+                try:
+                    create_fts_table(connection)
+                except Exception:
+                    # FTS5 없이 빌드된 SQLite 는 LIKE 검색으로 대체
+                    self._fts_ready = False
+                    return False
+                # migrate 대신 create_all 로 만든 DB 는 처음 사용할 때 기존 회원을 색인한다
+                rows = connection.execute(text("SELECT id, name FROM member")).all()
+                if rows:
+                    self._write_rows(connection, rows)
+                # 이 트랜잭션이 롤백되면 테이블도 사라지므로 다음 호출에서 다시 확인한다
+                return True
+        return self._fts_ready
+
+    def _after_write(self, mapper, connection, target):
+        if self.fts_available(connection):
+            self._write_rows(connection, [(target.id, target.name)])
+
+    def _after_delete(self, mapper, connection, target):
+        if self.fts_available(connection):
+            connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"), {'id': target.id})
+
+    def _write_rows(self, connection, rows):
+        ids = [{'id': member_id} for member_id, _ in rows]
+        if not ids:
+            return
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"), ids)
+        connection.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} (rowid, tokens) VALUES (:id, :tokens)"),
+            [{'id': member_id, 'tokens': search_tokens(name)} for member_id, name in rows]
+        )
+
+    def index_members(self, session, ids):
+        """매퍼 이벤트를 거치지 않은 일괄 쓰기 후 해당 회원들을 다시 색인한다."""
+        connection = session.connection()
+        if not ids or not self.fts_available(connection):
+            return
+        model = self.model
+        rows = session.query(model.id, model.name).filter(model.id.in_(list(ids))).all()
+        self._write_rows(connection, rows)
+        missing = set(ids) - {member_id for member_id, _ in rows}
+        if missing:
+            connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"),
+                               [{'id': member_id} for member_id in missing])
+
+    def rebuild(self):
+        session = self.db.session
+        connection = session.connection()
+        model = self.model
+        # name_initials 는 매퍼 이벤트 이전에 등록된 회원을 위해 함께 채운다
+        rows = session.query(model.id, model.name, model.name_initials).all()
+        stale = [{'id': member_id, 'name_initials': hangul_initials(name)}
+                 for member_id, name, initials in rows if initials != hangul_initials(name)]
+        if stale:
+            session.bulk_update_mappings(model, stale)
+        if self.fts_available(connection):
+            connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+            self._write_rows(connection, [(member_id, name) for member_id, name, _ in rows])
+        session.commit()
+        return len(rows)
+
+    def search(self, query, limit=DEFAULT_SEARCH_LIMIT):
+        """이름 또는 초성으로 검색하여 관련도 순으로 최대 limit 명의 회원을 반환한다."""
+        query = (query or '').strip()
+        if not query:
+            return []
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        model = self.model
+        session = self.db.session
+        connection = session.connection()
+        initials = hangul_initials(query)
+
+        if self.fts_available(connection):
+            # 정확히 일치 > 이름 접두어 > 초성 일치 > 부분 일치, 같은 순위는 짧은 이름 우선
+            ids = [row[0] for row in connection.execute(text(
+                f"SELECT m.id FROM {SEARCH_TABLE} s JOIN member m ON m.id = s.rowid "
+                f"WHERE {SEARCH_TABLE} MATCH :match "
+                "ORDER BY CASE WHEN m.name = :query THEN 0 "
+                "WHEN substr(m.name, 1, length(:query)) = :query THEN 1 "
+                "WHEN m.name_initials = :initials THEN 2 ELSE 3 END, length(m.name), m.name "
+                "LIMIT :limit"
+            ), {'match': fts_query(query if not has_initials(query) else initials),
+                'query': query, 'initials': initials, 'limit': limit})]
+            members = {member.id: member for member in model.query.filter(model.id.in_(ids))} if ids else {}
+            return [members[member_id] for member_id in ids if member_id in members]
+
+        if has_initials(query):
+            condition = model.name_initials.contains(initials, autoescape=True)
+        else:
+            condition = model.name.contains(query, autoescape=True)
+        if connection.dialect.name == 'postgresql':
+            order = [self.db.func.similarity(model.name, query).desc(), model.name]
+        else:
+            order = [self.db.func.length(model.name), model.name]
+        return model.query.filter(condition).order_by(*order).limit(limit).all()
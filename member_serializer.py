@@ -0,0 +1,115 @@
+"""회원 목록 직렬화
+
+목록 응답에 필요한 컬럼만 튜플로 조회하고(ORM 객체를 만들지 않는다),
+사진 URL 은 요청마다 한 번 계산한 기준 URL 에 파일 이름을 붙여 만든다. (행마다 url_for 를 호출하지 않는다)
+응답 형식은 Member.to_dict() + photoUrl 과 같다.
+
+fields= (JSON:API sparse fieldsets) 로 응답 키를 고르면 그 키에 필요한 컬럼만 조회한다.
+예: fields=name,phone,district -> SELECT member.id, member.name, member.phone, member.district
+"""
+from urllib.parse import quote
+
+from flask import url_for
+
+# 응답 키 -> Member 컬럼 (Member.to_dict() 와 같은 순서)
+MEMBER_LIST_FIELDS = (
+    ('id', 'id'),
+    ('name', 'name'),
+    ('birthYear', 'birth_year'),
+    ('birthMonth', 'birth_month'),
+    ('birthDay', 'birth_day'),
+    ('phone', 'phone'),
+    ('gender', 'gender'),
+    ('address', 'address'),
+    ('city', 'city'),
+    ('state', 'state'),
+    ('zipcode', 'zipcode'),
+    ('district', 'district'),
+    ('spouse', 'spouse'),
+    ('spouseId', 'spouse_id'),
+    ('householdId', 'household_id'),
+    ('position', 'position'),
+    ('email', 'email'),
+    ('role', 'role'),
+    ('is_active', 'is_active'),
+)
+# 사진 URL 키는 photo 컬럼으로 만든다
+PHOTO_URL_FIELDS = ('photoUrls', 'photoUrl')
+MEMBER_LIST_FIELD_NAMES = tuple(key for key, _ in MEMBER_LIST_FIELDS) + PHOTO_URL_FIELDS
+_FIELD_COLUMNS = dict(MEMBER_LIST_FIELDS)
+PHOTO_URL_ENDPOINT = 'main.uploaded_file'
+_PLACEHOLDER = 'x'
+
+
+class MemberSerializer:
+    def __init__(self, app=None, model=None, photo_store=None):
+        self.model = None
+        self.photo_store = None
+        if app is not None:
+            self.init_app(app, model, photo_store)
+
+    def init_app(self, app, model, photo_store):
+        self.model = model
+        self.photo_store = photo_store
+        app.extensions['member_serializer'] = self
+
+    @staticmethod
+    def parse_fields(value, allowed=MEMBER_LIST_FIELD_NAMES):
+        """'name,phone' -> ('id', 'name', 'phone') (id 는 항상 포함, 없으면 allowed 전체)
+
+        허용되지 않는 키가 있으면 ValueError
+        """
+        if not value:
+            return tuple(allowed)
+        requested = [key.strip() for key in value.split(',') if key.strip()]
+        unknown = [key for key in requested if key not in allowed]
+        if unknown:
+            raise ValueError(f"선택할 수 없는 필드입니다: {', '.join(unknown)} (가능한 필드: {', '.join(allowed)})")
+        # 중복 제거, 응답 키 순서는 allowed 순서
+        return tuple(key for key in allowed if key == 'id' or key in requested)
+
+    @staticmethod
+    def _column_names(fields):
+        names = [_FIELD_COLUMNS[key] for key in fields if key in _FIELD_COLUMNS]
+        if any(key in PHOTO_URL_FIELDS for key in fields):
+            names.append('photo')
+        return names
+
+    def columns(self, fields=MEMBER_LIST_FIELD_NAMES, extra=()):
+        """fields 응답에 필요한 컬럼 (extra: 커서 인코딩 등에 함께 필요한 컬럼 이름)"""
+        names = self._column_names(fields)
+        names += [name for name in extra if name not in names]
+        return [getattr(self.model, name) for name in names]
+
+    def select(self, query, fields=MEMBER_LIST_FIELD_NAMES, extra=()):
+        # Member.query (필터/정렬 포함) 를 필요한 컬럼만 읽는 쿼리로 바꾼다
+        return query.with_entities(*self.columns(fields, extra))
+
+    @staticmethod
+    def photo_base_url():
+        # '/uploads/x' -> '/uploads/' (요청마다 한 번만 url_for 호출)
+        url = url_for(PHOTO_URL_ENDPOINT, filename=_PLACEHOLDER, _external=True)
+        return url[:-len(_PLACEHOLDER)]
+
+    def serialize(self, rows, fields=MEMBER_LIST_FIELD_NAMES):
+        """컬럼 튜플(Row) 목록 -> 응답 dict 목록 (rows 는 select() 와 같은 fields 로 조회한 것)"""
+        keys = [key for key in fields if key in _FIELD_COLUMNS]
+        photo_urls = 'photoUrls' in fields
+        photo_url = 'photoUrl' in fields
+        if not (photo_urls or photo_url):
+            return [dict(zip(keys, row)) for row in rows]
+
+        base = self.photo_base_url()
+        variants = self.photo_store.variants
+        photo_index = len(keys)
+        items = []
+        for row in rows:
+            item = dict(zip(keys, row))
+            photo = row[photo_index]
+            if photo_urls:
+                item['photoUrls'] = {variant: base + quote(name) for variant, name in variants(photo).items()} \
+                    if photo else None
+            if photo_url:
+                item['photoUrl'] = base + quote(photo) if photo else None
+            items.append(item)
+        return items
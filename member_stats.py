@@ -0,0 +1,202 @@
+"""회원 통계 요약 테이블
+
+member_stat(dimension, bucket, count) 에 항목별 회원 수를 미리 집계해 두고,
+Member 의 insert/update/delete 매퍼 이벤트에서 해당 버킷만 +1/-1 한다.
+통계 API 는 요약 테이블만 읽으므로 회원 수와 관계없이 일정한 비용으로 응답한다.
+"""
+from collections import Counter, namedtuple
+from datetime import date
+
+from sqlalchemy import event, func, inspect, select
+
+Dimension = namedtuple('Dimension', ['name', 'columns', 'bucket'])
+
+
+def _text(value):
+    return '' if value is None else str(value)
+
+
+def _birth_decade(birth_year):
+    return '' if birth_year is None else str(int(birth_year) // 10 * 10)
+
+
+def _register_year(register_date):
+    if register_date is None:
+        return ''
+    return str(register_date.year) if isinstance(register_date, date) else str(register_date)[:4]
+
+
+def _register_month(register_date):
+    if register_date is None:
+        return ''
+    return register_date.strftime('%Y-%m') if isinstance(register_date, date) else str(register_date)[:7]
+
+
+# 항목 이름, 집계에 필요한 Member 컬럼, 컬럼 값 -> 버킷 문자열
+DIMENSIONS = [
+    Dimension('gender', ('gender',), _text),
+    Dimension('district', ('district',), _text),
+    Dimension('position', ('position',), _text),
+    Dimension('role', ('role',), _text),
+    Dimension('birth_decade', ('birth_year',), _birth_decade),
+    Dimension('birth_month', ('birth_month',), _text),
+    Dimension('register_year', ('register_date',), _register_year),
+    Dimension('register_month', ('register_date',), _register_month),
+]
+DIMENSION_NAMES = [dimension.name for dimension in DIMENSIONS]
+# 버킷 계산에 필요한 Member 컬럼
+STAT_COLUMNS = sorted({column for dimension in DIMENSIONS for column in dimension.columns})
+
+
+def bucket_key(bucket):
+    # 숫자 버킷은 숫자 순서로, 값이 없는 버킷('')은 맨 뒤로
+    if bucket == '':
+        return (2, 0, '')
+    try:
+        return (0, int(bucket), '')
+    except ValueError:
+        return (1, 0, bucket)
+
+
+def summarize(connection, member_table):
+    """SQL GROUP BY 로 항목별 회원 수를 계산한다. {(dimension, bucket): count}"""
+    counts = Counter()
+    for dimension in DIMENSIONS:
+        columns = [member_table.c[name] for name in dimension.columns]
+        rows = connection.execute(select(*columns, func.count()).group_by(*columns))
+        for row in rows:
+            counts[(dimension.name, dimension.bucket(*row[:-1]))] += row[-1]
+    return counts
+
+
+class MemberStats:
+    def __init__(self, app=None, db=None, model=None, stat_model=None):
+        self.db = db
+        self.model = model
+        self.stat_model = stat_model
+        if app is not None:
+            self.init_app(app, db, model, stat_model)
+
+    def init_app(self, app, db, model, stat_model):
+        self.db = db
+        self.model = model
+        self.stat_model = stat_model
+        # 앱을 여러 번 만들어도(create_app) 이벤트는 한 번만 등록
+        if not event.contains(model, 'after_insert', self._after_insert):
+            event.listen(model, 'after_insert', self._after_insert)
+            event.listen(model, 'after_update', self._after_update)
+            event.listen(model, 'after_delete', self._after_delete)
+
+        @app.cli.command('rebuild-member-stats')
+        def rebuild_member_stats():
+            self.rebuild()
+            print("Member statistics rebuilt.")
+
+    def _buckets(self, values):
+        return {dimension.name: dimension.bucket(*[values[column] for column in dimension.columns])
+                for dimension in DIMENSIONS}
+
+    def _current_values(self, target):
+        return {column: getattr(target, column) for dimension in DIMENSIONS for column in dimension.columns}
+
+    def _previous_values(self, target):
+        state = inspect(target)
+        values = {}
+        for column in self._current_values(target):
+            history = state.attrs[column].history
+            values[column] = history.deleted[0] if history.deleted else getattr(target, column)
+        return values
+
+    def _after_insert(self, mapper, connection, target):
+        self.apply(connection, Counter({(name, bucket): 1 for name, bucket in
+                                        self._buckets(self._current_values(target)).items()}))
+
+    def _after_delete(self, mapper, connection, target):
+        self.apply(connection, Counter({(name, bucket): -1 for name, bucket in
+                                        self._buckets(self._previous_values(target)).items()}))
+
+    def _after_update(self, mapper, connection, target):
+        before = self._buckets(self._previous_values(target))
+        after = self._buckets(self._current_values(target))
+        delta = Counter()
+        for name in DIMENSION_NAMES:
+            if before[name] != after[name]:
+                delta[(name, before[name])] -= 1
+                delta[(name, after[name])] += 1
+        if delta:
+            self.apply(connection, delta)
+
+    def apply_rows(self, connection, removed=(), added=()):
+        """매퍼 이벤트를 거치지 않은 일괄 쓰기를 반영한다. (행 값: {컬럼: 값}, STAT_COLUMNS 포함)
+
+        removed 는 삭제/수정 전 행 값, added 는 추가/수정 후 행 값
+        """
+        delta = Counter()
+        for values in removed:
+            for name, bucket in self._buckets(values).items():
+                delta[(name, bucket)] -= 1
+        for values in added:
+            for name, bucket in self._buckets(values).items():
+                delta[(name, bucket)] += 1
+        self.apply(connection, delta)
+
+    def apply(self, connection, delta):
+        """{(dimension, bucket): 증감} 을 요약 테이블에 원자적으로 더한다."""
+        table = self.stat_model.__table__
+        params = [{'dimension': name, 'bucket': bucket, 'count': change}
+                  for (name, bucket), change in delta.items() if change]
+        if not params:
+            return
+        dialect = connection.dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.dimension, table.c.bucket],
+                set_={'count': table.c.count + stmt.excluded['count']}
+            )
+            connection.execute(stmt, params)
+        else:
+            for param in params:
+                result = connection.execute(
+                    table.update()
+                    .where(table.c.dimension == param['dimension'], table.c.bucket == param['bucket'])
+                    .values(count=table.c.count + param['count'])
+                )
+                if result.rowcount == 0:
+                    connection.execute(table.insert().values(**param))
+        if any(param['count'] < 0 for param in params):
+            connection.execute(table.delete().where(table.c.count <= 0))
+
+    def rebuild(self):
+        """요약 테이블을 GROUP BY 결과로 다시 만든다. (일괄 가져오기 등 이벤트를 거치지 않는 쓰기 후)"""
+        session = self.db.session
+        connection = session.connection()
+        table = self.stat_model.__table__
+        counts = summarize(connection, self.model.__table__)
+        connection.execute(table.delete())
+        if counts:
+            connection.execute(table.insert(), [
+                {'dimension': name, 'bucket': bucket, 'count': count}
+                for (name, bucket), count in counts.items() if count
+            ])
+        session.commit()
+
+    def get(self, dimensions=None, live=False):
+        """{dimension: [{'key': 버킷, 'count': 회원 수}, ...]} - live=True 이면 Member 를 직접 집계"""
+        dimensions = dimensions or DIMENSION_NAMES
+        if live:
+            counts = summarize(self.db.session.connection(), self.model.__table__)
+            rows = [(name, bucket, count) for (name, bucket), count in counts.items()
+                    if name in dimensions and count]
+        else:
+            stat = self.stat_model
+            rows = self.db.session.query(stat.dimension, stat.bucket, stat.count) \
+                .filter(stat.dimension.in_(dimensions)).all()
+        result = {name: [] for name in dimensions}
+        for name, bucket, count in sorted(rows, key=lambda row: (row[0], bucket_key(row[1]))):
+            result[name].append({'key': bucket or None, 'count': count})
+        return result
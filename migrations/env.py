@@ -51,6 +51,17 @@ def get_metadata():
     return target_db.metadata
 
 
+# 모델에 없고 마이그레이션이 직접 만드는 테이블 (SQLite FTS5 검색 색인과 그 shadow 테이블)
+EXCLUDED_TABLE_PREFIXES = ('member_search',)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """autogenerate/check 가 DB 에만 있는 FTS 테이블을 지우려 하지 않도록 제외한다."""
+    if type_ == 'table' and reflected and compare_to is None and name.startswith(EXCLUDED_TABLE_PREFIXES):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +76,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +105,8 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
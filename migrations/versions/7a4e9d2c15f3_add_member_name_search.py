@@ -0,0 +1,81 @@
+"""Add member name search
+
+Revision ID: 7a4e9d2c15f3
+Revises: 3f9c2a7d41b6
+Create Date: 2026-10-18 14:05:47.215630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4e9d2c15f3'
+down_revision = '3f9c2a7d41b6'
+branch_labels = None
+depends_on = None
+
+# 이 리비전 시점의 member_search 모듈 내용 (앱 코드가 바뀌어도 마이그레이션 결과가 같도록 복사해 둔다)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+
+
+def hangul_initials(text_value):
+    if not text_value:
+        return text_value
+    result = []
+    for char in text_value:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSEONG[(code - HANGUL_BASE) // (JUNGSEONG_COUNT * JONGSEONG_COUNT)])
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def search_tokens(name):
+    tokens = []
+    for word in (name or '').lower().split():
+        for source in {word, hangul_initials(word)}:
+            tokens.extend(source[i:] for i in range(len(source)))
+    return ' '.join(tokens)
+
+
+def upgrade():
+    with op.batch_alter_table('member', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('name_initials', sa.String(length=50), nullable=True))
+        batch_op.create_index('ix_member_name_initials', ['name_initials'], unique=False)
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, name FROM member")).all()
+    if rows:
+        conn.execute(sa.text("UPDATE member SET name_initials = :initials WHERE id = :id"),
+                     [{'id': member_id, 'initials': hangul_initials(name)} for member_id, name in rows])
+
+    if conn.dialect.name == 'sqlite':
+        # 이름/초성 접미사 토큰 FTS5 색인
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS member_search "
+                   "USING fts5(tokens, tokenize='unicode61', prefix='1 2')")
+        if rows:
+            conn.execute(sa.text("INSERT INTO member_search (rowid, tokens) VALUES (:id, :tokens)"),
+                         [{'id': member_id, 'tokens': search_tokens(name)} for member_id, name in rows])
+    elif conn.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX ix_member_name_trgm ON member USING gin (name gin_trgm_ops)")
+        op.execute("CREATE INDEX ix_member_name_initials_trgm ON member USING gin (name_initials gin_trgm_ops)")
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS member_search")
+    elif conn.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_member_name_initials_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_member_name_trgm")
+
+    with op.batch_alter_table('member', schema=None) as batch_op:
+        batch_op.drop_index('ix_member_name_initials')
+        batch_op.drop_column('name_initials')
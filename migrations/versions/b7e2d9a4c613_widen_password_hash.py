@@ -0,0 +1,45 @@
+"""Widen password_hash for scrypt hashes
+
+Revision ID: b7e2d9a4c613
+Revises: 9c1f4e7a3b58
+Create Date: 2026-10-18 22:10:37.511204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d9a4c613'
+down_revision = '9c1f4e7a3b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # scrypt:32768:8:1$<salt>$<128자 hex> 는 160자를 넘는다
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=128),
+               type_=sa.String(length=255),
+               existing_nullable=False)
+
+    with op.batch_alter_table('member', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=128),
+               type_=sa.String(length=255),
+               existing_nullable=True)
+
+
+def downgrade():
+    with op.batch_alter_table('member', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=255),
+               type_=sa.String(length=128),
+               existing_nullable=True)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=255),
+               type_=sa.String(length=128),
+               existing_nullable=False)
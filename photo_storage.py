@@ -0,0 +1,229 @@
+"""회원 사진 저장소
+
+- 업로드/ base64 사진을 청크 단위로 임시 파일에 기록하면서 SHA-256 을 계산하고
+  '<해시>.<확장자>' 이름으로 저장한다. (같은 사진은 한 번만 저장)
+- 목록/상세용 썸네일은 백그라운드 스레드 풀에서 생성한다. (Pillow 가 없으면 원본만 사용)
+- 응답의 썸네일 URL 은 파일을 확인하지 않고 만든다. 썸네일이 아직 없으면 /uploads 가 원본을 대신 보낸다. (resolve)
+"""
+import base64
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# 변형 이름 -> 최대 변 길이(px). 목록 아바타는 40x40 을 고해상도 화면에서도 선명하게 보이도록 96px
+THUMBNAIL_SIZES = {
+    'list': 96,
+    'detail': 480,
+}
+# '<해시>.<확장자>' / '<해시>_<변형>.jpg' - 내용이 바뀌지 않으므로 immutable 로 캐시할 수 있다
+CONTENT_ADDRESSED_PATTERN = re.compile(
+    r'^(?P<digest>[0-9a-f]{32})(?P<variant>_(?:%s))?\.(?:jpg|jpeg|png|gif)$' % '|'.join(THUMBNAIL_SIZES)
+)
+# '<원본 이름>_<변형>.jpg' - 내용 해시 이전에 올린 사진(IMG_7527.jpeg, member_<시각>.jpg)의 썸네일도 같은 형식
+VARIANT_PATTERN = re.compile(r'^(?P<stem>.+)_(?:%s)\.jpg$' % '|'.join(THUMBNAIL_SIZES))
+# 원본 사진의 확장자 (resolve 가 썸네일 대신 원본을 찾을 때, 예전 업로드는 대문자도 있다)
+ORIGINAL_EXTENSIONS = ('jpg', 'jpeg', 'png', 'gif', 'JPG', 'JPEG', 'PNG', 'GIF')
+CHUNK_SIZE = 64 * 1024
+BASE64_CHUNK_SIZE = 64 * 1024  # 4 의 배수여야 한다
+
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+
+
+def detect_extension(head, default='jpg'):
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    return default
+
+
+def iter_base64_chunks(data):
+    # 'data:image/jpeg;base64,...' 형식도 허용
+    if data.startswith('data:'):
+        data = data.partition(',')[2]
+    if '\n' in data or '\r' in data or ' ' in data:
+        data = ''.join(data.split())
+    for start in range(0, len(data), BASE64_CHUNK_SIZE):
+        yield base64.b64decode(data[start:start + BASE64_CHUNK_SIZE])
+
+
+def iter_stream_chunks(stream):
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def content_etag(filename):
+    """내용 해시 파일이면 강한 ETag 로 쓸 값을, 아니면 None 을 반환한다."""
+    match = CONTENT_ADDRESSED_PATTERN.match(filename)
+    if not match:
+        return None
+    return match.group('digest') + (match.group('variant') or '')
+
+
+class PhotoStore:
+    def __init__(self, app=None):
+        self.folder = None
+        self.executor = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.folder = app.config['UPLOAD_FOLDER']
+        os.makedirs(self.folder, exist_ok=True)
+        self.executor = ThreadPoolExecutor(
+            max_workers=app.config.get('PHOTO_WORKERS', 2),
+            thread_name_prefix='photo-thumbnail'
+        )
+        app.extensions['photo_store'] = self
+
+        @app.cli.command('generate-thumbnails')
+        def generate_thumbnails():
+            # 기존에 저장된 사진들의 썸네일을 만든다
+            filenames = self.originals()
+            for filename in filenames:
+                self.make_thumbnails(filename)
+            print(f"Generated thumbnails for {len(filenames)} photos.")
+
+    def stage_chunks(self, chunks, extension=None):
+        """바이트 청크를 임시 파일에 기록한다 -> (내용 해시 기반 파일 이름, 임시 파일 경로)
+
+        트랜잭션이 커밋된 뒤 publish(), 롤백되면 discard() 를 호출한다.
+        """
+        digest = hashlib.sha256()
+        head = b''
+        fd, temp_path = tempfile.mkstemp(dir=self.folder, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                for chunk in chunks:
+                    if len(head) < 16:
+                        head += chunk[:16]
+                    digest.update(chunk)
+                    fh.write(chunk)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        extension = detect_extension(head, extension or 'jpg')
+        return f"{digest.hexdigest()[:32]}.{extension}", temp_path
+
+    def publish(self, staged):
+        """stage_chunks() 로 기록한 파일을 제 이름으로 옮기고 썸네일 생성을 예약한다."""
+        filename, temp_path = staged
+        path = os.path.join(self.folder, filename)
+        try:
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.chmod(temp_path, 0o644)
+                os.replace(temp_path, path)
+        except BaseException:
+            self.discard(staged)
+            raise
+        self.schedule_thumbnails(filename)
+        return filename
+
+    def discard(self, staged):
+        """stage_chunks() 로 기록한 임시 파일을 지운다."""
+        _, temp_path = staged
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    def save_chunks(self, chunks, extension=None):
+        """바이트 청크를 디스크에 기록하고 내용 해시 기반 파일 이름을 반환한다."""
+        return self.publish(self.stage_chunks(chunks, extension))
+
+    def save_base64(self, data):
+        return self.save_chunks(iter_base64_chunks(data))
+
+    def save_stream(self, stream, extension=None):
+        return self.save_chunks(iter_stream_chunks(stream), extension)
+
+    def stage_base64(self, data):
+        return self.stage_chunks(iter_base64_chunks(data))
+
+    @staticmethod
+    def variant_filename(filename, variant):
+        stem, _, _ = filename.rpartition('.')
+        return f"{stem}_{variant}.jpg"
+
+    @staticmethod
+    def is_original(filename):
+        stem, dot, extension = filename.rpartition('.')
+        return bool(dot) and not filename.startswith('.') and \
+            not any(stem.endswith(f'_{variant}') for variant in THUMBNAIL_SIZES)
+
+    def originals(self):
+        return sorted(filename for filename in os.listdir(self.folder) if self.is_original(filename))
+
+    def schedule_thumbnails(self, filename):
+        if Image is None or self.executor is None:
+            return None
+        return self.executor.submit(self.make_thumbnails, filename)
+
+    def make_thumbnails(self, filename):
+        if Image is None:
+            return
+        source = os.path.join(self.folder, filename)
+        try:
+            with Image.open(source) as image:
+                # draft() 는 JPEG 을 축소 디코딩하여 큰 사진도 메모리를 적게 쓴다
+                image.draft('RGB', (max(THUMBNAIL_SIZES.values()),) * 2)
+                image = ImageOps.exif_transpose(image).convert('RGB')
+                for variant, size in sorted(THUMBNAIL_SIZES.items(), key=lambda item: -item[1]):
+                    target = os.path.join(self.folder, self.variant_filename(filename, variant))
+                    if os.path.exists(target):
+                        continue
+                    thumbnail = image.copy()
+                    thumbnail.thumbnail((size, size))
+                    fd, temp_path = tempfile.mkstemp(dir=self.folder, prefix='.thumb-')
+                    with os.fdopen(fd, 'wb') as fh:
+                        thumbnail.save(fh, 'JPEG', quality=85, optimize=True)
+                    os.chmod(temp_path, 0o644)
+                    os.replace(temp_path, target)
+        except Exception as e:
+            logger.warning("썸네일 생성 실패 %s: %s", filename, e)
+
+    def variants(self, filename):
+        """변형 이름 -> 제공할 파일 이름 (Pillow 가 없으면 모두 원본)
+
+        목록/직렬화 경로에서 행마다 호출되므로 파일 시스템을 확인하지 않는다.
+        """
+        if Image is None:
+            return dict.fromkeys(('original', *THUMBNAIL_SIZES), filename)
+        result = {'original': filename}
+        for variant in THUMBNAIL_SIZES:
+            result[variant] = self.variant_filename(filename, variant)
+        return result
+
+    def resolve(self, filename):
+        """요청된 파일 이름 -> (실제로 보낼 파일 이름, 대체 여부). 없으면 (None, False)
+
+        썸네일이 아직 없거나 만들지 못했으면 같은 이름의 원본을 보낸다. (내용 해시 이전의 파일 이름 포함)
+        """
+        if os.path.isfile(os.path.join(self.folder, filename)):
+            return filename, False
+        match = VARIANT_PATTERN.match(filename)
+        if not match:
+            return None, False
+        for extension in ORIGINAL_EXTENSIONS:
+            original = f"{match.group('stem')}.{extension}"
+            if os.path.isfile(os.path.join(self.folder, original)):
+                return original, True
+        return None, False
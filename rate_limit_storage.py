@@ -0,0 +1,170 @@
+"""속도 제한(Flask-Limiter) 저장소: Redis 공유 카운터 + 프로세스 내 선확보 토큰 + 장애 시 로컬 카운트
+
+RATELIMIT_STORAGE_URI = 'leased+redis://host:6379/0', RATELIMIT_STRATEGY = 'moving-window' 로 사용한다.
+
+- 카운터는 Redis 의 moving window (limits 의 RedisStorage) 에 두므로 gunicorn 워커가 몇 개든
+  한도는 모든 워커를 합쳐서 적용된다.
+- 한도에 여유가 많은 키는 Redis 에서 항목 여러 개(남은 양 x lease_fraction, 최대 max_lease 개)를 한 번에
+  확보해 프로세스에 토큰으로 두고, 이후 요청은 네트워크 왕복 없이 통과시킨다. 토큰은 미리 Redis 에
+  기록된 항목이므로 전체 한도를 넘지 않는다. 쓰지 않은 토큰은 lease_ttl 초 뒤 버린다.
+  (버린 만큼 한도를 덜 쓸 뿐이고, 미리 확보한 항목은 최대 lease_ttl 초 일찍 창에서 빠진다)
+- 한도가 작은 키(예: 로그인 5 per minute)나 남은 양이 적은 키는 매 요청 Redis 에서 확인한다.
+- Redis 에 연결할 수 없으면 retry_interval 초 동안 프로세스 내 MemoryStorage 로 같은 한도를 센다.
+  이 동안은 워커마다 따로 세므로 한도가 워커 수만큼 느슨해진다.
+"""
+import logging
+import os
+import threading
+import time
+
+from limits.storage import MemoryStorage, MovingWindowSupport, RedisStorage, Storage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_FRACTION = 0.1
+DEFAULT_MAX_LEASE = 20
+DEFAULT_LEASE_TTL = 1.0  # 초
+DEFAULT_RETRY_INTERVAL = 5.0  # 초 - Redis 장애 후 다시 연결을 시도하기까지
+
+
+class LeasedRedisStorage(Storage, MovingWindowSupport):
+    STORAGE_SCHEME = ['leased+redis', 'leased+rediss', 'leased+redis+unix']
+
+    def __init__(self, uri, wrap_exceptions=False, lease_fraction=DEFAULT_LEASE_FRACTION,
+                 max_lease=DEFAULT_MAX_LEASE, lease_ttl=DEFAULT_LEASE_TTL,
+                 retry_interval=DEFAULT_RETRY_INTERVAL, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        # 'leased+redis://...' -> RedisStorage('redis://...') (연결은 첫 명령 때 맺는다)
+        self.redis = RedisStorage(uri.split('+', 1)[1], wrap_exceptions=wrap_exceptions, **options)
+        self.local = MemoryStorage()
+        self.lease_fraction = float(lease_fraction)
+        self.max_lease = int(max_lease)
+        self.lease_ttl = float(lease_ttl)
+        self.retry_interval = float(retry_interval)
+        self._leases = {}  # key -> [남은 토큰 수, 만료 시각(monotonic)]
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._redis_down_until = 0.0
+        self.stats = {'lease_hits': 0, 'redis_calls': 0, 'redis_errors': 0, 'local_calls': 0}
+
+    @property
+    def base_exceptions(self):
+        return self.redis.base_exceptions
+
+    # Redis 장애 처리
+
+    def _use_local(self):
+        return self._redis_down_until and time.monotonic() < self._redis_down_until
+
+    def _redis_failed(self, error):
+        self.stats['redis_errors'] += 1
+        if not self._redis_down_until:
+            logger.warning("속도 제한 저장소(Redis)에 연결할 수 없어 프로세스 내 카운터를 사용합니다: %s", error)
+        self._redis_down_until = time.monotonic() + self.retry_interval
+
+    def _redis_ok(self):
+        if self._redis_down_until:
+            logger.info("속도 제한 저장소(Redis) 연결이 복구되었습니다.")
+            self._redis_down_until = 0.0
+
+    def _call(self, method, *args):
+        """Redis 에 요청하고, 연결할 수 없으면 로컬 저장소에서 같은 요청을 처리한다."""
+        if not self._use_local():
+            self.stats['redis_calls'] += 1
+            try:
+                result = getattr(self.redis, method)(*args)
+            except self.redis.base_exceptions as e:
+                self._redis_failed(e)
+            else:
+                self._redis_ok()
+                return result
+        self.stats['local_calls'] += 1
+        return getattr(self.local, method)(*args)
+
+    # moving window
+
+    def _take_lease(self, key, amount):
+        """선확보한 토큰으로 통과시키면 True, 최근에 확보할 여유가 없었으면 None, 그 밖에는 False"""
+        now = time.monotonic()
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork 된 워커는 부모가 확보한 토큰을 쓰지 않는다
+                self._leases.clear()
+                self._pid = os.getpid()
+            lease = self._leases.get(key)
+            if lease is None:
+                return False
+            if lease[1] <= now:
+                del self._leases[key]
+                return False
+            if lease[0] < amount:
+                return None
+            lease[0] -= amount
+            if not lease[0]:
+                # 다 쓴 토큰은 다음 요청에서 다시 확보한다
+                del self._leases[key]
+            self.stats['lease_hits'] += 1
+            return True
+
+    def _acquire_remote(self, key, limit, expiry, amount, probe):
+        self.stats['redis_calls'] += 1
+        if probe and limit * self.lease_fraction > amount:
+            # 창에 남은 양을 보고 그 일부를 한 번에 확보한다
+            used = self.redis.get_moving_window(key, limit, expiry)[1]
+            size = min(self.max_lease, int((limit - used) * self.lease_fraction))
+            if size > amount and self.redis.acquire_entry(key, limit, expiry, size):
+                with self._lock:
+                    # 다른 스레드가 동시에 확보한 토큰이 있으면 합친다
+                    lease = self._leases.setdefault(key, [0, 0.0])
+                    lease[0] += size - amount
+                    lease[1] = time.monotonic() + self.lease_ttl
+                return True
+            with self._lock:
+                # 여유가 적은 키는 lease_ttl 동안 확보를 다시 시도하지 않고 요청마다 확인한다
+                self._leases.setdefault(key, [0, time.monotonic() + self.lease_ttl])
+        return self.redis.acquire_entry(key, limit, expiry, amount)
+
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        leased = self._take_lease(key, amount)
+        if leased:
+            return True
+        if not self._use_local():
+            try:
+                acquired = self._acquire_remote(key, limit, expiry, amount, probe=leased is False)
+            except self.redis.base_exceptions as e:
+                self._redis_failed(e)
+            else:
+                self._redis_ok()
+                return acquired
+        self.stats['local_calls'] += 1
+        return self.local.acquire_entry(key, limit, expiry, amount)
+
+    def get_moving_window(self, key, limit, expiry):
+        # 선확보한 토큰도 Redis 에 기록된 항목이므로 남은 양은 실제보다 조금 적게 보일 수 있다
+        return self._call('get_moving_window', key, limit, expiry)
+
+    # 그 밖의 전략(fixed-window)과 관리용
+
+    def incr(self, key, expiry, amount=1):
+        return self._call('incr', key, expiry, amount)
+
+    def get(self, key):
+        return self._call('get', key)
+
+    def get_expiry(self, key):
+        return self._call('get_expiry', key)
+
+    def check(self):
+        return self.redis.check()
+
+    def clear(self, key):
+        with self._lock:
+            self._leases.pop(key, None)
+        self.local.clear(key)
+        self._call('clear', key)
+
+    def reset(self):
+        with self._lock:
+            self._leases.clear()
+        self.local.reset()
+        return self._call('reset')
@@ -0,0 +1,224 @@
+"""회원 조회 API 응답 캐시
+
+직렬화된 JSON 응답 본문과 ETag 를 Redis(사용 가능할 때) 또는 프로세스 내 LRU 에 저장한다.
+Member 가 변경되면 네임스페이스 세대(generation)를 올려 이전 응답을 모두 무효화한다.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+DEFAULT_TTL = 300  # 초
+DEFAULT_MAX_ENTRIES = 1024
+BACKEND_RETRY_INTERVAL = 30  # Redis 오류 후 로컬 LRU 를 사용할 시간(초)
+
+
+class LocalCacheBackend:
+    """TTL 이 있는 프로세스 내 LRU (Redis 를 사용할 수 없을 때)"""
+
+    name = 'local'
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def generation(self, namespace):
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            prefix = f'{namespace}:'
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class RedisCacheBackend:
+    """Redis 백엔드 - 여러 워커 프로세스가 캐시와 무효화를 공유한다"""
+
+    name = 'redis'
+
+    def __init__(self, client, prefix='response-cache'):
+        self.client = client
+        self.prefix = prefix
+
+    def generation(self, namespace):
+        return int(self.client.get(f'{self.prefix}:gen:{namespace}') or 0)
+
+    def bump(self, namespace):
+        self.client.incr(f'{self.prefix}:gen:{namespace}')
+
+    def get(self, key):
+        value = self.client.get(f'{self.prefix}:{key}')
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        etag, _, body = value.partition('\n')
+        return etag, body.encode('utf-8')
+
+    def set(self, key, value, ttl):
+        etag, body = value
+        self.client.set(f'{self.prefix}:{key}', etag + '\n' + body.decode('utf-8'), ex=ttl)
+
+
+class ResponseCache:
+    def __init__(self, app=None, redis_client=None):
+        self.backend = None
+        self.fallback = None
+        self._backend_down_until = 0
+        self.ttl = DEFAULT_TTL
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'invalidations': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, redis_client)
+
+    def init_app(self, app, redis_client=None):
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', DEFAULT_TTL)
+        self.fallback = LocalCacheBackend(app.config.get('RESPONSE_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        if redis_client is not None:
+            self.backend = RedisCacheBackend(redis_client)
+        else:
+            self.backend = self.fallback
+        app.extensions['response_cache'] = self
+
+    def _active_backend(self):
+        # Redis 장애 중에는 매 요청마다 연결 타임아웃을 기다리지 않도록 로컬 LRU 를 사용
+        if self._backend_down_until > time.monotonic():
+            return self.fallback
+        return self.backend
+
+    def _backend_failed(self):
+        self._count('errors')
+        if self.backend is not self.fallback:
+            self._backend_down_until = time.monotonic() + BACKEND_RETRY_INTERVAL
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['backend'] = self._active_backend().name if self.backend else None
+        return stats
+
+    def generation(self, namespace):
+        """namespace 의 무효화 세대 (Redis 를 쓰면 워커끼리 공유, 장애 중에는 프로세스 내 값)"""
+        backend = self._active_backend()
+        try:
+            return backend.generation(namespace)
+        except Exception:
+            self._backend_failed()
+            return self.fallback.generation(namespace)
+
+    def invalidate(self, namespace):
+        self._count('invalidations')
+        if self.fallback is not self.backend:
+            self.fallback.bump(namespace)
+        try:
+            self.backend.bump(namespace)
+        except Exception:
+            self._backend_failed()
+
+    def watch_model(self, model, namespace):
+        """model 의 insert/update/delete 시 namespace 캐시를 무효화한다.
+
+        flush 시점에 한 번, 커밋 후에 한 번 더 무효화하여 그 사이에 다른 요청이
+        이전 데이터를 캐시에 다시 넣는 경우도 처리한다.
+        """
+        pending_key = f'response_cache_pending:{namespace}'
+
+        def on_write(mapper, connection, target):
+            self.invalidate(namespace)
+            session = Session.object_session(target)
+            if session is not None:
+                session.info[pending_key] = True
+
+        def after_commit(session):
+            if session.info.pop(pending_key, False):
+                self.invalidate(namespace)
+
+        def after_rollback(session, previous_transaction):
+            session.info.pop(pending_key, None)
+
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, name, on_write)
+        event.listen(Session, 'after_commit', after_commit)
+        event.listen(Session, 'after_soft_rollback', after_rollback)
+
+    def cached(self, namespace, ttl=None):
+        """GET 응답 본문을 캐시하고 ETag / If-None-Match 를 처리하는 데코레이터"""
+        def decorator(f):
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                backend = self._active_backend()
+                try:
+                    key = f'{namespace}:{backend.generation(namespace)}:{request.url}'
+                    entry = backend.get(key)
+                except Exception:
+                    self._backend_failed()
+                    backend = self.fallback
+                    key = f'{namespace}:{backend.generation(namespace)}:{request.url}'
+                    entry = backend.get(key)
+
+                if entry is not None:
+                    self._count('hits')
+                    etag, body = entry
+                    if etag in request.if_none_match:
+                        self._count('not_modified')
+                        response = make_response('', 304)
+                    else:
+                        response = make_response(body, 200)
+                        response.mimetype = 'application/json'
+                    response.set_etag(etag)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self._count('misses')
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200 or response.mimetype != 'application/json':
+                    return response
+                body = response.get_data()
+                etag = hashlib.sha1(body).hexdigest()
+                try:
+                    backend.set(key, (etag, body), ttl or self.ttl)
+                except Exception:
+                    self._backend_failed()
+                response.set_etag(etag)
+                response.headers['X-Cache'] = 'MISS'
+                if etag in request.if_none_match:
+                    response = make_response('', 304)
+                    response.set_etag(etag)
+                    self._count('not_modified')
+                return response
+            return decorated
+        return decorator
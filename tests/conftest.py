@@ -0,0 +1,120 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+from app import create_app, db, job_runner, Member, User, UserRole  # noqa: E402
+
+PASSWORD = 'Tests-password-1234'
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: 큰 데이터로 실행하는 느린 테스트 (-m "not slow" 로 제외)')
+
+
+def overrides(tmp_path, **values):
+    """테스트마다 임시 폴더의 DB/업로드/작업 폴더를 쓰는 설정"""
+    return {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'members.db'),
+        'RATELIMIT_ENABLED': False,
+        'INSTRUMENTATION_ENABLED': False,
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+        'JOB_FOLDER': str(tmp_path / 'jobs'),
+        **values,
+    }
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app('testing', overrides(tmp_path))
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def new_member(index, **values):
+    """회원 한 명 (index 로 이름/이메일을 구분한다)"""
+    fields = dict(name=f'회원{index}', email=f'member{index}@example.com', register_date=date(2024, 1, 1),
+                  birth_year=1980, birth_month=1, birth_day=1, phone='010-0000-0000', district='1구역')
+    fields.update(values)
+    return Member(**fields)
+
+
+def add_members(app, *members):
+    with app.app_context():
+        db.session.add_all(members)
+        db.session.commit()
+        return [member.id for member in members]
+
+
+def add_user(app, email, role):
+    with app.app_context():
+        user = User(email=email, role=role)
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+def login(client, email):
+    response = client.post('/api/auth/login', json={'email': email, 'password': PASSWORD})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def headers_for(app, client):
+    """역할 -> 그 역할 사용자의 Authorization 헤더"""
+    def make(role):
+        email = f"{role.name.lower()}@example.com"
+        add_user(app, email, role)
+        return bearer(login(client, email)['access_token'])
+    return make
+
+
+@pytest.fixture
+def admin_headers(headers_for):
+    return headers_for(UserRole.SUPER_ADMIN)
+
+
+def run_job(app, client, headers, response):
+    """202 로 접수된 작업을 이 프로세스에서 바로 실행하고 작업 상태 응답을 반환한다. (테스트는 JOB_WORKERS=0)"""
+    assert response.status_code == 202, response.get_json()
+    job_id = response.get_json()['id']
+    with app.app_context():
+        assert job_runner.claim(job_id)
+        job_runner.run(job_id)
+    return client.get(f'/api/jobs/{job_id}', headers=headers).get_json()
+
+
+@pytest.fixture
+def statements(app):
+    """이 엔진에서 실행된 SQL 문 목록"""
+    from sqlalchemy import event
+
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
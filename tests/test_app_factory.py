@@ -0,0 +1,56 @@
+"""애플리케이션 팩토리와 WSGI 진입점 - 설정 선택, import 시 부수 효과 없음"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app import create_app, db, MemberStat
+from conftest import ROOT, add_members, new_member, overrides
+
+
+def run_python(code, **env):
+    """새 인터프리터에서 code 를 실행한다. (이미 import 된 app 모듈의 영향을 받지 않도록)"""
+    env = {**{key: value for key, value in os.environ.items() if key != 'FLASK_CONFIG'}, **env}
+    return subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=60,
+                          env=env)
+
+
+def test_import_has_no_side_effects(tmp_path):
+    # 연결할 수 없는 Redis 여도 import 는 조용히 바로 끝나야 한다 (ping/print/DB 생성 없음)
+    result = run_python('import app', REDIS_URL='redis://127.0.0.1:1/0',
+                        DATABASE_URI='sqlite:///' + str(tmp_path / 'members.db'))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == ''
+    assert not os.path.exists(tmp_path / 'members.db')
+
+
+def test_wsgi_uses_production_config(tmp_path):
+    result = run_python('from wsgi import app; print(app.debug, app.testing, app.config["METRICS_PUBLIC"])',
+                        REDIS_URL='',
+                        DATABASE_URI='sqlite:///' + str(tmp_path / 'members.db'))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[-3:] == ['False', 'False', 'False']
+
+
+@pytest.mark.parametrize('config_name, debug, testing', [
+    ('development', True, False),
+    ('testing', False, True),
+    ('production', False, False),
+])
+def test_create_app_selects_config(tmp_path, config_name, debug, testing):
+    app = create_app(config_name, overrides(tmp_path, REDIS_URL=''))
+    assert (app.debug, app.testing) == (debug, testing)
+
+
+def test_apps_can_be_created_repeatedly(tmp_path):
+    # 매퍼 이벤트는 한 번만 등록되어야 한다 (두 번이면 통계 요약에 회원이 두 번 더해진다)
+    create_app('testing', overrides(tmp_path / 'first'))
+    app = create_app('testing', overrides(tmp_path))
+    with app.app_context():
+        db.create_all()
+    add_members(app, new_member(1, district='3구역'))
+    with app.app_context():
+        assert db.session.query(MemberStat.count).filter_by(dimension='district', bucket='3구역').scalar() == 1
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,90 @@
+"""비밀번호 해시 서비스 - 설정이 바뀐 해시의 로그인 시 재해시, 해시 작업이 밀릴 때 503"""
+import threading
+
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app import create_app, credentials, db, User, UserRole
+from conftest import PASSWORD, add_user, overrides
+from credentials import CredentialService, CredentialServiceBusy, hash_method
+
+OLD_METHOD = 'pbkdf2:sha256:500'
+
+
+def stored_hash(app, email):
+    with app.app_context():
+        return db.session.query(User.password_hash).filter_by(email=email).scalar()
+
+
+def login(client, password=PASSWORD):
+    return client.post('/api/auth/login', json={'email': 'user@example.com', 'password': password})
+
+
+@pytest.fixture
+def old_user(app):
+    # 예전 설정(다른 비용)으로 저장된 해시
+    with app.app_context():
+        db.session.add(User(email='user@example.com', role=UserRole.USER,
+                            password_hash=generate_password_hash(PASSWORD, OLD_METHOD)))
+        db.session.commit()
+
+
+def test_login_rehashes_with_current_method(app, client, old_user):
+    assert login(client).status_code == 200
+    pwhash = stored_hash(app, 'user@example.com')
+    assert hash_method(pwhash) == app.config['PASSWORD_HASH_METHOD']
+    assert check_password_hash(pwhash, PASSWORD)
+    assert login(client).status_code == 200
+
+
+def test_failed_login_keeps_hash(app, client, old_user):
+    assert login(client, 'wrong-password').status_code == 401
+    assert hash_method(stored_hash(app, 'user@example.com')) == OLD_METHOD
+
+
+def test_current_hash_is_not_rehashed(app, client):
+    add_user(app, 'user@example.com', UserRole.USER)
+    before = stored_hash(app, 'user@example.com')
+    assert login(client).status_code == 200
+    assert stored_hash(app, 'user@example.com') == before
+
+
+def test_method_without_cost_uses_werkzeug_defaults(tmp_path):
+    # 'pbkdf2:sha256' 설정은 기본 반복 횟수가 붙어 저장되므로 매번 재해시하지 않아야 한다
+    service = CredentialService(create_app('testing', overrides(tmp_path, PASSWORD_HASH_METHOD='pbkdf2:sha256')))
+    assert not service.needs_rehash(generate_password_hash('x', 'pbkdf2:sha256'))
+    assert service.needs_rehash(generate_password_hash('x', OLD_METHOD))
+    assert service.needs_rehash(None)
+
+
+def test_full_hash_queue_is_rejected(tmp_path):
+    service = CredentialService(create_app('testing', overrides(
+        tmp_path, PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=1)))
+    pwhash = generate_password_hash(PASSWORD, OLD_METHOD)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_check(*args):
+        started.set()
+        release.wait(5)
+        return check_password_hash(*args)
+
+    # 풀의 자리 하나를 다른 요청이 쓰고 있는 동안
+    blocker = threading.Thread(target=service._run, args=(slow_check, pwhash, PASSWORD))
+    blocker.start()
+    assert started.wait(5)
+    with pytest.raises(CredentialServiceBusy):
+        service.verify(pwhash, PASSWORD)
+    release.set()
+    blocker.join()
+    assert service.rejected == 1
+    assert service.pending == 0
+    assert service.verify(pwhash, PASSWORD)
+
+
+def test_busy_login_is_503(app, client, old_user, monkeypatch):
+    monkeypatch.setattr(credentials, 'workers', 1)
+    monkeypatch.setattr(credentials, 'max_pending', 0)
+    response = login(client)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
@@ -0,0 +1,132 @@
+"""DB 엔진 설정 - 환경별 풀 옵션, SQLite PRAGMA, 쓰기 요청의 BEGIN IMMEDIATE, 동시 등록"""
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from app import create_app, db, Member
+from config import ProductionConfig
+from conftest import overrides
+from db_engine import engine_options
+
+PROCESSES = 3
+THREADS = 4
+REQUESTS_PER_THREAD = 20
+
+
+@pytest.fixture
+def production_app(tmp_path):
+    """운영 설정의 SQLite PRAGMA(WAL, busy_timeout 등)를 쓰는 파일 DB 앱"""
+    app = create_app('testing', overrides(tmp_path, SQLITE_PRAGMAS=ProductionConfig.SQLITE_PRAGMAS))
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_server_database_pool_options():
+    options = engine_options({'SQLALCHEMY_DATABASE_URI': 'postgresql://church@db/members',
+                              'DB_POOL_SIZE': 10, 'DB_MAX_OVERFLOW': 20})
+    assert options == {'pool_size': 10, 'max_overflow': 20, 'pool_timeout': 30, 'pool_recycle': 1800,
+                       'pool_pre_ping': True}
+
+
+@pytest.mark.parametrize('uri, options', [
+    ('sqlite:////tmp/members.db', {'connect_args': {'timeout': 15.0}}),
+    ('sqlite://', {}),
+    ('sqlite:///:memory:', {}),
+])
+def test_sqlite_options(uri, options):
+    assert engine_options({'SQLALCHEMY_DATABASE_URI': uri, 'SQLITE_PRAGMAS': {'busy_timeout': 15000}}) == options
+
+
+def test_explicit_engine_options_win(tmp_path):
+    app = create_app('testing', overrides(tmp_path, SQLALCHEMY_ENGINE_OPTIONS={'echo_pool': True}))
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS'] == {'echo_pool': True}
+
+
+def test_sqlite_pragmas_are_applied(production_app):
+    with production_app.app_context():
+        pragma = lambda name: db.session.execute(db.text(f'PRAGMA {name}')).scalar()  # noqa: E731
+        assert pragma('journal_mode') == 'wal'
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('busy_timeout') == ProductionConfig.SQLITE_PRAGMAS['busy_timeout']
+
+
+def test_only_write_requests_begin_immediate(app, client, admin_headers, statements):
+    statements.clear()
+    assert client.get('/api/members', headers=admin_headers).status_code == 200
+    assert 'BEGIN IMMEDIATE' not in statements
+    response = client.post('/api/members', headers=admin_headers, json={
+        'name': '회원', 'email': 'member@example.com', 'birthYear': 1980, 'birthMonth': 1, 'birthDay': 1,
+        'phone': '010-0000-0000', 'gender': '여', 'district': '1구역'})
+    assert response.status_code == 201, response.get_json()
+    assert 'BEGIN IMMEDIATE' in statements
+
+
+def create_members(config, process_index, start_at, results):
+    """워커 프로세스 하나 - 스레드마다 회원을 등록하고, 읽기 스레드는 목록을 계속 조회한다"""
+    app = create_app('testing', config)
+    statuses, errors = [], []
+    done = threading.Event()
+
+    def read_members():
+        client = app.test_client()
+        time.sleep(max(0, start_at - time.time()))
+        index = 0
+        while not done.is_set():
+            # 응답 캐시를 거치지 않도록 매번 다른 쿼리 문자열
+            client.get(f'/api/members?per_page=20&reader={process_index}-{index}')
+            index += 1
+
+    def post_members(thread_index):
+        client = app.test_client()
+        time.sleep(max(0, start_at - time.time()))
+        for index in range(REQUESTS_PER_THREAD):
+            key = f'{process_index}-{thread_index}-{index}'
+            response = client.post('/api/members', json={
+                'name': f'회원{key}', 'email': f'member{key}@example.com',
+                'birthYear': 1980, 'birthMonth': index % 12 + 1, 'birthDay': index % 28 + 1,
+                'phone': '010-0000-0000', 'gender': '여', 'district': f'{thread_index + 1}구역'})
+            statuses.append(response.status_code)
+            if response.status_code != 201:
+                errors.append(response.get_json()['error'].splitlines()[0])
+
+    reader = threading.Thread(target=read_members)
+    writers = [threading.Thread(target=post_members, args=(index,)) for index in range(THREADS)]
+    for thread in [reader] + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    reader.join()
+    results.put((statuses.count(201), errors[:3]))
+
+
+def test_concurrent_creates_do_not_fail(tmp_path):
+    # gunicorn 워커 여러 개가 같은 DB 파일에 동시에 쓰는 상황 - 운영 설정(WAL, busy_timeout, BEGIN IMMEDIATE)
+    config = overrides(tmp_path, SQLITE_PRAGMAS=ProductionConfig.SQLITE_PRAGMAS)
+    app = create_app('testing', config)
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    start_at = time.time() + 1  # 모든 프로세스가 앱을 만든 뒤 동시에 시작
+    processes = [context.Process(target=create_members, args=(config, index, start_at, results))
+                 for index in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    outcomes = [results.get(timeout=120) for _ in processes]
+    for process in processes:
+        process.join()
+
+    total = PROCESSES * THREADS * REQUESTS_PER_THREAD
+    assert sum(created for created, _ in outcomes) == total, [errors for _, errors in outcomes]
+    with app.app_context():
+        assert Member.query.count() == total
+        db.session.remove()
+        db.engine.dispose()
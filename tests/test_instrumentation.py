@@ -0,0 +1,98 @@
+"""요청/SQL 계측 - /metrics 히스토그램, 접근 토큰, 느린 쿼리 로그의 파라미터 생략"""
+import logging
+import re
+
+import pytest
+
+from app import create_app, db
+from conftest import add_members, bearer, new_member, overrides
+
+TOKEN = 'metrics-token'
+
+
+@pytest.fixture
+def instrumented(tmp_path):
+    """계측을 켠 앱을 만드는 함수 (설정 값을 덮어쓸 수 있다)"""
+    apps = []
+
+    def make(**values):
+        app = create_app('testing', overrides(tmp_path / str(len(apps)), INSTRUMENTATION_ENABLED=True, **values))
+        with app.app_context():
+            db.create_all()
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+def sample(text, name, **labels):
+    """Prometheus 텍스트에서 이름과 라벨이 맞는 값 (없으면 0)"""
+    wanted = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(r'^%s\{%s\} (\S+)$' % (re.escape(name), re.escape(wanted)), text, re.M)
+    return float(match.group(1)) if match else 0
+
+
+def test_request_timing_and_query_counts(instrumented):
+    app = instrumented()
+    member_id = add_members(app, new_member(1))[0]
+    client = app.test_client()
+    before = client.get('/metrics').get_data(as_text=True)
+
+    response = client.get(f'/api/members/{member_id}')
+    assert response.status_code == 200
+    assert re.match(r'app;dur=[\d.]+, db;dur=[\d.]+;desc="[1-9]\d* queries"', response.headers['Server-Timing'])
+    queries = int(re.search(r'"(\d+) queries"', response.headers['Server-Timing']).group(1))
+
+    after = client.get('/metrics').get_data(as_text=True)
+    labels = {'endpoint': 'main.get_member', 'method': 'GET', 'status': '200'}
+    assert sample(after, 'http_request_duration_seconds_count', **labels) == \
+        sample(before, 'http_request_duration_seconds_count', **labels) + 1
+    assert sample(after, 'http_request_db_queries_sum', endpoint='main.get_member') == \
+        sample(before, 'http_request_db_queries_sum', endpoint='main.get_member') + queries
+    assert '# TYPE db_query_duration_seconds histogram' in after
+
+
+@pytest.mark.parametrize('values, headers, status', [
+    ({'METRICS_TOKEN': TOKEN}, {}, 401),
+    ({'METRICS_TOKEN': TOKEN}, bearer('wrong'), 401),
+    ({'METRICS_TOKEN': TOKEN}, bearer(TOKEN), 200),
+    ({'METRICS_TOKEN': TOKEN, 'METRICS_PUBLIC': False}, bearer(TOKEN), 200),
+    # 운영 설정에서 토큰이 없으면 아예 열지 않는다
+    ({'METRICS_TOKEN': '', 'METRICS_PUBLIC': False}, {}, 404),
+    ({'METRICS_TOKEN': '', 'METRICS_PUBLIC': True}, {}, 200),
+])
+def test_metrics_access(instrumented, values, headers, status):
+    assert instrumented(**values).test_client().get('/metrics', headers=headers).status_code == status
+
+
+def slow_query_logs(caplog, app, path):
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger='instrumentation'):
+        app.test_client().get(path)
+    return [record.getMessage() for record in caplog.records if record.getMessage().startswith('느린 쿼리')]
+
+
+def test_slow_query_log_redacts_personal_data(instrumented, caplog):
+    app = instrumented(SLOW_QUERY_THRESHOLD=0, SLOW_QUERY_LOG_PARAMETERS=True)
+    member_id = add_members(app, new_member(1, phone='010-9876-5432'))[0]
+    logs = slow_query_logs(caplog, app, f'/api/members/{member_id}')
+    assert logs and all('parameters=(개인정보 생략)' in message for message in logs if 'FROM member' in message)
+    assert not any('010-9876-5432' in message or 'member1@example.com' in message for message in logs)
+
+    # 개인정보가 없는 테이블의 파라미터는 남긴다
+    with app.test_request_context():
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger='instrumentation'):
+            db.session.execute(db.text('SELECT count(*) FROM job WHERE status = :status'), {'status': 'queued'})
+    assert any("'queued'" in record.getMessage() for record in caplog.records)
+
+
+def test_slow_query_parameters_are_off_by_default(instrumented, caplog):
+    app = instrumented(SLOW_QUERY_THRESHOLD=0)
+    member_id = add_members(app, new_member(1))[0]
+    logs = slow_query_logs(caplog, app, f'/api/members/{member_id}')
+    assert logs and all(message.endswith('parameters=(생략)') for message in logs)
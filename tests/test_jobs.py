@@ -0,0 +1,67 @@
+"""백그라운드 작업 - 죽은 워커의 작업 정리, 오래된 작업 파일 삭제, 취소"""
+import os
+from datetime import datetime, timedelta
+
+from app import db, Job, job_runner
+from conftest import run_job
+from job_runner import CANCELLED, FAILED, QUEUED, RUNNING, STALE_JOB_ERROR, SUCCEEDED
+
+
+def add_job(status, **values):
+    job = job_runner.create('export_members')
+    job.status = status
+    for key, value in values.items():
+        setattr(job, key, value)
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+
+def test_recover_stale_fails_jobs_without_heartbeat(app):
+    now = datetime.utcnow()
+    lease = timedelta(seconds=job_runner.lease_timeout)
+    with app.app_context():
+        dead = add_job(RUNNING, started_at=now - 2 * lease, heartbeat_at=now - 2 * lease)
+        alive = add_job(RUNNING, started_at=now - 2 * lease, heartbeat_at=now)
+        assert job_runner.recover_stale() == 1
+        db.session.expire_all()
+        assert (db.session.get(Job, dead).status, db.session.get(Job, dead).error) == (FAILED, STALE_JOB_ERROR)
+        assert db.session.get(Job, alive).status == RUNNING
+
+
+def test_sweep_removes_old_finished_job_folders(app):
+    now = datetime.utcnow()
+    with app.app_context():
+        old = add_job(SUCCEEDED, finished_at=now - timedelta(days=10))
+        recent = add_job(SUCCEEDED, finished_at=now)
+        running = add_job(RUNNING, started_at=now - timedelta(days=10))
+        assert job_runner.sweep(days=7) == 1
+        assert not os.path.exists(job_runner.job_folder(old))
+        assert os.path.isdir(job_runner.job_folder(recent))
+        assert os.path.isdir(job_runner.job_folder(running))
+
+
+def test_download_after_sweep_is_410(app, client, admin_headers):
+    job = run_job(app, client, admin_headers, client.post('/api/members/export', headers=admin_headers))
+    assert job['status'] == SUCCEEDED
+    assert client.get(f"/api/jobs/{job['id']}/download", headers=admin_headers).status_code == 200
+    with app.app_context():
+        db.session.get(Job, job['id']).finished_at = datetime.utcnow() - timedelta(days=10)
+        db.session.commit()
+    result = app.test_cli_runner().invoke(args=['sweep-jobs', '--days', '7'])
+    assert result.exit_code == 0, result.output
+    assert 'removed files of 1 finished jobs' in result.output
+    assert client.get(f"/api/jobs/{job['id']}/download", headers=admin_headers).status_code == 410
+
+
+def test_cancel(app, client, admin_headers):
+    with app.app_context():
+        queued = add_job(QUEUED)
+        finished = add_job(SUCCEEDED, finished_at=datetime.utcnow())
+    response = client.post(f'/api/jobs/{queued}/cancel', headers=admin_headers)
+    assert (response.status_code, response.get_json()['status']) == (200, CANCELLED)
+    # 취소된 작업은 워커가 가져가지 않는다
+    with app.app_context():
+        assert not job_runner.claim(queued)
+    assert client.post(f'/api/jobs/{finished}/cancel', headers=admin_headers).status_code == 409
+    assert client.post('/api/jobs/missing/cancel', headers=admin_headers).status_code == 404
@@ -0,0 +1,54 @@
+"""회원 목록 직렬화와 orjson JSON 프로바이더 - 응답이 기존 경로(to_dict + url_for, 표준 json)와 같아야 한다"""
+import json
+from datetime import date, datetime
+
+import pytest
+
+from app import create_app, db, Member, photo_urls
+from conftest import add_members, new_member, overrides
+
+PAYLOAD = {
+    'name': '홍길동', 'b': [1, 2.5, None, True], 'a': {'z': 1, 'y': '가'},
+    'date': date(2024, 3, 4), 'at': datetime(2024, 3, 4, 5, 6, 7),
+}
+
+
+def test_member_list_matches_orm_serialization(app, client, admin_headers):
+    add_members(app, new_member(1, photo='0123456789abcdef0123456789abcdef.jpg'),
+                new_member(2, photo='member 1.jpeg', spouse='회원1'), new_member(3))
+    response = client.get('/api/members?per_page=10', headers=admin_headers)
+    assert response.status_code == 200
+    with app.test_request_context():
+        expected = [{**member.to_dict(), 'photoUrls': photo_urls(member.photo),
+                     'photoUrl': photo_urls(member.photo)['original'] if member.photo else None}
+                    for member in Member.query.order_by(Member.id)]
+    assert sorted(response.get_json()['members'], key=lambda member: member['id']) == expected
+
+
+def test_orjson_provider_matches_default_provider(tmp_path):
+    orjson = pytest.importorskip('orjson')
+    fast = create_app('testing', overrides(tmp_path / 'fast'))
+    default = create_app('testing', overrides(tmp_path / 'default', JSON_USE_ORJSON=False))
+    assert type(fast.json).__name__ == 'OrjsonProvider'
+    assert type(default.json).__name__ == 'DefaultJSONProvider'
+
+    with fast.app_context():
+        fast_body = fast.json.response(PAYLOAD).get_data()
+    with default.app_context():
+        default_body = default.json.response(PAYLOAD).get_data()
+    # 같은 값, 같은 키 순서, 같은 날짜 형식 - 한글만 이스케이프하지 않는다
+    assert orjson.loads(fast_body) == json.loads(default_body)
+    assert list(json.loads(fast_body)) == list(json.loads(default_body))
+    assert fast_body.endswith(b'\n')
+    assert '홍길동'.encode('utf-8') in fast_body
+    assert json.loads(fast_body)['date'] == 'Mon, 04 Mar 2024 00:00:00 GMT'
+
+
+def test_orjson_provider_parses_requests(app, client, admin_headers):
+    pytest.importorskip('orjson')
+    response = client.post('/api/members', headers=admin_headers, json={
+        'name': '새회원', 'email': 'new@example.com', 'birthYear': 1990, 'birthMonth': 5, 'birthDay': 6,
+        'phone': '010-1234-5678', 'gender': '남', 'district': '2구역'})
+    assert response.status_code == 201, response.get_json()
+    with app.app_context():
+        assert db.session.query(Member.name).filter_by(email='new@example.com').scalar() == '새회원'
@@ -0,0 +1,101 @@
+"""회원 일괄 등록/수정/삭제와 생년월일 확인 (/api/members/batch, POST/PUT /api/members)"""
+import base64
+import os
+
+import pytest
+
+import app as app_module
+from app import db, Member
+from conftest import add_members, new_member
+
+PHOTO = base64.b64encode(b'\xff\xd8\xff\xe0' + os.urandom(256)).decode()
+
+
+def create_body(email, **values):
+    return {'name': '새회원', 'email': email, 'birthYear': 1990, 'birthMonth': 1, 'birthDay': 2,
+            'phone': '010-0000-0000', 'gender': '여', **values}
+
+
+def birth_dates(app):
+    with app.app_context():
+        return {email: (month, day, day_of_year) for email, month, day, day_of_year in db.session.query(
+            Member.email, Member.birth_month, Member.birth_day, Member.birth_day_of_year)}
+
+
+def test_batch(app, client, admin_headers):
+    ids = add_members(app, new_member(1), new_member(2))
+    response = client.post('/api/members/batch', headers=admin_headers, json={
+        'create': [create_body('new@example.com'), create_body('member2@example.com')],
+        'update': [{'id': ids[0], 'district': '3구역'}, {'id': 999, 'district': '3구역'}],
+        'delete': [ids[1]]})
+    assert response.status_code == 200, response.get_json()
+    result = response.get_json()
+    # 같은 배치에서 삭제되는 회원의 이메일은 다시 쓸 수 있다
+    assert (result['created'], result['updated'], result['deleted'], result['failed']) == (2, 1, 1, 1)
+    assert [item['status'] for item in result['results']] == ['ok', 'ok', 'error', 'ok', 'ok']
+
+
+def test_batch_rollback_leaves_no_photo_files(app, client, admin_headers, monkeypatch):
+    def fail(*args):
+        raise RuntimeError('touch failed')
+
+    body = {'create': [create_body('photo@example.com', photo=PHOTO)]}
+    monkeypatch.setattr(app_module.member_changes, 'touch', fail)
+    assert client.post('/api/members/batch', headers=admin_headers, json=body).status_code == 500
+    assert os.listdir(app.config['UPLOAD_FOLDER']) == []
+
+    monkeypatch.undo()
+    assert client.post('/api/members/batch', headers=admin_headers, json=body).status_code == 200
+    assert any(not name.startswith('.') for name in os.listdir(app.config['UPLOAD_FOLDER']))
+
+
+@pytest.mark.parametrize('values', [
+    {'birthMonth': 13},
+    {'birthMonth': 2, 'birthDay': 31},
+    {'birthMonth': 0},
+    {'birthYear': 1981, 'birthMonth': 2, 'birthDay': 29},
+])
+def test_batch_rejects_invalid_birth_date(app, client, admin_headers, values):
+    ids = add_members(app, new_member(1, birth_month=3, birth_day=31))
+    response = client.post('/api/members/batch', headers=admin_headers, json={
+        'create': [create_body('new@example.com', **values), create_body('ok@example.com')],
+        # 일만 바꿔도 저장된 월(3월)과 합쳐서 확인한다 (2월로만 바꾸면 2/31)
+        'update': [{'id': ids[0], **values} if 'birthDay' in values else {'id': ids[0], 'birthMonth': 2}]})
+    assert response.status_code == 200, response.get_json()
+    result = response.get_json()
+    assert (result['created'], result['updated'], result['failed']) == (1, 0, 2)
+    errors = [item for item in result['results'] if item['status'] == 'error']
+    assert [item['op'] for item in errors] == ['update', 'create']
+    assert all('생년월일' in item['error'] for item in errors)
+    assert birth_dates(app) == {'member1@example.com': (3, 31, 91), 'ok@example.com': (1, 2, 2)}
+
+
+def test_batch_accepts_leap_day(app, client, admin_headers):
+    ids = add_members(app, new_member(1, birth_year=1984))
+    response = client.post('/api/members/batch', headers=admin_headers, json={
+        'update': [{'id': ids[0], 'birthMonth': 2, 'birthDay': 29}]})
+    assert response.get_json()['updated'] == 1
+    assert birth_dates(app)['member1@example.com'] == (2, 29, 60)
+
+
+def test_create_rejects_invalid_birth_date(app, client, admin_headers):
+    response = client.post('/api/members', headers=admin_headers,
+                           json=create_body('new@example.com', birthMonth=2, birthDay=30))
+    assert response.status_code == 400
+    assert '생년월일' in response.get_json()['error']
+    assert birth_dates(app) == {}
+
+
+@pytest.mark.parametrize('values', [{'birth_month': 13}, {'birth_day': 32}, {'birth_month': 2, 'birth_day': 31}])
+def test_update_rejects_invalid_birth_date(app, client, admin_headers, values):
+    ids = add_members(app, new_member(1, birth_month=1, birth_day=31))
+    response = client.put(f'/api/members/{ids[0]}', headers=admin_headers, json=values)
+    assert response.status_code == 400
+    assert '생년월일' in response.get_json()['error']
+    assert birth_dates(app) == {'member1@example.com': (1, 31, 31)}
+
+
+def test_update_birth_date(app, client, admin_headers):
+    ids = add_members(app, new_member(1, birth_month=1, birth_day=31))
+    assert client.put(f'/api/members/{ids[0]}', headers=admin_headers, json={'birth_month': 3}).status_code == 200
+    assert birth_dates(app) == {'member1@example.com': (3, 31, 91)}
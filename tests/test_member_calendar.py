@@ -0,0 +1,56 @@
+"""생일/등록 기념일 구간 조회 - 연중 일자 색인, 연말을 넘는 구간, 오늘부터 N일"""
+from datetime import date, timedelta
+
+import pytest
+
+from app import db, Member
+from conftest import add_members, new_member
+
+
+def names(response):
+    assert response.status_code == 200, response.get_json()
+    return [member['name'] for member in response.get_json()['members']]
+
+
+@pytest.fixture
+def birthdays(app):
+    add_members(app, *[new_member(index, name=name, birth_month=month, birth_day=day)
+                       for index, (name, month, day) in enumerate([
+                           ('설날', 1, 2), ('윤일', 2, 29), ('삼일', 3, 1), ('성탄', 12, 25), ('그믐', 12, 31)])])
+
+
+def test_day_of_year_is_filled_on_write(app, birthdays):
+    with app.app_context():
+        member = Member.query.filter_by(name='삼일').one()
+        # 윤년 기준이라 3/1 은 해마다 61
+        assert member.birth_day_of_year == 61
+        member.birth_month, member.birth_day = 3, 4
+        db.session.commit()
+        assert member.birth_day_of_year == 64
+
+
+def test_range(client, birthdays):
+    assert names(client.get('/api/members/birthdays?from=02-28&to=03-01')) == ['윤일', '삼일']
+
+
+def test_range_across_year_end(client, birthdays):
+    # 올해 남은 날짜가 먼저, 그 다음 내년 초
+    assert names(client.get('/api/members/birthdays?from=12-20&to=2025-01-05')) == ['성탄', '그믐', '설날']
+
+
+def test_upcoming_days(app, client):
+    today = date.today()
+    add_members(app, *[new_member(offset, name=f'D+{offset}', birth_month=day.month, birth_day=day.day)
+                       for offset, day in ((offset, today + timedelta(days=offset)) for offset in (0, 3, 10))])
+    assert names(client.get('/api/members/birthdays?days=7')) == ['D+0', 'D+3']
+
+
+def test_registration_anniversary(app, client):
+    add_members(app, new_member(1, name='봄', register_date=date(2020, 4, 1)),
+                new_member(2, name='가을', register_date=date(2021, 10, 1)))
+    assert names(client.get('/api/members/birthdays?kind=registration&from=03-15&to=04-15')) == ['봄']
+
+
+@pytest.mark.parametrize('query_string', ['kind=wedding', 'from=01-01', 'from=13-01&to=01-01', 'from=02-30&to=03-01'])
+def test_invalid_query_is_400(client, query_string):
+    assert client.get(f'/api/members/birthdays?{query_string}').status_code == 400
@@ -0,0 +1,85 @@
+"""회원 변경 피드 (/api/members/changes) - 변경 번호 이후의 추가/수정/삭제만, 페이지 나누기, 만료된 token"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db, MemberTombstone
+from conftest import add_members, new_member
+
+
+def changes(client, since=None, **params):
+    query = {'fields': 'name,district', **params}
+    if since is not None:
+        query['since'] = since
+    response = client.get('/api/members/changes', query_string=query)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+@pytest.fixture
+def synced(app, client):
+    """회원 3명을 추가하고 전체 동기화한 token"""
+    ids = add_members(app, *[new_member(i) for i in range(3)])
+    page = changes(client)
+    assert sorted(member['id'] for member in page['members']) == ids
+    assert (page['deleted'], page['has_more']) == ([], False)
+    return ids, page['token']
+
+
+def test_no_changes_keeps_token(client, synced):
+    _, token = synced
+    assert changes(client, token) == {'members': [], 'deleted': [], 'token': token, 'has_more': False}
+
+
+def test_returns_only_changed_members(app, client, admin_headers, synced):
+    ids, token = synced
+    assert client.put(f'/api/members/{ids[0]}', headers=admin_headers, json={'district': '5구역'}).status_code == 200
+    assert client.delete(f'/api/members/{ids[1]}', headers=admin_headers).status_code == 200
+    new_id = add_members(app, new_member(9))[0]
+
+    page = changes(client, token)
+    assert page['members'] == [{'id': ids[0], 'name': '회원0', 'district': '5구역'},
+                               {'id': new_id, 'name': '회원9', 'district': '1구역'}]
+    assert page['deleted'] == [ids[1]]
+    assert changes(client, page['token'])['members'] == []
+
+
+def test_batch_writes_are_in_the_feed(client, admin_headers, synced):
+    ids, token = synced
+    response = client.post('/api/members/batch', headers=admin_headers, json={
+        'update': [{'id': ids[0], 'district': '7구역'}, {'id': ids[1], 'district': '7구역'}], 'delete': [ids[2]]})
+    assert response.status_code == 200
+    page = changes(client, token)
+    assert sorted(member['id'] for member in page['members']) == ids[:2]
+    assert page['deleted'] == [ids[2]]
+
+
+def test_pages_follow_change_order(app, client, synced):
+    _, token = synced
+    add_members(app, *[new_member(i) for i in range(10, 15)])
+    names = []
+    while True:
+        page = changes(client, token, limit=2)
+        names += [member['name'] for member in page['members']]
+        token = page['token']
+        if not page['has_more']:
+            break
+    assert names == [f'회원{i}' for i in range(10, 15)]
+
+
+def test_pruned_token_is_410(app, client, admin_headers, synced):
+    ids, token = synced
+    assert client.delete(f'/api/members/{ids[0]}', headers=admin_headers).status_code == 200
+    with app.app_context():
+        db.session.query(MemberTombstone).update({'deleted_at': datetime.utcnow() - timedelta(days=100)})
+        db.session.commit()
+    result = app.test_cli_runner().invoke(args=['prune-member-tombstones', '--days', '90'])
+    assert result.exit_code == 0, result.output
+    response = client.get('/api/members/changes', query_string={'since': token})
+    assert response.status_code == 410
+    assert response.get_json()['reset'] is True
+
+
+@pytest.mark.parametrize('since, status', [('abc', 400), ('-1', 400), ('999999', 410)])
+def test_invalid_token(client, synced, since, status):
+    assert client.get('/api/members/changes', query_string={'since': since}).status_code == status
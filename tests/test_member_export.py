@@ -0,0 +1,88 @@
+"""회원 명단 내보내기 (/api/members/export) - 스트리밍 응답과 메모리 사용량"""
+import csv
+import io
+import os
+from datetime import date
+
+import pytest
+
+from app import db, EXPORT_COLUMNS, Member, UserRole
+from conftest import add_members, new_member, run_job
+
+EXPORT_ROWS = 100000
+# 100k 명을 ORM 으로 한 번에 읽어 직렬화하면 수백 MB - 스트리밍은 배치 크기만큼만 올린다
+MAX_RSS_INCREASE_MB = 40
+
+
+def rss_mb():
+    with open('/proc/self/statm') as fh:
+        return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def seed(app, rows):
+    table = Member.__table__
+    with app.app_context():
+        for start in range(0, rows, 10000):
+            db.session.execute(table.insert(), [{
+                'name': f'회원{i}', 'email': f'member{i}@example.com', 'register_date': date(2024, 1, 1),
+                'birth_year': 1950 + i % 50, 'birth_month': i % 12 + 1, 'birth_day': i % 28 + 1,
+                'phone': f'010-0000-{i % 10000:04d}', 'gender': '남' if i % 2 else '여',
+                'address': f'{i} Main St', 'city': '서울', 'district': f'{i % 20 + 1}구역', 'position': '집사',
+                'role': '회원',
+            } for i in range(start, min(start + 10000, rows))])
+            db.session.commit()
+
+
+def test_export_csv_header_and_rows(app, client, admin_headers):
+    add_members(app, new_member(1, name='김철수', district='2구역'), new_member(2, name='이영희'))
+    response = client.get('/api/members/export', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'attachment; filename="members_' in response.headers['Content-Disposition']
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('﻿'))))
+    assert rows[0] == [header for _, header in EXPORT_COLUMNS]
+    assert [row[1] for row in rows[1:]] == ['김철수', '이영희']
+
+
+def test_export_requires_admin(client, headers_for):
+    assert client.get('/api/members/export').status_code == 401
+    assert client.get('/api/members/export', headers=headers_for(UserRole.USER)).status_code == 403
+
+
+def test_export_rejects_unknown_format(client, admin_headers):
+    assert client.get('/api/members/export?format=pdf', headers=admin_headers).status_code == 400
+
+
+def test_export_job_writes_file(app, client, admin_headers):
+    add_members(app, *(new_member(i) for i in range(3)))
+    job = run_job(app, client, admin_headers, client.post('/api/members/export', headers=admin_headers))
+    assert job['status'] == 'succeeded'
+    assert job['result']['rows'] == 3
+    download = client.get(f"/api/jobs/{job['id']}/download", headers=admin_headers)
+    assert download.status_code == 200
+    assert download.get_data(as_text=True).count('\n') == 4
+    download.close()
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not os.path.exists('/proc/self/statm'), reason='RSS 를 /proc 에서 읽을 수 없음')
+def test_export_streams_with_bounded_memory(app, client, admin_headers):
+    seed(app, EXPORT_ROWS)
+    baseline = peak = rss_mb()
+    response = client.get('/api/members/export', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.is_streamed
+
+    lines = 0
+    first = None
+    for chunk in response.response:
+        chunk = chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk
+        if first is None:
+            first = chunk
+        lines += chunk.count('\n')
+        peak = max(peak, rss_mb())
+    response.close()
+
+    assert next(csv.reader(io.StringIO(first.lstrip('﻿')))) == [header for _, header in EXPORT_COLUMNS]
+    assert lines == EXPORT_ROWS + 1
+    assert peak - baseline < MAX_RSS_INCREASE_MB, f"RSS +{peak - baseline:.1f}MB"
@@ -0,0 +1,79 @@
+"""fields= (sparse fieldsets) - 요청한 응답 키에 필요한 member 컬럼만 조회하는지 실행된 SQL 로 확인"""
+import re
+from datetime import date
+
+import pytest
+
+from conftest import add_members, new_member
+
+# 목록 응답 전체에 필요한 컬럼 (password_hash 등은 읽지 않는다)
+ALL_COLUMNS = ['id', 'name', 'birth_year', 'birth_month', 'birth_day', 'phone', 'gender', 'address', 'city',
+               'state', 'zipcode', 'district', 'spouse', 'spouse_id', 'household_id', 'position', 'email', 'role',
+               'is_active', 'photo']
+PUBLIC_COLUMNS = ['id', 'name', 'spouse', 'photo']
+
+SELECT_PATTERN = re.compile(r'^SELECT (?P<columns>.*?)\s+FROM member\b', re.S)
+
+
+def selected_columns(statements):
+    """member 행을 읽는 SELECT 문마다 컬럼 이름 목록 (COUNT 쿼리 제외)"""
+    result = []
+    for statement in statements:
+        match = SELECT_PATTERN.match(statement.strip())
+        if match and 'count(' not in match.group('columns').lower():
+            result.append([column.strip().rpartition('.')[2].split(' AS ')[0]
+                           for column in match.group('columns').split(',')])
+    return result
+
+
+@pytest.fixture
+def members(app):
+    # 홀수 번째만 사진
+    add_members(app, *[new_member(i, register_date=date(2024, 1, i + 1), birth_year=1980 + i,
+                                  photo=f'{i:032x}.jpg' if i % 2 else None) for i in range(5)])
+
+
+@pytest.mark.parametrize('query_string, keys, columns', [
+    ('', None, ALL_COLUMNS),
+    ('fields=name,phone,district', ['district', 'id', 'name', 'phone'], ['id', 'name', 'phone', 'district']),
+    ('fields=name,photoUrl', ['id', 'name', 'photoUrl'], ['id', 'name', 'photo']),
+    # 정렬 컬럼은 ORDER BY 에만 쓰고 조회하지 않는다
+    ('fields=name&sort_by=birth_year', ['id', 'name'], ['id', 'name']),
+    # 커서 페이지는 다음 커서를 만들 정렬 컬럼을 함께 읽는다
+    ('fields=name&cursor=&sort_by=register_date', ['id', 'name'], ['id', 'name', 'register_date']),
+    ('fields=phone&cursor=&sort_by=name', ['id', 'phone'], ['id', 'phone', 'name']),
+])
+def test_list_selects_only_requested_columns(client, admin_headers, members, statements, query_string, keys,
+                                             columns):
+    statements.clear()
+    response = client.get(f'/api/members?{query_string}', headers=admin_headers)
+    assert response.status_code == 200
+    assert selected_columns(statements) == [columns]
+    result = response.get_json()['members']
+    assert len(result) == 5
+    if keys is not None:
+        assert all(sorted(member) == keys for member in result)
+    assert not any('password_hash' in statement and 'FROM member' in statement for statement in statements)
+
+
+def test_photo_url_comes_from_photo_column(client, admin_headers, members):
+    result = client.get('/api/members?fields=name,photoUrl&sort_by=name', headers=admin_headers).get_json()
+    photos = {member['name']: member['photoUrl'] for member in result['members']}
+    assert photos['회원0'] is None
+    assert photos['회원1'].endswith(f'/uploads/{1:032x}.jpg')
+
+
+def test_public_list_selects_public_columns(client, members, statements):
+    statements.clear()
+    response = client.get('/api/members/public')
+    assert response.status_code == 200
+    assert selected_columns(statements) == [PUBLIC_COLUMNS]
+    assert all(set(member) <= {'id', 'name', 'spouse', 'photoUrls', 'photoUrl'}
+               for member in response.get_json())
+
+
+@pytest.mark.parametrize('fields', ['name,password_hash', 'version', 'name,,nickname'])
+def test_unknown_field_is_400(client, admin_headers, members, fields):
+    response = client.get(f'/api/members?fields={fields}', headers=admin_headers)
+    assert response.status_code == 400
+    assert '선택할 수 없는 필드' in response.get_json()['error']
@@ -0,0 +1,87 @@
+"""회원 목록 필터/정렬 - 실제 실행된 SELECT 의 쿼리 계획이 인덱스를 쓰는지 (SQLite EXPLAIN QUERY PLAN)"""
+import re
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app import db, Member
+
+MEMBERS = 3000
+POSITIONS = ['집사', '권사', '장로', '성도']
+MEMBER_SELECT = re.compile(r'^SELECT\b.*\bFROM member\b', re.S)
+FULL_SCAN = re.compile(r'^SCAN member$')
+
+
+@pytest.fixture
+def members(app):
+    with app.app_context():
+        db.session.execute(Member.__table__.insert(), [{
+            'name': f'회원{i:05d}', 'email': f'member{i}@example.com', 'register_date': date(2024, 1, 1),
+            'birth_year': 1940 + i % 60, 'birth_month': i % 12 + 1, 'birth_day': i % 28 + 1,
+            'phone': '010-0000-0000', 'city': ['서울', '성남', '용인'][i % 3],
+            'district': f'{i % 100 + 1}구역', 'position': POSITIONS[i % 4],
+        } for i in range(MEMBERS)])
+        db.session.commit()
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+
+
+@pytest.fixture
+def member_selects(app):
+    """실행된 member 목록 SELECT (문장, 파라미터)"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if MEMBER_SELECT.match(statement) and 'count(' not in statement.lower():
+            executed.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+def query_plan(app, statement, parameters):
+    with app.app_context():
+        connection = db.engine.raw_connection()
+        try:
+            return [row[-1] for row in connection.execute(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+        finally:
+            connection.close()
+
+
+@pytest.mark.parametrize('query_string', [
+    'district=7구역',
+    'position=권사',
+    'birth_month=7',
+    'district=7구역&position=장로',
+    'birth_year_min=1960&birth_year_max=1962',
+    'district_prefix=9',
+    '',  # 기본 정렬 (이름순)
+    'sort_by=birth_year',
+])
+def test_member_list_uses_index(app, client, admin_headers, members, member_selects, query_string):
+    response = client.get(f'/api/members?{query_string}', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json()['members']
+    assert len(member_selects) == 1
+    plan = query_plan(app, *member_selects[0])
+    assert not any(FULL_SCAN.match(step) for step in plan), plan
+    assert any('USING INDEX' in step or 'USING COVERING INDEX' in step for step in plan), plan
+
+
+def test_filters_return_matching_members(app, client, admin_headers, members):
+    response = client.get('/api/members?district=7구역&position=장로&per_page=100', headers=admin_headers)
+    result = response.get_json()['members']
+    assert result and all((member['district'], member['position']) == ('7구역', '장로') for member in result)
+    response = client.get('/api/members?birth_month=7&per_page=100', headers=admin_headers)
+    assert all(member['birthMonth'] == 7 for member in response.get_json()['members'])
+
+
+@pytest.mark.parametrize('sort_by', ['password_hash', 'phone', 'name; DROP TABLE member'])
+def test_sort_by_outside_whitelist_is_400(client, admin_headers, sort_by):
+    response = client.get('/api/members', headers=admin_headers, query_string={'sort_by': sort_by})
+    assert response.status_code == 400
+    assert sort_by in response.get_json()['error']
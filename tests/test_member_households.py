@@ -0,0 +1,71 @@
+"""가정/배우자 연결 - resolve-spouses 의 연결 규칙, dry run, 응답 캐시 무효화"""
+from app import db, Member, member_households
+from conftest import add_members, new_member
+
+
+def resolve_spouses(app, *args):
+    result = app.test_cli_runner().invoke(args=['resolve-spouses', *args])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def spouse_ids(app):
+    with app.app_context():
+        return dict(db.session.query(Member.name, Member.spouse_id))
+
+
+def test_links_spouses_in_the_same_district(app):
+    ids = add_members(app, new_member(1, name='가', spouse='나'), new_member(2, name='나', spouse='가'),
+                      new_member(3, name='다', spouse='라'), new_member(4, name='라', spouse='다', district='2구역'))
+    assert 'Linked 2 members' in resolve_spouses(app)
+    assert spouse_ids(app) == {'가': ids[1], '나': ids[0], '다': None, '라': None}
+
+
+def test_ambiguous_names_are_skipped(app):
+    add_members(app, new_member(1, name='가', spouse='나'), new_member(2, name='나'), new_member(3, name='나'))
+    assert '1 ambiguous' in resolve_spouses(app)
+    assert spouse_ids(app)['가'] is None
+
+
+def test_resolve_spouses_dry_run_matches_real_run(app):
+    with app.app_context():
+        # 다가 먼저 처리되도록 가장 작은 id
+        x = new_member(1, name='다', spouse='가')
+        db.session.add(x)
+        db.session.flush()
+        a, b = new_member(2, name='가'), new_member(3, name='나')
+        db.session.add_all([a, b])
+        db.session.flush()
+        # 가-나 부부였다가 가의 배우자 이름이 다로 바뀐 상태
+        a.spouse, a.spouse_id = '다', b.id
+        b.spouse, b.spouse_id = '가', a.id
+        db.session.commit()
+
+        dry_run = member_households.resolve(dry_run=True)
+        result = member_households.resolve()
+        assert dry_run == result
+        assert result['linked'] == 2 and result['conflicts'] == 0
+        assert db.session.get(Member, x.id).spouse_id == a.id
+
+
+def test_resolve_invalidates_cached_responses(app, client):
+    ids = add_members(app, new_member(1, name='가', spouse='나'), new_member(2, name='나', spouse='가'))
+    before = client.get('/api/households?fields=name').get_json()
+    members = client.get(f'/api/members/{ids[0]}').get_json()
+    assert members['spouseId'] is None
+    # 캐시된 응답
+    assert client.get('/api/households?fields=name').get_json() == before
+
+    resolve_spouses(app)
+    households = client.get('/api/households?fields=name').get_json()['households']
+    assert households != before['households']
+    assert [sorted(member['name'] for member in household['members']) for household in households] == [['가', '나']]
+    assert client.get(f'/api/members/{ids[0]}').get_json()['spouseId'] == ids[1]
+
+
+def test_dry_run_keeps_cached_responses(app, client, monkeypatch):
+    add_members(app, new_member(1, name='가', spouse='나'), new_member(2, name='나', spouse='가'))
+    calls = []
+    monkeypatch.setattr(member_households, 'on_change', lambda: calls.append(True))
+    assert 'Would link 2 members' in resolve_spouses(app, '--dry-run')
+    assert calls == []
@@ -0,0 +1,58 @@
+"""CSV 가져오기 (/api/import-db, member_import.py)"""
+import io
+
+from app import db, Member, UserRole
+from conftest import add_members, new_member, run_job
+from member_calendar import day_of_year
+from member_import import import_members_csv
+
+HEADER = 'name,birth_year,birth_month,birth_day,phone,email,district\n'
+
+
+def upload(client, headers, text):
+    return client.post('/api/import-db', headers=headers, content_type='multipart/form-data',
+                       data={'file': (io.BytesIO(text.encode('utf-8')), 'members.csv')})
+
+
+def test_import_inserts_and_updates_by_email(app, client, admin_headers):
+    add_members(app, new_member(1, email='kim@example.com', district='1구역'))
+    text = HEADER + ('김철수,1990,3,4,010-1234-5678,kim@example.com,5구역\n'
+                     '이영희,1985,12,25,010-2222-3333,lee@example.com,2구역\n'
+                     '박민수,1970,1,1,010-4444-5555,not-an-email,3구역\n'
+                     '최지우,,5,6,010-6666-7777,choi@example.com,3구역\n')
+    job = run_job(app, client, admin_headers, upload(client, admin_headers, text))
+    assert job['status'] == 'succeeded'
+    assert (job['result']['inserted'], job['result']['updated'], job['result']['rejected']) == (1, 1, 2)
+    with app.app_context():
+        kim = Member.query.filter_by(email='kim@example.com').one()
+        assert (kim.name, kim.district, kim.name_initials) == ('김철수', '5구역', 'ㄱㅊㅅ')
+        lee = Member.query.filter_by(email='lee@example.com').one()
+        assert lee.birth_day_of_year == day_of_year(12, 25)
+        # 일괄 INSERT 뒤에도 변경 번호를 받는다 (델타 동기화)
+        assert lee.version is not None
+        assert Member.query.count() == 2
+
+
+def test_import_ignores_server_managed_columns(app):
+    text = ('name,birth_year,birth_month,birth_day,phone,email,version,spouse_id,household_id,name_initials,'
+            'birth_day_of_year,password_hash\n'
+            '김철수,1990,3,4,010-1234-5678,kim@example.com,999999,5,7,XXX,1,hash\n')
+    with app.app_context():
+        results = import_members_csv(io.StringIO(text), db.session, Member)
+        assert results[0]['inserted'] == 1
+        member = Member.query.one()
+        assert (member.version, member.spouse_id, member.household_id, member.password_hash) == \
+            (None, None, None, None)
+        assert member.name_initials == 'ㄱㅊㅅ'
+        assert member.birth_day_of_year == day_of_year(3, 4)
+
+
+def test_import_requires_super_admin(client, headers_for):
+    response = upload(client, headers_for(UserRole.ADMIN), HEADER)
+    assert response.status_code == 403
+
+
+def test_import_rejects_other_file_types(client, admin_headers):
+    response = client.post('/api/import-db', headers=admin_headers, content_type='multipart/form-data',
+                           data={'file': (io.BytesIO(b'x'), 'members.txt')})
+    assert response.status_code == 400
@@ -0,0 +1,55 @@
+"""키셋(커서) 페이지네이션 (/api/members?cursor=)"""
+import pytest
+
+from conftest import add_members, new_member
+
+
+@pytest.fixture
+def members(app):
+    # 같은 출생년도가 여럿 - 정렬 키가 같은 행은 id 로 이어진다
+    return add_members(app, *(new_member(i, name=f'회원{i:02d}', birth_year=1980 + i % 3) for i in range(25)))
+
+
+def pages(client, headers, **params):
+    params = {'cursor': '', **params}
+    result = []
+    while True:
+        response = client.get('/api/members', headers=headers, query_string=params)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        result.append(body)
+        if not body['has_more']:
+            assert body['next_cursor'] is None
+            return result
+        params['cursor'] = body['next_cursor']
+
+
+@pytest.mark.parametrize('sort_by, sort_order', [('name', 'asc'), ('birth_year', 'asc'), ('birth_year', 'desc'),
+                                                 ('register_date', 'asc')])
+def test_cursor_pages_cover_all_members_once(client, admin_headers, members, sort_by, sort_order):
+    result = pages(client, admin_headers, sort_by=sort_by, sort_order=sort_order, per_page=7)
+    assert [len(page['members']) for page in result] == [7, 7, 7, 4]
+    ids = [member['id'] for page in result for member in page['members']]
+    assert sorted(ids) == sorted(members)
+
+    offset = client.get('/api/members', headers=admin_headers, query_string={
+        'sort_by': sort_by, 'sort_order': sort_order, 'per_page': 25}).get_json()
+    assert ids == [member['id'] for member in offset['members']]
+
+
+def test_cursor_counts(client, admin_headers, members):
+    first = client.get('/api/members?cursor=&per_page=5&count=exact&district=1구역', headers=admin_headers)
+    assert first.get_json()['total'] == 25
+    assert client.get('/api/members?cursor=&per_page=5', headers=admin_headers).get_json()['total'] is None
+    assert client.get('/api/members?cursor=&count=estimate', headers=admin_headers).get_json()['total'] == 25
+
+
+def test_invalid_cursor_is_400(client, admin_headers, members):
+    first = client.get('/api/members?cursor=&per_page=5&sort_by=name', headers=admin_headers).get_json()
+    assert client.get('/api/members?cursor=not-a-cursor', headers=admin_headers).status_code == 400
+    # 다른 정렬 조건으로 만든 커서
+    response = client.get('/api/members', headers=admin_headers,
+                          query_string={'cursor': first['next_cursor'], 'sort_by': 'birth_year'})
+    assert response.status_code == 400
+    # 커서 모드는 NULL 이 있을 수 있는 컬럼으로 정렬하지 않는다
+    assert client.get('/api/members?cursor=&sort_by=city', headers=admin_headers).status_code == 400
@@ -0,0 +1,68 @@
+"""이름/초성 검색 (/api/members/search, member_search.py)"""
+from app import db, Member, member_search_index
+from conftest import add_members, new_member
+from member_search import hangul_initials, search_tokens
+
+
+def names(client, headers, query):
+    response = client.get('/api/members/search', headers=headers, query_string={'name': query})
+    assert response.status_code == 200
+    return [member['name'] for member in response.get_json()]
+
+
+def test_hangul_initials():
+    assert hangul_initials('김철수') == 'ㄱㅊㅅ'
+    assert hangul_initials('Kim 철수') == 'Kim ㅊㅅ'
+    assert 'ㅊㅅ' in search_tokens('김철수').split()
+
+
+def test_search_by_substring_and_initials(app, client, admin_headers):
+    add_members(app, new_member(1, name='김철수'), new_member(2, name='박철수'), new_member(3, name='철수'),
+                new_member(4, name='이영희'))
+    assert names(client, admin_headers, '철수') == ['철수', '김철수', '박철수']
+    assert names(client, admin_headers, 'ㄱㅊ') == ['김철수']
+    assert names(client, admin_headers, 'ㅊㅅ') == ['철수', '김철수', '박철수']
+    assert names(client, admin_headers, '영') == ['이영희']
+    assert names(client, admin_headers, '') == []
+
+
+def test_search_input_is_not_fts_syntax(app, client, admin_headers):
+    add_members(app, new_member(1, name='김철수'))
+    # FTS5 연산자/따옴표가 들어가도 오류 없이 일반 단어로 검색한다
+    for query in ('"', '*', 'NEAR(', '철"수', '철수 OR'):
+        assert names(client, admin_headers, query) == []
+    assert names(client, admin_headers, '김철수 철수') == ['김철수']
+
+
+def test_index_follows_rename_and_delete(app, client, admin_headers):
+    member_id, = add_members(app, new_member(1, name='김철수'))
+    response = client.put(f'/api/members/{member_id}', headers=admin_headers, json={'name': '최영수'})
+    assert response.status_code == 200
+    assert names(client, admin_headers, '철수') == []
+    assert names(client, admin_headers, 'ㅊㅇ') == ['최영수']
+    assert client.delete(f'/api/members/{member_id}', headers=admin_headers).status_code == 200
+    assert names(client, admin_headers, '영수') == []
+
+
+def test_existing_members_are_indexed_on_first_use(app, client, admin_headers):
+    # create_all 로 만든 DB 에 일괄 INSERT 로 들어온 회원 (매퍼 이벤트 없음)
+    with app.app_context():
+        db.session.execute(db.text('DROP TABLE IF EXISTS member_search'))
+        db.session.execute(Member.__table__.insert(), [
+            {'name': '김철수', 'email': 'kim@example.com', 'register_date': new_member(0).register_date,
+             'birth_year': 1980, 'birth_month': 1, 'birth_day': 1, 'phone': '010'}])
+        db.session.commit()
+    member_search_index._fts_ready = None
+    assert names(client, admin_headers, '철수') == ['김철수']
+
+
+def test_fts_table_created_in_rolled_back_transaction(app, client, admin_headers):
+    with app.app_context():
+        db.session.execute(db.text('DROP TABLE IF EXISTS member_search'))
+        db.session.commit()
+        member_search_index._fts_ready = None
+        db.session.add(new_member(1, name='김철수'))
+        db.session.flush()  # 이 트랜잭션 안에서 색인 테이블을 만든다
+        db.session.rollback()
+    add_members(app, new_member(2, name='박철수'))
+    assert names(client, admin_headers, '철수') == ['박철수']
@@ -0,0 +1,49 @@
+"""통계 요약 테이블 - 단건/일괄 쓰기 뒤에도 Member 를 직접 집계한 결과와 같아야 한다"""
+from datetime import date
+
+from app import member_stats
+from conftest import add_members, new_member
+
+
+def assert_summary_matches_live(client, headers):
+    summary = client.get('/api/stats', headers=headers).get_json()
+    live = client.get('/api/stats?source=live', headers=headers).get_json()
+    assert summary == live
+    return summary
+
+
+def test_summary_follows_member_writes(app, client, admin_headers):
+    ids = add_members(app, new_member(1, gender='M', district='1구역', position='집사'),
+                      new_member(2, gender='F', district='2구역', position='권사', birth_year=1995,
+                                 register_date=date(2023, 5, 1)))
+    summary = assert_summary_matches_live(client, admin_headers)
+    assert summary['total'] == 2
+    assert {'key': '1990', 'count': 1} in summary['stats']['birth_decade']
+
+    response = client.post('/api/members', headers=admin_headers, json={
+        'name': '새회원', 'email': 'new@example.com', 'registerDate': '2024-03-01', 'birthYear': 2001,
+        'birthMonth': 3, 'birthDay': 4, 'phone': '010-1234-5678', 'district': '2구역', 'gender': 'F'})
+    assert response.status_code == 201, response.get_json()
+    assert client.put(f'/api/members/{ids[0]}', headers=admin_headers,
+                      json={'district': '2구역'}).status_code == 200
+    assert client.post('/api/members/batch', headers=admin_headers, json={
+        'update': [{'id': ids[1], 'position': '장로'}]}).status_code == 200
+    assert client.delete(f'/api/members/{ids[1]}', headers=admin_headers).status_code == 200
+
+    summary = assert_summary_matches_live(client, admin_headers)
+    assert summary['total'] == 2
+    assert summary['stats']['district'] == [{'key': '2구역', 'count': 2}]
+
+
+def test_rebuild_restores_summary(app, client, admin_headers):
+    add_members(app, *[new_member(i, district=f'{i % 3}구역') for i in range(10)])
+    with app.app_context():
+        member_stats.stat_model.query.delete()
+        member_stats.db.session.commit()
+    result = app.test_cli_runner().invoke(args=['rebuild-member-stats'])
+    assert result.exit_code == 0, result.output
+    assert assert_summary_matches_live(client, admin_headers)['total'] == 10
+
+
+def test_unknown_dimension_is_404(client, admin_headers):
+    assert client.get('/api/stats/shoe_size', headers=admin_headers).status_code == 404
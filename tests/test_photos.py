@@ -0,0 +1,85 @@
+"""사진 URL 과 썸네일 (썸네일이 아직 없으면 /uploads 가 원본을 보낸다)"""
+import io
+import os
+from urllib.parse import urlsplit
+
+import pytest
+
+from app import photo_store
+from conftest import add_members, new_member
+
+Image = pytest.importorskip('PIL.Image')
+
+
+@pytest.fixture
+def photo(app, monkeypatch):
+    # 백그라운드 썸네일 생성 없이 원본만 저장 (썸네일은 테스트에서 직접 만든다)
+    monkeypatch.setattr(photo_store, 'executor', None)
+    buffer = io.BytesIO()
+    Image.new('RGB', (800, 600), 'red').save(buffer, 'JPEG')
+    buffer.seek(0)
+    with app.app_context():
+        return photo_store.save_stream(buffer)
+
+
+def test_thumbnail_url_serves_original_until_generated(app, client, photo):
+    variants = photo_store.variants(photo)
+    assert variants['list'] == photo_store.variant_filename(photo, 'list')
+
+    response = client.get(f"/uploads/{variants['list']}")
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'public, no-cache'
+    original = response.data
+
+    photo_store.make_thumbnails(photo)
+    response = client.get(f"/uploads/{variants['list']}")
+    assert response.status_code == 200
+    assert 'immutable' in response.headers['Cache-Control']
+    assert len(response.data) < len(original)
+
+
+def test_missing_photo_is_404(client):
+    assert client.get(f"/uploads/{'0' * 32}_list.jpg").status_code == 404
+    assert client.get(f"/uploads/{'0' * 32}.jpg").status_code == 404
+
+
+def jpeg_bytes(size=(800, 600)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'blue').save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('filename', ['member_1726341485.891525.jpg', 'IMG_7527.jpeg', 'IMG_0001.JPG'])
+def test_legacy_photo_names_serve_list_and_detail(app, client, admin_headers, filename):
+    # 내용 해시 저장소 이전에 올린 사진 - 썸네일 작업을 돌리기 전에도 모든 URL 이 열려야 한다
+    original = jpeg_bytes()
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], filename), 'wb') as fh:
+        fh.write(original)
+    add_members(app, new_member(1, photo=filename))
+
+    member = client.get('/api/members', headers=admin_headers).get_json()['members'][0]
+    for variant in ('original', 'list', 'detail'):
+        response = client.get(urlsplit(member['photoUrls'][variant]).path)
+        assert response.status_code == 200, variant
+        assert response.data == original
+
+    photo_store.make_thumbnails(filename)
+    response = client.get(urlsplit(member['photoUrls']['list']).path)
+    assert response.status_code == 200
+    assert len(response.data) < len(original)
+
+
+def test_upload_is_content_addressed(app, client, admin_headers):
+    member_id, = add_members(app, new_member(1))
+    data = jpeg_bytes((64, 48))
+    first = client.post('/api/upload', content_type='multipart/form-data',
+                        data={'file': (io.BytesIO(data), 'a.jpg')}).get_json()['filename']
+    second = client.post('/api/upload', content_type='multipart/form-data',
+                         data={'file': (io.BytesIO(data), 'b.JPEG')}).get_json()['filename']
+    assert first == second and len(first) == len('0' * 32 + '.jpg')
+    assert client.put(f'/api/members/{member_id}/photo', headers=admin_headers, content_type='multipart/form-data',
+                      data={'photo': (io.BytesIO(data), 'c.png')}).status_code == 200
+    response = client.get(f'/uploads/{first}')
+    assert response.headers['ETag'] == f'"{first[:32]}"'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert [name for name in os.listdir(app.config['UPLOAD_FOLDER']) if name.startswith('.')] == []
@@ -0,0 +1,86 @@
+"""속도 제한 - 로그인 한도, Redis 장애 시 로컬 카운트, 여러 워커 프로세스의 공유 카운터"""
+import multiprocessing
+import os
+import time
+import uuid
+
+import pytest
+
+from app import create_app, db, limiter
+from conftest import overrides
+from token_blocklist import create_redis_client
+
+LOGIN_LIMIT = 5  # app.py 의 @limiter.limit("5 per minute")
+REDIS_URL = os.environ.get('REDIS_URL', '')
+
+
+def redis_available():
+    try:
+        return bool(REDIS_URL) and create_redis_client(REDIS_URL).ping()
+    except Exception:
+        return False
+
+
+def limited_app(tmp_path, storage_uri, **values):
+    # limiter 는 모듈 전역 객체라 앞서 만든 앱의 RATELIMIT_ENABLED=False 가 남지 않도록 명시한다
+    app = create_app('testing', overrides(tmp_path, RATELIMIT_ENABLED=True, RATELIMIT_STORAGE_URI=storage_uri,
+                                          RATELIMIT_KEY_PREFIX=uuid.uuid4().hex, **values))
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def login_statuses(app, count):
+    client = app.test_client()
+    # 없는 계정 - 비밀번호 해시 없이 401
+    return [client.post('/api/auth/login', json={'email': 'nobody@example.com', 'password': 'x'}).status_code
+            for _ in range(count)]
+
+
+def test_login_rate_limit(tmp_path):
+    statuses = login_statuses(limited_app(tmp_path, 'memory://'), LOGIN_LIMIT + 2)
+    assert statuses == [401] * LOGIN_LIMIT + [429] * 2
+
+
+def test_unreachable_redis_falls_back_to_local_counting(tmp_path):
+    app = limited_app(tmp_path, 'leased+redis://127.0.0.1:1/0',
+                      RATELIMIT_STORAGE_OPTIONS={'retry_interval': 60})
+    statuses = login_statuses(app, LOGIN_LIMIT + 1)
+    assert statuses == [401] * LOGIN_LIMIT + [429]
+    # 첫 요청에서 연결에 실패한 뒤로는 retry_interval 동안 Redis 를 다시 시도하지 않는다
+    assert limiter.storage.stats['redis_errors'] == 1
+    assert limiter.storage.stats['local_calls'] > 0
+
+
+def send_logins(tmp_path, storage_uri, start_at, count, results):
+    """워커 프로세스 하나 - 자기 앱을 만들어 로그인 요청을 보낸다"""
+    app = create_app('testing', overrides(tmp_path, RATELIMIT_ENABLED=True, RATELIMIT_STORAGE_URI=storage_uri,
+                                          RATELIMIT_KEY_PREFIX=tmp_path.name))
+    time.sleep(max(0, start_at - time.time()))
+    results.put(login_statuses(app, count))
+
+
+def run_workers(tmp_path, storage_uri, processes=3):
+    """프로세스마다 한도보다 많은 로그인을 보내고 통과한(429 가 아닌) 요청 수를 합친다"""
+    limited_app(tmp_path, storage_uri)
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    start_at = time.time() + 1
+    workers = [context.Process(target=send_logins, args=(tmp_path, storage_uri, start_at, LOGIN_LIMIT * 2, results))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    statuses = [status for _ in workers for status in results.get(timeout=60)]
+    for worker in workers:
+        worker.join()
+    return sum(1 for status in statuses if status != 429)
+
+
+def test_memory_limits_multiply_across_processes(tmp_path):
+    # memory:// 는 워커마다 따로 센다 - 공유 저장소가 필요한 이유
+    assert run_workers(tmp_path, 'memory://') == 3 * LOGIN_LIMIT
+
+
+@pytest.mark.skipif(not redis_available(), reason='REDIS_URL 의 Redis 에 연결할 수 없음')
+def test_limits_hold_across_processes_with_redis(tmp_path):
+    assert run_workers(tmp_path, f'leased+{REDIS_URL}') == LOGIN_LIMIT
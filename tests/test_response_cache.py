@@ -0,0 +1,69 @@
+"""회원 조회 응답 캐시 (response_cache.py)"""
+import time
+
+from flask import Flask, jsonify
+
+from conftest import add_members, new_member
+from response_cache import LocalCacheBackend, ResponseCache
+from token_blocklist import create_redis_client
+
+
+def test_hit_etag_and_invalidation_on_write(app, client, admin_headers):
+    member_id, = add_members(app, new_member(1, phone='010-1111-1111'))
+    first = client.get('/api/members', headers=admin_headers)
+    assert first.headers['X-Cache'] == 'MISS'
+    second = client.get('/api/members', headers=admin_headers)
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.data == first.data and second.headers['ETag'] == first.headers['ETag']
+
+    not_modified = client.get('/api/members', headers={**admin_headers, 'If-None-Match': first.headers['ETag']})
+    assert not_modified.status_code == 304
+
+    assert client.put(f'/api/members/{member_id}', headers=admin_headers,
+                      json={'phone': '010-2222-2222'}).status_code == 200
+    after = client.get('/api/members', headers=admin_headers)
+    assert after.headers['X-Cache'] == 'MISS'
+    assert after.get_json()['members'][0]['phone'] == '010-2222-2222'
+
+
+def test_error_responses_are_not_cached(client, admin_headers):
+    for _ in range(2):
+        response = client.get('/api/members?sort_by=password_hash', headers=admin_headers)
+        assert response.status_code == 400
+        assert 'X-Cache' not in response.headers
+
+
+def test_local_backend_ttl_and_lru():
+    backend = LocalCacheBackend(max_entries=2)
+    backend.set('members:0:a', 'A', ttl=60)
+    backend.set('members:0:b', 'B', ttl=60)
+    backend.get('members:0:a')
+    backend.set('members:0:c', 'C', ttl=60)  # 가장 오래 쓰지 않은 b 를 밀어낸다
+    assert (backend.get('members:0:a'), backend.get('members:0:b'), backend.get('members:0:c')) == ('A', None, 'C')
+    backend.set('members:0:d', 'D', ttl=0)
+    time.sleep(0.01)
+    assert backend.get('members:0:d') is None
+    backend.bump('members')
+    assert backend.generation('members') == 1 and backend.get('members:0:a') is None
+
+
+def test_unreachable_redis_falls_back_to_local_cache():
+    app = Flask(__name__)
+    cache = ResponseCache(app, create_redis_client('redis://127.0.0.1:1/0'))
+    calls = []
+
+    @app.route('/cached')
+    @cache.cached('members')
+    def view():
+        calls.append(1)
+        return jsonify(calls=len(calls))
+
+    client = app.test_client()
+    assert client.get('/cached').status_code == 200
+    started = time.perf_counter()
+    response = client.get('/cached')
+    assert response.headers['X-Cache'] == 'HIT'
+    assert time.perf_counter() - started < 0.5  # 재시도 간격 동안 Redis 에 다시 연결하지 않는다
+    assert cache.get_stats()['backend'] == 'local'
+    cache.invalidate('members')
+    assert client.get('/cached').get_json() == {'calls': 2}
@@ -0,0 +1,57 @@
+"""JWT 블록리스트 - 로그아웃, Redis 장애 중 SQLite 예비 저장소와 재시도 간격"""
+import time
+
+from flask import Flask
+
+from app import token_blocklist, UserRole
+from token_blocklist import TokenBlocklist, create_redis_client
+
+# 아무것도 듣지 않는 포트 - 연결이 바로 거부된다
+UNREACHABLE_REDIS = 'redis://127.0.0.1:1/0'
+
+
+def make_blocklist(tmp_path, **config):
+    app = Flask(__name__)
+    app.config.update(JWT_BLOCKLIST_BACKEND='redis', JWT_BLOCKLIST_SQLITE_PATH=str(tmp_path / 'blocklist.db'),
+                      JWT_BLOCKLIST_RETRY_INTERVAL=60, **config)
+    return TokenBlocklist(app, create_redis_client(UNREACHABLE_REDIS))
+
+
+def test_revoke_falls_back_to_sqlite(tmp_path):
+    blocklist = make_blocklist(tmp_path)
+    blocklist.revoke('revoked-jti', 60)
+    # 다른 프로세스(로컬 캐시 없음)도 예비 저장소에서 폐기된 토큰을 본다
+    other = make_blocklist(tmp_path)
+    assert other.is_revoked('revoked-jti')
+    assert not other.is_revoked('live-jti')
+
+
+def test_redis_is_not_retried_until_interval(tmp_path):
+    blocklist = make_blocklist(tmp_path)
+    assert not blocklist.is_revoked('first-jti')
+    assert blocklist.stats['backend_errors'] == 1
+    started = time.perf_counter()
+    for index in range(20):
+        assert not blocklist.is_revoked(f'jti-{index}')
+    assert blocklist.stats['backend_errors'] == 1
+    assert time.perf_counter() - started < 1
+
+
+
+def test_logout_revokes_access_token(app, client, headers_for):
+    headers = headers_for(UserRole.USER)
+    assert client.get('/api/auth/check', headers=headers).get_json()['isLoggedIn']
+    assert client.post('/api/auth/logout', headers=headers).status_code == 200
+    assert client.post('/api/auth/logout', headers=headers).status_code == 401
+
+
+def test_logout_without_blocklist_store_is_503(app, client, headers_for, monkeypatch):
+    headers = headers_for(UserRole.USER)
+
+    def unavailable(jti, ttl):
+        raise ConnectionError('blocklist store down')
+
+    monkeypatch.setattr(token_blocklist.backend, 'add', unavailable)
+    response = client.post('/api/auth/logout', headers=headers)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '5'
@@ -0,0 +1,58 @@
+"""/uploads 정적 파일 전송 - ETag, Range, 캐시 헤더, 프록시 전송"""
+import os
+
+import pytest
+
+from app import create_app
+from conftest import overrides
+
+DIGEST = 'ab' * 16
+CONTENT = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def files(app):
+    folder = app.config['UPLOAD_FOLDER']
+    for name in (f'{DIGEST}.jpg', 'legacy.jpg'):
+        with open(os.path.join(folder, name), 'wb') as fh:
+            fh.write(CONTENT)
+
+
+def test_content_addressed_file_is_immutable(client, files):
+    response = client.get(f'/uploads/{DIGEST}.jpg')
+    assert response.status_code == 200 and response.data == CONTENT
+    assert response.headers['ETag'] == f'"{DIGEST}"'
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert client.get(f'/uploads/{DIGEST}.jpg', headers={'If-None-Match': f'"{DIGEST}"'}).status_code == 304
+
+
+def test_other_files_are_revalidated(client, files):
+    response = client.get('/uploads/legacy.jpg')
+    assert response.headers['Cache-Control'] == 'public, no-cache'
+    etag = response.headers['ETag']
+    assert client.get('/uploads/legacy.jpg', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_range_request(client, files):
+    response = client.get(f'/uploads/{DIGEST}.jpg', headers={'Range': 'bytes=100-199'})
+    assert response.status_code == 206
+    assert response.data == CONTENT[100:200]
+    assert response.headers['Content-Range'] == f'bytes 100-199/{len(CONTENT)}'
+
+
+def test_missing_and_unsafe_names_are_404(client, files):
+    assert client.get('/uploads/missing.jpg').status_code == 404
+    assert client.get('/uploads/..%2Fmembers.db').status_code == 404
+
+
+@pytest.mark.parametrize('mode, header', [('x-accel-redirect', 'X-Accel-Redirect'), ('x-sendfile', 'X-Sendfile')])
+def test_offload_sends_headers_only(tmp_path, mode, header):
+    app = create_app('testing', overrides(tmp_path, UPLOADS_OFFLOAD=mode))
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], f'{DIGEST}.jpg'), 'wb') as fh:
+        fh.write(CONTENT)
+    response = app.test_client().get(f'/uploads/{DIGEST}.jpg')
+    assert response.status_code == 200
+    assert response.data == b''
+    assert response.headers[header].endswith(f'{DIGEST}.jpg')
+    assert response.mimetype == 'image/jpeg'
+    assert app.test_client().get('/uploads/missing.jpg').status_code == 404
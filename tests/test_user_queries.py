@@ -0,0 +1,61 @@
+"""권한 확인의 User 조회 수 - 읽기 요청은 토큰 클레임만, 변경 요청/토큰 갱신은 User 를 한 번 읽는다"""
+import re
+
+import pytest
+
+from app import db, User, UserRole
+from conftest import add_members, add_user, bearer, login, new_member
+
+USER_SELECT = re.compile(r'^SELECT\b.*\bFROM "?user"?\b', re.S | re.I)
+
+
+def user_selects(statements):
+    return sum(1 for statement in statements if USER_SELECT.match(statement.strip()))
+
+
+@pytest.fixture
+def member_id(app):
+    return add_members(app, new_member(1))[0]
+
+
+@pytest.fixture
+def tokens(app, client):
+    add_user(app, 'admin@example.com', UserRole.ADMIN)
+    return login(client, 'admin@example.com')
+
+
+@pytest.mark.parametrize('path', ['/api/stats', '/api/jobs', '/api/admin/cache/stats', '/api/auth/check'])
+def test_read_requests_do_not_load_user(client, tokens, statements, path):
+    statements.clear()
+    response = client.get(path, headers=bearer(tokens['access_token']))
+    assert response.status_code == 200
+    assert user_selects(statements) == 0
+
+
+@pytest.mark.parametrize('method, path, body', [
+    ('PUT', '/api/members/{id}', lambda member_id: {'phone': '010-1111-2222'}),
+    ('POST', '/api/members/batch', lambda member_id: {'update': [{'id': member_id, 'district': '2구역'}]}),
+    ('DELETE', '/api/members/{id}', lambda member_id: None),
+])
+def test_write_requests_load_user_once(client, tokens, member_id, statements, method, path, body):
+    statements.clear()
+    response = client.open(path.format(id=member_id), method=method, headers=bearer(tokens['access_token']),
+                           json=body(member_id))
+    assert response.status_code == 200
+    assert user_selects(statements) == 1
+
+
+def test_refresh_loads_user_once(client, tokens, statements):
+    statements.clear()
+    response = client.post('/api/auth/refresh', headers=bearer(tokens['refresh_token']))
+    assert response.status_code == 200
+    assert user_selects(statements) == 1
+
+
+def test_demoted_admin_cannot_write(app, client, tokens, member_id):
+    with app.app_context():
+        User.query.filter_by(email='admin@example.com').one().role = UserRole.USER
+        db.session.commit()
+    response = client.put(f'/api/members/{member_id}', headers=bearer(tokens['access_token']),
+                          json={'phone': '010-3333-4444'})
+    assert response.status_code == 403
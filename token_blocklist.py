@@ -0,0 +1,222 @@
+"""JWT 블록리스트 (로그아웃된 토큰의 jti 저장소)
+
+백엔드는 JWT_BLOCKLIST_BACKEND 설정으로 선택한다.
+- 'redis'  : 공유 커넥션 풀(타임아웃 설정)을 사용하는 Redis. 여러 워커가 공유한다.
+- 'sqlite' : 개발/테스트용 SQLite 파일. 같은 서버의 여러 워커가 공유한다.
+- 'memory' : 프로세스 내 dict. 단일 프로세스 개발/테스트용.
+
+모든 인증 요청마다 네트워크 왕복이 생기지 않도록, 최근에 확인한 '폐기되지 않은' jti 는
+JWT_BLOCKLIST_LOCAL_TTL 초 동안 프로세스 내에 캐시한다. 같은 프로세스에서 폐기한 토큰은
+즉시 반영되고, 다른 워커에서 폐기한 토큰은 최대 LOCAL_TTL 초 뒤에 반영된다.
+
+Redis 백엔드는 JWT_BLOCKLIST_SQLITE_PATH 의 SQLite 파일을 예비 저장소로 둔다.
+Redis 오류가 나면 JWT_BLOCKLIST_RETRY_INTERVAL 초 동안 Redis 를 건너뛰고 SQLite 로 조회/기록한다.
+(요청마다 연결 타임아웃을 기다리지 않는다) 장애 중에 폐기한 토큰이 복구 뒤에도 유효하지 않도록
+Redis 가 정상일 때도 SQLite 를 함께 확인한다. 둘 다 실패하면 조회는 거부(fail closed)하고
+revoke() 는 BlocklistUnavailable 을 던진다.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCAL_TTL = 2.0  # 초
+DEFAULT_LOCAL_MAX_ENTRIES = 10000
+DEFAULT_RETRY_INTERVAL = 5.0  # 초 - Redis 오류 후 다시 시도하기까지
+
+
+class BlocklistUnavailable(Exception):
+    """블록리스트 저장소에 기록할 수 없음 (로그아웃 실패)"""
+
+
+def create_redis_client(url, socket_timeout=0.5, max_connections=50):
+    """타임아웃이 있는 공유 커넥션 풀 기반 Redis 클라이언트 (연결은 첫 명령 때 맺는다)"""
+    import redis
+    pool = redis.ConnectionPool.from_url(
+        url,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=socket_timeout,
+        max_connections=max_connections,
+        health_check_interval=30,
+        decode_responses=True,
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+class RedisBlocklistBackend:
+    name = 'redis'
+
+    def __init__(self, client, prefix='jwt-blocklist'):
+        self.client = client
+        self.prefix = prefix
+
+    def add(self, jti, ttl):
+        self.client.set(f'{self.prefix}:{jti}', '', ex=max(1, int(ttl)))
+
+    def contains(self, jti):
+        return self.client.exists(f'{self.prefix}:{jti}') > 0
+
+
+class MemoryBlocklistBackend:
+    name = 'memory'
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def add(self, jti, ttl):
+        with self._lock:
+            now = time.time()
+            # 추가할 때 만료된 항목을 함께 정리
+            for key in [key for key, expires in self._entries.items() if expires <= now]:
+                del self._entries[key]
+            self._entries[jti] = now + ttl
+
+    def contains(self, jti):
+        expires = self._entries.get(jti)
+        return expires is not None and expires > time.time()
+
+
+class SQLiteBlocklistBackend:
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS revoked_token (jti TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, jti, ttl):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM revoked_token WHERE expires_at <= ?", (now,))
+            conn.execute("INSERT OR REPLACE INTO revoked_token (jti, expires_at) VALUES (?, ?)", (jti, now + ttl))
+
+    def contains(self, jti):
+        row = self._connect().execute(
+            "SELECT 1 FROM revoked_token WHERE jti = ? AND expires_at > ?", (jti, time.time())
+        ).fetchone()
+        return row is not None
+
+
+class TokenBlocklist:
+    def __init__(self, app=None, redis_client=None):
+        self.backend = None
+        self.fallback = None
+        self._backend_down_until = 0.0
+        self.retry_interval = DEFAULT_RETRY_INTERVAL
+        self.local_ttl = DEFAULT_LOCAL_TTL
+        self.fail_open = False
+        self._not_revoked = {}
+        self._revoked = {}
+        self._lock = threading.Lock()
+        self.stats = {'local_hits': 0, 'backend_checks': 0, 'backend_errors': 0, 'fallback_checks': 0}
+        if app is not None:
+            self.init_app(app, redis_client)
+
+    def init_app(self, app, redis_client=None):
+        backend = app.config.get('JWT_BLOCKLIST_BACKEND', 'redis')
+        self.fallback = None
+        self._backend_down_until = 0.0
+        self.retry_interval = app.config.get('JWT_BLOCKLIST_RETRY_INTERVAL', DEFAULT_RETRY_INTERVAL)
+        if backend == 'redis' and redis_client is not None:
+            self.backend = RedisBlocklistBackend(redis_client)
+            self.fallback = SQLiteBlocklistBackend(app.config['JWT_BLOCKLIST_SQLITE_PATH'])
+        elif backend == 'sqlite':
+            self.backend = SQLiteBlocklistBackend(app.config['JWT_BLOCKLIST_SQLITE_PATH'])
+        else:
+            if backend == 'redis':
+                logger.warning("Redis 가 설정되지 않아 메모리 블록리스트를 사용합니다.")
+            self.backend = MemoryBlocklistBackend()
+        self.local_ttl = app.config.get('JWT_BLOCKLIST_LOCAL_TTL', DEFAULT_LOCAL_TTL)
+        self.fail_open = app.config.get('JWT_BLOCKLIST_FAIL_OPEN', False)
+        app.extensions['token_blocklist'] = self
+
+    def _backend_available(self):
+        return self.fallback is None or self._backend_down_until <= time.monotonic()
+
+    def _backend_failed(self, e):
+        self.stats['backend_errors'] += 1
+        if self.fallback is not None:
+            if self._backend_down_until <= time.monotonic():
+                logger.error("토큰 블록리스트 Redis 오류, %.0f초 동안 SQLite 를 사용합니다: %s", self.retry_interval, e)
+            self._backend_down_until = time.monotonic() + self.retry_interval
+        else:
+            logger.error("토큰 블록리스트 저장소 오류: %s", e)
+
+    def revoke(self, jti, ttl):
+        now = time.monotonic()
+        with self._lock:
+            self._not_revoked.pop(jti, None)
+            if len(self._revoked) >= DEFAULT_LOCAL_MAX_ENTRIES:
+                self._revoked = {key: expires for key, expires in self._revoked.items() if expires > now}
+            self._revoked[jti] = now + ttl
+        if self._backend_available():
+            try:
+                self.backend.add(jti, ttl)
+                return
+            except Exception as e:
+                self._backend_failed(e)
+        if self.fallback is None:
+            raise BlocklistUnavailable(jti)
+        try:
+            self.fallback.add(jti, ttl)
+        except Exception as e:
+            logger.error("토큰 블록리스트 SQLite 기록 실패: %s", e)
+            raise BlocklistUnavailable(jti) from e
+
+    def _contains(self, jti):
+        """저장소 조회 (예비 저장소 먼저 - 장애 중에 폐기한 토큰), 모두 실패하면 예외"""
+        if self.fallback is not None:
+            self.stats['fallback_checks'] += 1
+            if self.fallback.contains(jti):
+                return True
+        if self._backend_available():
+            try:
+                return self.backend.contains(jti)
+            except Exception as e:
+                self._backend_failed(e)
+                if self.fallback is None:
+                    raise
+        return False
+
+    def is_revoked(self, jti):
+        now = time.monotonic()
+        expires = self._revoked.get(jti)
+        if expires is not None and expires > now:
+            return True
+        expires = self._not_revoked.get(jti)
+        if expires is not None and expires > now:
+            self.stats['local_hits'] += 1
+            return False
+
+        self.stats['backend_checks'] += 1
+        try:
+            revoked = self._contains(jti)
+        except Exception as e:
+            logger.error("토큰 블록리스트 조회 실패: %s", e)
+            # 저장소 장애 시 기본은 거부(fail closed)
+            return not self.fail_open
+
+        with self._lock:
+            if revoked:
+                self._revoked[jti] = now + self.local_ttl
+            elif self.local_ttl > 0:
+                if len(self._not_revoked) >= DEFAULT_LOCAL_MAX_ENTRIES:
+                    self._not_revoked.clear()
+                self._not_revoked[jti] = now + self.local_ttl
+        return revoked
@@ -0,0 +1,13 @@
+"""운영 환경 WSGI 진입점
+
+gunicorn:  gunicorn -c gunicorn.conf.py wsgi:app
+uWSGI:     uwsgi --module wsgi:app --master --processes 4 --threads 4 --http :5001
+           (--lazy-apps 를 쓰지 않으면 마스터에서 앱을 한 번 불러온 뒤 fork 한다)
+
+가져오기/내보내기 작업 워커는 별도 프로세스로 실행한다:  flask --app wsgi run-jobs --workers 2
+"""
+import os
+
+from app import create_app
+
+app = create_app(os.getenv('FLASK_CONFIG', 'production'))